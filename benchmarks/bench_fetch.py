@@ -0,0 +1,301 @@
+"""
+Overhead of the fetch, clean and batch paths.
+
+Runs offline: every yfinance response is served by an in-memory stub
+provider, so the numbers measure finfetcher itself. Request latency is
+reported as p50/p99 for `get_data` and the `get_latest` fast path. Results can
+be saved as JSON keyed by git commit and compared with an earlier run:
+
+    python benchmarks/bench_fetch.py --json before.json
+    git checkout my-branch
+    python benchmarks/bench_fetch.py --compare before.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from finfetcher import DataFetcher, MetadataCache, MultiFetcher
+from finfetcher.calendars import session_calendar
+from finfetcher.cutoffs import CutoffResolver
+from finfetcher.services.fetch_data import (
+    download,
+    format_index,
+    get_complete_close,
+    to_exchange_dates,
+)
+from finfetcher.services.providers import DataProvider
+from finfetcher.services.rate_limit import RateLimiter, set_rate_limiter
+from finfetcher.services.retry import RetryPolicy
+from finfetcher.services.store import period_start
+
+UNIVERSES = (10, 100, 1000)
+LATENCY_CALLS = 200
+
+
+def make_frame(rng: np.random.Generator, days: int = 1008) -> pd.DataFrame:
+    """4 years of daily bars with the tz-aware index yfinance returns."""
+    index = pd.bdate_range(end="2024-12-31", periods=days, tz="America/New_York")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+    return pd.DataFrame(
+        {
+            "Open": close * (1 + rng.normal(0, 0.002, days)),
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Volume": rng.integers(10**5, 10**8, days),
+        },
+        index=index,
+    )
+
+
+class StubProvider(DataProvider):
+    """Serves one synthetic frame for every symbol, failing `failures` times first."""
+
+    name = "stub"
+
+    def __init__(self, frame: pd.DataFrame, failures: int = 0) -> None:
+        self.frame = frame
+        self.failures = failures
+        self._failed = 0
+
+    def get_meta(self, symbol):
+        return "EQUITY", "America/New_York"
+
+    def _maybe_fail(self) -> None:
+        if self._failed < self.failures:
+            self._failed += 1
+            raise ConnectionError("Injected failure")
+
+    def history(self, symbol, interval="1d", period=None, start=None, end=None):
+        self._maybe_fail()
+        return self.frame.copy()
+
+    def history_many(self, symbols, interval="1d", period=None, start=None, end=None):
+        self._maybe_fail()
+        return pd.concat({s: self.frame for s in symbols}, axis=1)
+
+
+class PeriodStubProvider(StubProvider):
+    """StubProvider returning only the requested period, counted back from the
+    last bar, so short requests carry small payloads as they do from Yahoo."""
+
+    def _slice(self, frame: pd.DataFrame, period: str | None) -> pd.DataFrame:
+        start = period_start(period, frame.index[-1].date()) if period else None
+        return frame if start is None else frame.loc[start.isoformat() :]
+
+    def history(self, symbol, interval="1d", period=None, start=None, end=None):
+        return self._slice(super().history(symbol, interval, period), period)
+
+    def history_many(self, symbols, interval="1d", period=None, start=None, end=None):
+        return self._slice(super().history_many(symbols, interval, period), period)
+
+
+def per_call(func, repeat: int = 5) -> dict[str, float]:
+    """Best and median time of one call in microseconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number)]
+    return {"best_us": min(times), "median_us": float(np.median(times))}
+
+
+def bench_calls(frame: pd.DataFrame) -> dict[str, dict[str, float]]:
+    cleaned = frame.copy()
+    cleaned.index = to_exchange_dates(frame.index)
+    last_day = cleaned.index[-1]
+    resolver = CutoffResolver.from_custom(None)
+
+    def target_date():
+        cutoff = resolver.resolve("EQUITY", "America/New_York")
+        return session_calendar("EQUITY", cutoff).next_session(last_day)
+
+    return {
+        "DataFetcher.__init__": per_call(lambda: DataFetcher("AAPL")),
+        "get_complete_close": per_call(
+            lambda: get_complete_close(
+                cleaned, "EQUITY", last_day, "America/New_York", resolver
+            )
+        ),
+        "to_exchange_dates": per_call(lambda: to_exchange_dates(frame.index)),
+        "format_index[date]": per_call(lambda: format_index(cleaned, "date")),
+        "format_index[period]": per_call(lambda: format_index(cleaned, "period")),
+        "target_date": per_call(target_date),
+    }
+
+
+def bench_universe(frame: pd.DataFrame, size: int) -> dict[str, float]:
+    symbols = [f"S{i:04d}" for i in range(size)]
+    cache = MetadataCache(maxsize=max(size, 1))
+    cache.set_many({s: ("EQUITY", "America/New_York") for s in symbols})
+
+    def run() -> None:
+        fetcher = MultiFetcher(
+            symbols, metadata_cache=cache, provider=StubProvider(frame), chunk_size=100
+        )
+        data = fetcher.get_data(period="4y", index_type="datetime")
+        assert len(data) == size, fetcher.errors
+
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+
+    # Separate run: tracemalloc slows every allocation down
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": elapsed,
+        "symbols_per_s": size / elapsed,
+        "peak_mb": peak / 2**20,
+    }
+
+
+def percentiles(func, calls: int) -> dict[str, float]:
+    """p50 and p99 latency of `calls` calls in microseconds."""
+    times = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1e6)
+    p50, p99 = np.percentile(times, [50, 99])
+    return {"p50_us": float(p50), "p99_us": float(p99)}
+
+
+def bench_latency(frame: pd.DataFrame, calls: int) -> dict[str, dict[str, float]]:
+    """Latency of a fresh fetcher's request, i.e. without held data."""
+    provider = PeriodStubProvider(frame)
+    symbols = [f"S{i:04d}" for i in range(100)]
+    cache = MetadataCache(maxsize=len(symbols) + 1)
+    cache.set_many({s: ("EQUITY", "America/New_York") for s in ["AAPL", *symbols]})
+
+    def single(method):
+        return lambda: method(
+            DataFetcher("AAPL", metadata_cache=cache, provider=provider)
+        )
+
+    def batch(method):
+        return lambda: method(
+            MultiFetcher(symbols, metadata_cache=cache, provider=provider)
+        )
+
+    return {
+        "latency[get_data 4y]": percentiles(
+            single(lambda f: f.get_data(period="4y")), calls
+        ),
+        "latency[get_latest]": percentiles(single(lambda f: f.get_latest()), calls),
+        "latency[batch100 get_data 4y]": percentiles(
+            batch(lambda f: f.get_data(period="4y")), max(calls // 10, 1)
+        ),
+        "latency[batch100 get_latest]": percentiles(
+            batch(lambda f: f.get_latest()), max(calls // 10, 1)
+        ),
+    }
+
+
+def bench_retries(frame: pd.DataFrame, failures: int) -> dict[str, float]:
+    """Latency of one download that succeeds after `failures` errors."""
+    policy = RetryPolicy(
+        max_attempts=failures + 1,
+        base_delay=0.01,
+        jitter=0,
+        deadline=None,
+        circuit_breaker=None,
+    )
+    backoff_us = sum(policy.delay(retry) for retry in range(failures)) * 1e6
+    times = []
+    for _ in range(5):
+        provider = StubProvider(frame, failures=failures)
+        start = time.perf_counter()
+        download("AAPL", retry_policy=policy, provider=provider)
+        times.append((time.perf_counter() - start) * 1e6)
+    return {
+        "best_us": min(times),
+        "median_us": float(np.median(times)),
+        # Time spent beyond the scheduled backoff waits
+        "overhead_us": min(times) - backoff_us,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def flatten(results: dict) -> dict[str, float]:
+    """Maps "case.metric" to values, for comparing two runs."""
+    return {
+        f"{case}.{metric}": value
+        for case, metrics in results.items()
+        for metric, value in metrics.items()
+    }
+
+
+def compare(results: dict, baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text())
+    before, after = flatten(baseline["results"]), flatten(results)
+    print(f"\nChange against {baseline['commit']} ({baseline_path})")
+    for key in after:
+        if key in before and before[key]:
+            change = (after[key] - before[key]) / before[key] * 100
+            print(f"{key:<44}{before[key]:>12.1f}{after[key]:>12.1f}{change:>+9.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(UNIVERSES))
+    parser.add_argument("--calls", type=int, default=LATENCY_CALLS)
+    parser.add_argument("--json", type=Path, help="Write the results to this file.")
+    parser.add_argument("--compare", type=Path, help="Results file of a prior run.")
+    args = parser.parse_args()
+
+    # Injected failures must not throttle the limiter between cases
+    set_rate_limiter(RateLimiter(rate=1e6, burst=1e6, max_rate=1e6))
+    frame = make_frame(np.random.default_rng(0))
+
+    results: dict[str, dict[str, float]] = bench_calls(frame)
+    for size in args.sizes:
+        results[f"universe[{size}]"] = bench_universe(frame, size)
+    results.update(bench_latency(frame, args.calls))
+    for failures in (0, 2):
+        results[f"retry[{failures} failures]"] = bench_retries(frame, failures)
+
+    print(f"{'case':<30}{'metric':<14}{'value':>12}")
+    for case, metrics in results.items():
+        for metric, value in metrics.items():
+            print(f"{case:<30}{metric:<14}{value:>12.1f}")
+
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                {
+                    "commit": git_commit(),
+                    "python": platform.python_version(),
+                    "pandas": pd.__version__,
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Memory and time of the get_data output formats.
+
+Runs offline on synthetic 4-year daily OHLCV frames:
+
+    python benchmarks/bench_output.py --symbols 1000
+"""
+
+import argparse
+import importlib.util
+import time
+
+import numpy as np
+import pandas as pd
+
+from finfetcher.services.fetch_data import format_index
+from finfetcher.services.output import convert_output
+
+
+def make_frame(rng: np.random.Generator, days: int = 1008) -> pd.DataFrame:
+    index = pd.bdate_range(end="2024-12-31", periods=days)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+    return pd.DataFrame(
+        {
+            "Open": close * (1 + rng.normal(0, 0.002, days)),
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Volume": rng.integers(10**5, 10**8, days),
+        },
+        index=index,
+    )
+
+
+def nbytes(result) -> int:
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(deep=True).sum())
+    return int(result.nbytes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [make_frame(rng) for _ in range(args.symbols)]
+
+    cases = [
+        ("pandas (date index)", "date", "pandas"),
+        ("pandas", "datetime", "pandas"),
+        ("compact", "datetime", "compact"),
+        ("numpy", "datetime", "numpy"),
+    ]
+    if importlib.util.find_spec("pyarrow"):
+        cases.append(("arrow", "datetime", "arrow"))
+
+    print(f"{args.symbols} symbols x {len(frames[0])} daily bars")
+    print(f"{'output':<22}{'memory MB':>12}{'convert ms':>12}")
+
+    for name, index_type, output in cases:
+        start = time.perf_counter()
+        results = [convert_output(format_index(f, index_type), output) for f in frames]
+        elapsed = time.perf_counter() - start
+        memory = sum(nbytes(r) for r in results) / 2**20
+        print(f"{name:<22}{memory:>12.1f}{elapsed * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Connection reuse of the pooled session against a local HTTP stub server.
+
+Sends the same requests once with a new session per request, as separate
+clients without a shared session do, and once through one `make_session`
+session, counting the connections the server accepted:
+
+    python benchmarks/bench_session.py --requests 500 --workers 8
+
+The stub is plain HTTP on localhost, so the gap is a lower bound: against
+Yahoo every new connection also pays a TLS handshake and a network round trip.
+"""
+
+import argparse
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from finfetcher import make_session
+
+BODY = b'{"chart": {"result": []}}'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body are sent separately: avoid Nagle delays on reuse
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(server, url: str, requests: int, workers: int, session_for) -> dict:
+    server.connections = 0
+
+    def get(_) -> None:
+        session_for().get(url).raise_for_status()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(get, range(requests)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests_per_s": requests / elapsed,
+        "connections": server.connections,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/v8/finance/chart/AAPL"
+
+    print(f"{'backend':<12}{'session':<12}{'requests/s':>12}{'connections':>13}")
+    for backend in ("requests", "curl_cffi"):
+        shared = make_session(pool_size=args.workers, backend=backend)
+        cases = {
+            "per-request": lambda: make_session(backend=backend),
+            "shared": lambda: shared,
+        }
+        for name, session_for in cases.items():
+            result = run(server, url, args.requests, args.workers, session_for)
+            print(
+                f"{backend:<12}{name:<12}{result['requests_per_s']:>12.0f}"
+                f"{result['connections']:>13}"
+            )
+        shared.close()
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
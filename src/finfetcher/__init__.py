@@ -1,3 +1,65 @@
-from .core import DataFetcher
+from .async_core import AsyncDataFetcher
+from .bulk import BulkRunner, Checkpoint
+from .calendars import ExchangeCalendar, get_calendar, register_calendar
+from .core import DataFetcher, MultiFetcher
+from .cutoffs import CutoffResolver
+from .services.dataset import PartitionedDataset
+from .services.market_status import market_status
+from .services.memory_cache import FetchCache
+from .services.metadata import MetadataCache, prefetch_metadata
+from .services.metrics import (
+    FetchObserver,
+    MetricsCollector,
+    get_observer,
+    set_observer,
+)
+from .services.providers import (
+    DataProvider,
+    ReplayProvider,
+    YFinanceProvider,
+    get_provider,
+    set_provider,
+)
+from .services.rate_limit import RateLimiter, get_rate_limiter, set_rate_limiter
+from .services.retry import CircuitBreaker, RetryPolicy
+from .services.scheduler import FetchScheduler
+from .services.session import get_session, make_session, set_session
+from .services.shared_cache import SharedFetchCache
+from .services.store import OHLCVStore
 
-__all__ = ["DataFetcher"]
+__all__ = [
+    "AsyncDataFetcher",
+    "BulkRunner",
+    "Checkpoint",
+    "CircuitBreaker",
+    "CutoffResolver",
+    "DataFetcher",
+    "DataProvider",
+    "ExchangeCalendar",
+    "FetchCache",
+    "FetchObserver",
+    "FetchScheduler",
+    "MetadataCache",
+    "MetricsCollector",
+    "MultiFetcher",
+    "OHLCVStore",
+    "PartitionedDataset",
+    "RateLimiter",
+    "ReplayProvider",
+    "RetryPolicy",
+    "SharedFetchCache",
+    "YFinanceProvider",
+    "get_calendar",
+    "get_observer",
+    "get_provider",
+    "get_rate_limiter",
+    "get_session",
+    "make_session",
+    "market_status",
+    "prefetch_metadata",
+    "register_calendar",
+    "set_observer",
+    "set_provider",
+    "set_rate_limiter",
+    "set_session",
+]
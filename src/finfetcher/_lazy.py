@@ -0,0 +1,50 @@
+import importlib
+import sys
+import types
+from typing import Any
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    Attribute writes and deletes go to the real module, so `unittest.mock.patch`
+    targets such as "finfetcher.core.yf.Ticker" keep working.
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            # The import system serializes concurrent first imports
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._load(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._load(), name)
+
+    def __dir__(self) -> list[str]:
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> Any:
+    """
+    Returns module `name` if it is already imported, else a LazyModule that
+    imports it on first use.
+
+    Heavy dependencies (pandas, numpy, yfinance, pytz) are bound this way, so
+    `import finfetcher` and creating a fetcher stay fast; they load on the
+    first fetch.
+    """
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
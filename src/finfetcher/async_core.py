@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import date
+from typing import TYPE_CHECKING
+
+from ._lazy import lazy_import
+from .cutoffs import CutoffResolver
+from .exceptions import FinFetcherError, YFinanceConnectionError
+from .services.fetch_async import afetch_data
+from .services.metadata import MetadataCache, default_metadata_cache
+from .services.metrics import FetchObserver, observing, record_error, timed
+from .services.providers import DataProvider
+from .services.retry import RetryPolicy
+from .services.store import OHLCVStore
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDataFetcher:
+    """
+    Asyncio client for fetching cleaned data for many symbols concurrently.
+
+    At most `max_concurrency` symbols are fetched at the same time, each
+    request can be bounded by a timeout, and retries back off with
+    `asyncio.sleep` instead of blocking the event loop. Cancelling a caller
+    cancels its pending request and frees its concurrency slot.
+    """
+
+    def __init__(
+        self,
+        custom_cutoffs: dict | None = None,
+        max_concurrency: int = 16,
+        timeout: float | None = None,
+        store: OHLCVStore | None = None,
+        metadata_cache: MetadataCache | None = None,
+        retry_policy: RetryPolicy | None = None,
+        provider: DataProvider | None = None,
+        observer: FetchObserver | None = None,
+    ) -> None:
+        """
+        Initialize the AsyncDataFetcher.
+
+        Args:
+            custom_cutoffs (dict, optional): Dictionary to merge with/override
+                default MARKET_CUTOFFS. Same structure as for DataFetcher.
+            max_concurrency (int): Maximum number of symbols fetched at once.
+            timeout (float, optional): Per-request timeout in seconds,
+                including retries.
+            store (OHLCVStore, optional): Local on-disk store of daily bars,
+                topped up incrementally as in DataFetcher.
+            metadata_cache (MetadataCache, optional): Cache of asset types and
+                timezones. Defaults to the process-wide in-memory cache.
+            retry_policy (RetryPolicy, optional): Backoff, retry budget and
+                circuit breaker for downloads. Defaults to DEFAULT_RETRY_POLICY.
+            provider (DataProvider, optional): Source of metadata and bars.
+                Defaults to the process-wide provider (yfinance).
+            observer (FetchObserver, optional): Receives per-phase timings,
+                attempts, row counts and errors; see DataFetcher.
+
+        Raises:
+            TypeError: If custom_cutoffs or its internal structure has invalid types.
+            ValueError: If custom_cutoffs is invalid or max_concurrency is not
+                positive.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer.")
+
+        self.config = CutoffResolver.from_custom(custom_cutoffs)
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.store = store
+        self.metadata_cache = (
+            metadata_cache if metadata_cache is not None else default_metadata_cache
+        )
+        self.retry_policy = retry_policy
+        self.provider = provider
+        self.observer = observer
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def aget_data(
+        self,
+        symbol: str,
+        period: str = "4y",
+        interval: str = "1d",
+        index_type: str = "date",
+        output: str = "pandas",
+    ) -> tuple[pd.DataFrame, date]:
+        """
+        Fetch historical data for a single symbol.
+
+        Args:
+            symbol (str): The ticker symbol (e.g., 'AAPL', 'BTC-USD').
+            period (str): Data period to download (default: "4y").
+            interval (str): Data interval (default: "1d").
+            index_type (str): "date", "datetime" or "period"; see DataFetcher.
+            output (str): "pandas", "compact", "arrow" or "numpy"; see
+                DataFetcher.
+
+        Returns:
+            tuple[pd.DataFrame, date]: The cleaned DataFrame and its target date.
+
+        Raises:
+            TickerNotFoundError: If the ticker does not exist.
+            DataEmptyError: If no data is returned for the given period.
+            YFinanceConnectionError: If the connection fails or times out.
+            FinFetcherError: Base exception for other library errors.
+        """
+        symbol = symbol.upper()
+
+        async with self._semaphore:
+            with observing(self.observer), timed(symbol, "total"):
+                return await self._fetch(symbol, period, interval, index_type, output)
+
+    async def _fetch(
+        self,
+        symbol: str,
+        period: str,
+        interval: str,
+        index_type: str,
+        output: str,
+    ) -> tuple[pd.DataFrame, date]:
+        try:
+            return await asyncio.wait_for(
+                afetch_data(
+                    symbol,
+                    period=period,
+                    interval=interval,
+                    index_type=index_type,
+                    output=output,
+                    market_config=self.config,
+                    store=self.store,
+                    metadata_cache=self.metadata_cache,
+                    retry_policy=self.retry_policy,
+                    provider=self.provider,
+                ),
+                timeout=self.timeout,
+            )
+
+        except asyncio.TimeoutError as e:
+            logger.error(f"Timed out fetching {symbol} after {self.timeout}s")
+            record_error(symbol, e)
+            raise YFinanceConnectionError(
+                f"Timed out fetching {symbol} after {self.timeout}s."
+            ) from e
+
+        except FinFetcherError as e:
+            logger.error(f"Error fetching {symbol}: {e}")
+            record_error(symbol, e)
+            raise
+
+        except Exception as e:
+            logger.exception(f"Unexpected error while fetching data for {symbol}")
+            record_error(symbol, e)
+            raise FinFetcherError(f"An unexpected error occurred for {symbol}") from e
+
+    async def aget_many(
+        self,
+        symbols: list[str],
+        period: str = "4y",
+        interval: str = "1d",
+        index_type: str = "date",
+        output: str = "pandas",
+    ) -> tuple[dict[str, pd.DataFrame], dict[str, date], dict[str, FinFetcherError]]:
+        """
+        Fetch historical data for many symbols concurrently.
+
+        Args:
+            symbols (list[str]): The ticker symbols.
+            period (str): Data period to download (default: "4y").
+            interval (str): Data interval (default: "1d").
+            index_type (str): "date", "datetime" or "period"; see DataFetcher.
+            output (str): "pandas", "compact", "arrow" or "numpy"; see
+                DataFetcher.
+
+        Returns:
+            A tuple of (data, target_dates, errors), each a dict keyed by symbol.
+            Symbols that failed are only present in `errors`.
+        """
+        unique = list(dict.fromkeys(s.upper() for s in symbols))
+        results = await asyncio.gather(
+            *(self.aget_data(s, period, interval, index_type, output) for s in unique),
+            return_exceptions=True,
+        )
+
+        data: dict[str, pd.DataFrame] = {}
+        target_dates: dict[str, date] = {}
+        errors: dict[str, FinFetcherError] = {}
+
+        for symbol, result in zip(unique, results, strict=True):
+            if isinstance(result, FinFetcherError):
+                errors[symbol] = result
+            elif isinstance(result, BaseException):
+                # Cancellation and other non-library errors are not swallowed
+                raise result
+            else:
+                data[symbol], target_dates[symbol] = result
+
+        return data, target_dates, errors
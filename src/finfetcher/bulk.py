@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any
+
+from .core import MultiFetcher
+from .exceptions import DataEmptyError
+from .services.metadata import MetadataCache
+from .services.metrics import FetchObserver
+from .services.providers import DataProvider
+from .services.retry import RetryPolicy
+from .services.store import OHLCVStore
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    """
+    Append-only JSON Lines journal of the per-symbol outcomes of a bulk run.
+
+    The first line holds the run parameters, every further line the outcome
+    of one symbol: `{"symbol": ..., "status": "ok" | "failed", "rows": ...,
+    "error_type": ..., "error": ..., "at": ...}`. The last outcome of a
+    symbol wins. A line torn by a crash mid-write is ignored, so the journal
+    stays usable however the run ended.
+    """
+
+    def __init__(
+        self, path: str | Path, params: Mapping[str, Any] | None = None
+    ) -> None:
+        """
+        Args:
+            path: Journal file (created on the first outcome).
+            params: Run parameters, e.g. period and interval. Outcomes are
+                only valid for the parameters they were fetched with.
+
+        Raises:
+            ValueError: If the journal was written for other parameters.
+        """
+        self.path = Path(path).expanduser()
+        self.params = dict(params or {})
+        self.outcomes: dict[str, dict[str, Any]] = {}
+        self._file: IO[str] | None = None
+        if self.path.exists():
+            self._load()
+
+    def _load(self) -> None:
+        with open(self.path) as f:
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Ignoring torn line {number} of {self.path}")
+                    continue
+                if "params" in entry:
+                    if self.params and entry["params"] != self.params:
+                        raise ValueError(
+                            f"Checkpoint {self.path} was written for "
+                            f"{entry['params']}, not {self.params}."
+                        )
+                    continue
+                self.outcomes[entry["symbol"]] = entry
+
+        logger.debug(f"Loaded {len(self.outcomes)} outcomes from {self.path}")
+
+    def done(self) -> set[str]:
+        """Symbols fetched successfully."""
+        return {s for s, entry in self.outcomes.items() if entry["status"] == "ok"}
+
+    def failed(self) -> dict[str, dict[str, Any]]:
+        """Outcomes of the symbols whose last attempt failed."""
+        return {
+            s: entry for s, entry in self.outcomes.items() if entry["status"] != "ok"
+        }
+
+    def record(
+        self, symbol: str, rows: int = 0, error: BaseException | None = None
+    ) -> None:
+        """Appends the outcome of `symbol`; see `sync` for durability."""
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            new = not self.path.exists() or self.path.stat().st_size == 0
+            torn = False
+            if not new:
+                with open(self.path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b"\n"
+            self._file = open(self.path, "a")
+            if torn:
+                # Never append to a line a crash left unfinished
+                self._file.write("\n")
+            if new:
+                self._file.write(json.dumps({"params": self.params}) + "\n")
+
+        entry: dict[str, Any] = {
+            "symbol": symbol,
+            "status": "ok" if error is None else "failed",
+            "rows": rows,
+            "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        if error is not None:
+            entry.update(error_type=type(error).__name__, error=str(error))
+        self._file.write(json.dumps(entry) + "\n")
+        self.outcomes[symbol] = entry
+
+    def sync(self) -> None:
+        """Flushes the recorded outcomes to disk."""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+
+class BulkRunner:
+    """
+    Fault-tolerant fetching of a large universe, resumable from a checkpoint.
+
+    Symbols are fetched in parallel chunked requests. Every symbol's result
+    or typed error is collected instead of aborting the run, and its outcome
+    is journaled to the checkpoint once handled. A new run with the same
+    checkpoint only fetches the symbols that are unfinished or failed.
+    """
+
+    def __init__(
+        self,
+        symbols: list[str],
+        checkpoint: str | Path | None = None,
+        chunk_size: int = 100,
+        workers: int = 4,
+        max_failure_ratio: float | None = None,
+        custom_cutoffs: dict | None = None,
+        store: OHLCVStore | None = None,
+        metadata_cache: MetadataCache | None = None,
+        retry_policy: RetryPolicy | None = None,
+        provider: DataProvider | None = None,
+        observer: FetchObserver | None = None,
+    ) -> None:
+        """
+        Args:
+            symbols: The ticker symbols.
+            checkpoint: Journal file of the run (see Checkpoint). Without it,
+                nothing is resumable.
+            chunk_size: Maximum number of symbols per download request.
+            workers: Number of chunks fetched in parallel.
+            max_failure_ratio: Stop submitting chunks once more than this
+                share of the symbols processed so far (at least one chunk)
+                has failed, e.g. 0.5 when the network is down. The unfetched
+                symbols are left for a resumed run.
+            custom_cutoffs: Dictionary to merge with/override default
+                MARKET_CUTOFFS; see DataFetcher.
+            store: Local on-disk store of daily bars; see MultiFetcher.
+            metadata_cache: Cache of asset types and timezones.
+            retry_policy: Backoff, retry budget and circuit breaker.
+            provider: Source of metadata and bars.
+            observer: Receives per-phase timings, attempts and errors.
+
+        Raises:
+            ValueError: If chunk_size or workers is not positive, or
+                max_failure_ratio is not between 0 and 1.
+        """
+        if chunk_size < 1 or workers < 1:
+            raise ValueError("chunk_size and workers must be positive integers.")
+        if max_failure_ratio is not None and not 0 <= max_failure_ratio <= 1:
+            raise ValueError("max_failure_ratio must be between 0 and 1.")
+
+        # Keep order, drop duplicates
+        self.symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        self.checkpoint = checkpoint
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.max_failure_ratio = max_failure_ratio
+        self.custom_cutoffs = custom_cutoffs
+        self.store = store
+        self.metadata_cache = metadata_cache
+        self.retry_policy = retry_policy
+        self.provider = provider
+        self.observer = observer
+
+        self.pending: list[str] = []
+        self.skipped: list[str] = []
+        self.target_dates: dict = {}
+        self.errors: dict[str, Exception] = {}
+        self.aborted = False
+
+    def _fetch_chunk(
+        self, chunk: list[str], **kwargs: Any
+    ) -> tuple[list[str], dict[str, Any], MultiFetcher | None, Exception | None]:
+        fetcher = MultiFetcher(
+            chunk,
+            custom_cutoffs=self.custom_cutoffs,
+            chunk_size=self.chunk_size,
+            store=self.store,
+            metadata_cache=self.metadata_cache,
+            retry_policy=self.retry_policy,
+            provider=self.provider,
+            observer=self.observer,
+        )
+        try:
+            return chunk, fetcher.get_data(**kwargs), fetcher, None
+        except Exception as e:
+            # Unexpected failures cost this chunk, not the whole run
+            return chunk, {}, None, e
+
+    def run(
+        self,
+        period: str = "4y",
+        interval: str = "1d",
+        index_type: str = "date",
+        output: str = "pandas",
+        handler: Callable[[str, Any], object] | None = None,
+        on_result: Callable[[str, Any, Exception | None], object] | None = None,
+        retry_failed_only: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Fetches the symbols not yet done according to the checkpoint.
+
+        Args:
+            period: Data period to download.
+            interval: Data interval.
+            index_type: "date", "datetime" or "period"; see DataFetcher.
+            output: "pandas", "compact", "arrow" or "numpy"; see DataFetcher.
+            handler: Called with each symbol and its data as soon as its chunk
+                arrives, e.g. to write it out; the data is then not kept in
+                memory. An exception it raises fails the symbol. Called from
+                one thread only.
+            on_result: Called with each processed symbol, its data (or None)
+                and its error (or None), e.g. for progress output.
+            retry_failed_only: Only fetch the symbols that failed in earlier
+                runs, not those never attempted.
+
+        Returns:
+            dict[str, Any]: Data keyed by symbol, empty if a handler consumed
+                it. Per-symbol errors are stored in `errors`, target dates in
+                `target_dates`, symbols done in earlier runs in `skipped`
+                and whether `max_failure_ratio` stopped the run in `aborted`.
+
+        Raises:
+            ValueError: If retry_failed_only is set without a checkpoint, or
+                the checkpoint was written for another period or interval.
+        """
+        if retry_failed_only and self.checkpoint is None:
+            raise ValueError("retry_failed_only needs a checkpoint.")
+
+        journal = (
+            Checkpoint(self.checkpoint, {"period": period, "interval": interval})
+            if self.checkpoint is not None
+            else None
+        )
+        if journal is None:
+            self.pending = list(self.symbols)
+        elif retry_failed_only:
+            failed = journal.failed()
+            self.pending = [s for s in self.symbols if s in failed]
+        else:
+            done = journal.done()
+            self.pending = [s for s in self.symbols if s not in done]
+        pending = set(self.pending)
+        self.skipped = [s for s in self.symbols if s not in pending]
+        self.target_dates, self.errors, self.aborted = {}, {}, False
+        if self.skipped:
+            logger.info(f"Skipping {len(self.skipped)} symbols done in earlier runs")
+
+        chunks = [
+            self.pending[offset : offset + self.chunk_size]
+            for offset in range(0, len(self.pending), self.chunk_size)
+        ]
+        data: dict[str, Any] = {}
+        processed = 0
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = [
+                    executor.submit(
+                        self._fetch_chunk,
+                        chunk,
+                        period=period,
+                        interval=interval,
+                        index_type=index_type,
+                        output=output,
+                    )
+                    for chunk in chunks
+                ]
+                # Handled and journaled by this thread as chunks complete
+                for future in as_completed(futures):
+                    chunk, fetched, fetcher, chunk_error = future.result()
+                    for symbol in chunk:
+                        error = self._handle(
+                            symbol, fetched, fetcher, chunk_error, handler, data
+                        )
+                        if journal is not None:
+                            rows = len(fetched[symbol]) if error is None else 0
+                            journal.record(symbol, rows=rows, error=error)
+                        if on_result is not None:
+                            on_result(symbol, fetched.get(symbol), error)
+                    if journal is not None:
+                        journal.sync()
+
+                    processed += len(chunk)
+                    if self._too_many_failures(processed):
+                        self.aborted = True
+                        logger.error(
+                            f"Stopping: {len(self.errors)}/{processed} symbols "
+                            f"failed, more than max_failure_ratio="
+                            f"{self.max_failure_ratio}"
+                        )
+                        for future in futures:
+                            future.cancel()
+                        break
+        finally:
+            if journal is not None:
+                journal.close()
+
+        return data
+
+    def _handle(
+        self,
+        symbol: str,
+        fetched: dict[str, Any],
+        fetcher: MultiFetcher | None,
+        chunk_error: Exception | None,
+        handler: Callable[[str, Any], object] | None,
+        data: dict[str, Any],
+    ) -> Exception | None:
+        """Hands a symbol's data on, or records its error, and returns it."""
+        if symbol not in fetched:
+            error = chunk_error
+            if error is None and fetcher is not None:
+                error = fetcher.errors.get(symbol)
+            if error is None:
+                error = DataEmptyError(f"No data returned for {symbol}.")
+            self.errors[symbol] = error
+            return error
+
+        assert fetcher is not None
+        self.target_dates[symbol] = fetcher.target_dates[symbol]
+        if handler is None:
+            data[symbol] = fetched[symbol]
+            return None
+        try:
+            handler(symbol, fetched[symbol])
+        except Exception as e:
+            logger.error(f"Handling {symbol} failed: {e}")
+            self.errors[symbol] = e
+            return e
+        return None
+
+    def _too_many_failures(self, processed: int) -> bool:
+        if self.max_failure_ratio is None:
+            return False
+        if processed < min(self.chunk_size, len(self.pending)):
+            return False
+        return len(self.errors) / processed > self.max_failure_ratio
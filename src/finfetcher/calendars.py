@@ -0,0 +1,459 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable, Iterable, Mapping
+from datetime import date, datetime, time, timedelta
+from typing import TYPE_CHECKING, Any
+
+from ._lazy import lazy_import
+from .cutoffs import ResolvedCutoff
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+# Cutoffs in MARKET_CUTOFFS include a delay for yfinance; early closes get the same
+CLOSE_DELAY_MINUTES = 20
+
+CALENDAR_START = date(1990, 1, 1)
+CALENDAR_END = date(2050, 12, 31)
+
+WEEKDAYS = "1111100"
+EVERY_DAY = "1111111"
+
+HolidayRules = Callable[[int], tuple[list[date], dict[date, tuple[int, int]]]]
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th (1-based, -1 for last) weekday (Mon=0) of a month."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    """Western Easter Sunday (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l_ = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l_) // 451
+    month, day = divmod(h + l_ - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _us_observed(day: date) -> date:
+    """Saturday holidays move to Friday, Sunday holidays to Monday."""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def nyse_rules(year: int) -> tuple[list[date], dict[date, tuple[int, int]]]:
+    """
+    Regular NYSE holidays and 13:00 early closes of a year.
+
+    One-off closures (e.g. national days of mourning) are not included.
+    """
+    holidays = []
+    new_year = date(year, 1, 1)
+    # A Saturday New Year's Day is not observed on the previous Friday
+    if new_year.weekday() != 5:
+        holidays.append(_us_observed(new_year))
+    if year >= 1998:
+        holidays.append(_nth_weekday(year, 1, 0, 3))  # Martin Luther King Jr. Day
+    holidays.append(_nth_weekday(year, 2, 0, 3))  # Washington's Birthday
+    holidays.append(_easter(year) - timedelta(days=2))  # Good Friday
+    holidays.append(_nth_weekday(year, 5, 0, -1))  # Memorial Day
+    if year >= 2022:
+        holidays.append(_us_observed(date(year, 6, 19)))  # Juneteenth
+    holidays.append(_us_observed(date(year, 7, 4)))  # Independence Day
+    holidays.append(_nth_weekday(year, 9, 0, 1))  # Labor Day
+    thanksgiving = _nth_weekday(year, 11, 3, 4)
+    holidays.append(thanksgiving)
+    holidays.append(_us_observed(date(year, 12, 25)))  # Christmas
+
+    early_closes = {thanksgiving + timedelta(days=1): (13, 0)}
+    for day in (date(year, 7, 3), date(year, 12, 24)):
+        # Only Monday-Thursday: on a Friday it is the observed holiday itself
+        if day.weekday() < 4:
+            early_closes[day] = (13, 0)
+    return holidays, early_closes
+
+
+def lse_rules(year: int) -> tuple[list[date], dict[date, tuple[int, int]]]:
+    """Regular London Stock Exchange holidays and 12:30 early closes of a year."""
+    easter = _easter(year)
+    new_year = date(year, 1, 1)
+    while new_year.weekday() >= 5:
+        new_year += timedelta(days=1)
+    holidays = [
+        new_year,
+        easter - timedelta(days=2),  # Good Friday
+        easter + timedelta(days=1),  # Easter Monday
+        _nth_weekday(year, 5, 0, 1),  # Early May bank holiday
+        _nth_weekday(year, 5, 0, -1),  # Spring bank holiday
+        _nth_weekday(year, 8, 0, -1),  # Summer bank holiday
+    ]
+    _add_christmas(year, holidays)
+    return holidays, _year_end_closes(year, holidays, (12, 30))
+
+
+def _next_monday(day: date) -> date:
+    """Weekend holidays move to the following Monday."""
+    return day + timedelta(days=(7 - day.weekday()) % 7) if day.weekday() >= 5 else day
+
+
+def _add_christmas(year: int, holidays: list[date]) -> None:
+    """Christmas and Boxing Day, substituted by the following free weekdays."""
+    day = date(year, 12, 25)
+    for _ in range(2):
+        while day.weekday() >= 5 or day in holidays:
+            day += timedelta(days=1)
+        holidays.append(day)
+        day += timedelta(days=1)
+
+
+def _year_end_closes(
+    year: int,
+    holidays: list[date],
+    close: tuple[int, int],
+    days: tuple[int, ...] = (24, 31),
+) -> dict[date, tuple[int, int]]:
+    """Early `close` on the given December weekdays that are sessions."""
+    return {
+        day: close
+        for day in (date(year, 12, d) for d in days)
+        if day.weekday() < 5 and day not in holidays
+    }
+
+
+def _european_holidays(year: int) -> list[date]:
+    """New Year, Easter and Labour Day, closed on most European exchanges."""
+    easter = _easter(year)
+    return [
+        date(year, 1, 1),
+        easter - timedelta(days=2),  # Good Friday
+        easter + timedelta(days=1),  # Easter Monday
+        date(year, 5, 1),
+    ]
+
+
+def euronext_rules(year: int) -> tuple[list[date], dict[date, tuple[int, int]]]:
+    """Euronext (Paris, Amsterdam) holidays and 14:05 early closes of a year."""
+    holidays = [*_european_holidays(year), date(year, 12, 25), date(year, 12, 26)]
+    return holidays, _year_end_closes(year, holidays, (14, 5))
+
+
+def xetra_rules(year: int) -> tuple[list[date], dict[date, tuple[int, int]]]:
+    """Xetra (Frankfurt) holidays of a year."""
+    holidays = _european_holidays(year)
+    holidays += [date(year, 12, d) for d in (24, 25, 26, 31)]
+    return holidays, {}
+
+
+def six_rules(year: int) -> tuple[list[date], dict[date, tuple[int, int]]]:
+    """SIX Swiss Exchange holidays of a year."""
+    easter = _easter(year)
+    holidays = _european_holidays(year)
+    holidays += [
+        date(year, 1, 2),  # Berchtold's Day
+        easter + timedelta(days=39),  # Ascension Day
+        easter + timedelta(days=50),  # Whit Monday
+        date(year, 8, 1),  # National Day
+    ]
+    holidays += [date(year, 12, d) for d in (24, 25, 26, 31)]
+    return holidays, {}
+
+
+def bme_rules(year: int) -> tuple[list[date], dict[date, tuple[int, int]]]:
+    """Bolsa de Madrid holidays and 14:00 early closes of a year."""
+    holidays = [*_european_holidays(year), date(year, 12, 25), date(year, 12, 26)]
+    return holidays, _year_end_closes(year, holidays, (14, 0))
+
+
+def borsa_italiana_rules(year: int) -> tuple[list[date], dict[date, tuple[int, int]]]:
+    """Borsa Italiana (Milan) holidays of a year."""
+    holidays = _european_holidays(year)
+    holidays += [date(year, 8, 15)]  # Assumption Day
+    holidays += [date(year, 12, d) for d in (24, 25, 26, 31)]
+    return holidays, {}
+
+
+def tsx_rules(year: int) -> tuple[list[date], dict[date, tuple[int, int]]]:
+    """Toronto Stock Exchange holidays and 13:00 early closes of a year."""
+    holidays = [_next_monday(date(year, 1, 1))]
+    if year >= 2008:
+        holidays.append(_nth_weekday(year, 2, 0, 3))  # Family Day
+    holidays += [
+        _easter(year) - timedelta(days=2),  # Good Friday
+        date(year, 5, 24) - timedelta(days=date(year, 5, 24).weekday()),  # Victoria
+        _next_monday(date(year, 7, 1)),  # Canada Day
+        _nth_weekday(year, 8, 0, 1),  # Civic Holiday
+        _nth_weekday(year, 9, 0, 1),  # Labour Day
+        _nth_weekday(year, 10, 0, 2),  # Thanksgiving
+    ]
+    _add_christmas(year, holidays)
+    return holidays, _year_end_closes(year, holidays, (13, 0), days=(24,))
+
+
+def asx_rules(year: int) -> tuple[list[date], dict[date, tuple[int, int]]]:
+    """Australian Securities Exchange holidays and 14:10 early closes of a year."""
+    easter = _easter(year)
+    holidays = [
+        _next_monday(date(year, 1, 1)),
+        _next_monday(date(year, 1, 26)),  # Australia Day
+        easter - timedelta(days=2),  # Good Friday
+        easter + timedelta(days=1),  # Easter Monday
+        date(year, 4, 25),  # Anzac Day, not moved when on a weekend
+        _nth_weekday(year, 6, 0, 2),  # King's Birthday
+    ]
+    _add_christmas(year, holidays)
+    return holidays, _year_end_closes(year, holidays, (14, 10))
+
+
+def _to_days(dates: Any) -> np.ndarray:
+    if isinstance(dates, date) and getattr(dates, "tzinfo", None) is None:
+        # Single naive dates are the common case; pd.to_datetime costs ~40x more
+        return np.array([np.datetime64(dates, "D")])
+    values = np.atleast_1d(np.asarray(dates))
+    if values.dtype.kind != "M":
+        values = pd.to_datetime(values).to_numpy()
+    return values.astype("datetime64[D]")
+
+
+class ExchangeCalendar:
+    """
+    Trading sessions of one exchange, precomputed as a sorted day array.
+
+    Sessions between `start` and `end` are looked up by binary search; dates
+    outside that range fall back to `numpy.busday_offset` with the same
+    weekmask and holidays. All lookups accept a single date or an array.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        holidays: Iterable[date] = (),
+        early_closes: Mapping[date, tuple[int, int]] | None = None,
+        weekmask: str = WEEKDAYS,
+        start: date = CALENDAR_START,
+        end: date = CALENDAR_END,
+    ) -> None:
+        """
+        Args:
+            name: Calendar name, usually the exchange timezone.
+            holidays: Dates without a session.
+            early_closes: Local (hour, minute) closes of shortened sessions.
+            weekmask: Trading weekdays, Monday first ("1111100": Mon-Fri).
+            start: First day of the precomputed session array.
+            end: Last day of the precomputed session array.
+        """
+        self.name = name
+        self.weekmask = weekmask
+        self.holidays = np.unique(_to_days(list(holidays)))
+        self.early_closes = dict(early_closes or {})
+        self._busdaycal = np.busdaycalendar(weekmask=weekmask, holidays=self.holidays)
+
+        days = np.arange(
+            np.datetime64(start, "D"),
+            np.datetime64(end, "D") + 1,
+            dtype="datetime64[D]",
+        )
+        self.sessions = days[np.is_busday(days, busdaycal=self._busdaycal)]
+
+    @classmethod
+    def from_rules(
+        cls, name: str, rules: HolidayRules, **kwargs: Any
+    ) -> "ExchangeCalendar":
+        """Builds a calendar from yearly holiday and early-close rules."""
+        start = kwargs.get("start", CALENDAR_START)
+        end = kwargs.get("end", CALENDAR_END)
+        holidays: list[date] = []
+        early_closes: dict[date, tuple[int, int]] = {}
+        for year in range(start.year, end.year + 1):
+            year_holidays, year_early_closes = rules(year)
+            holidays.extend(year_holidays)
+            early_closes.update(year_early_closes)
+        return cls(name, holidays, early_closes, **kwargs)
+
+    def is_session(self, dates: Any) -> Any:
+        """Whether the date(s) are trading sessions."""
+        result = np.is_busday(_to_days(dates), busdaycal=self._busdaycal)
+        return bool(result[0]) if np.ndim(dates) == 0 else result
+
+    def next_session(self, dates: Any, n: int = 1) -> Any:
+        """
+        Returns the n-th session strictly after each date.
+
+        Returns:
+            A `date` for a single date, otherwise a datetime64[D] array.
+        """
+        if n < 1:
+            raise ValueError("n must be a positive integer.")
+        days = _to_days(dates)
+        idx = np.searchsorted(self.sessions, days, side="right") + (n - 1)
+        inside = (days >= self.sessions[0]) & (idx < len(self.sessions))
+        result = np.empty_like(days)
+        result[inside] = self.sessions[idx[inside]]
+        if not inside.all():
+            result[~inside] = np.busday_offset(
+                days[~inside], n, roll="backward", busdaycal=self._busdaycal
+            )
+        return result[0].item() if np.ndim(dates) == 0 else result
+
+    def sessions_after(self, day: Any, count: int) -> np.ndarray:
+        """Returns the next `count` sessions strictly after `day`."""
+        start = _to_days(day)[0]
+        first = np.searchsorted(self.sessions, start, side="right")
+        if start >= self.sessions[0] and first + count <= len(self.sessions):
+            return self.sessions[first : first + count]
+        return np.busday_offset(
+            start, np.arange(1, count + 1), roll="backward", busdaycal=self._busdaycal
+        )
+
+    def sessions_before(self, day: Any, count: int) -> np.ndarray:
+        """Returns the last `count` sessions on or before `day`, oldest first."""
+        return np.busday_offset(
+            _to_days(day)[0],
+            np.arange(1 - count, 1),
+            roll="backward",
+            busdaycal=self._busdaycal,
+        )
+
+    def early_close(self, day: date) -> tuple[int, int] | None:
+        """Local (hour, minute) close if `day` is a shortened session."""
+        return self.early_closes.get(day)
+
+    def __repr__(self) -> str:
+        return f"ExchangeCalendar({self.name!r}, sessions={len(self.sessions)})"
+
+
+# Exchange timezone (as in MARKET_CUTOFFS) -> holiday rules. Other timezones,
+# including Tokyo, Hong Kong, Singapore and Kolkata whose holidays follow lunar
+# or announced calendars, use a weekdays-only calendar unless one is registered
+CALENDAR_RULES: dict[str, HolidayRules] = {
+    "America/New_York": nyse_rules,
+    "America/Toronto": tsx_rules,
+    "Europe/London": lse_rules,
+    "Europe/Berlin": xetra_rules,
+    "Europe/Paris": euronext_rules,
+    "Europe/Amsterdam": euronext_rules,
+    "Europe/Zurich": six_rules,
+    "Europe/Madrid": bme_rules,
+    "Europe/Rome": borsa_italiana_rules,
+    "Australia/Sydney": asx_rules,
+}
+
+_calendars: dict[str, ExchangeCalendar] = {}
+_lock = threading.Lock()
+# Timezones already warned about falling back to weekdays
+_fallbacks: set[str | None] = set()
+
+
+def _build(key: str) -> ExchangeCalendar:
+    if key == "24/7":
+        return ExchangeCalendar(key, weekmask=EVERY_DAY)
+    if key in CALENDAR_RULES:
+        return ExchangeCalendar.from_rules(key, CALENDAR_RULES[key])
+    return ExchangeCalendar(key)
+
+
+def _get(key: str) -> ExchangeCalendar:
+    calendar = _calendars.get(key)
+    if calendar is None:
+        with _lock:
+            calendar = _calendars.get(key)
+            if calendar is None:
+                calendar = _calendars[key] = _build(key)
+    return calendar
+
+
+def get_calendar(tz_name: str | None) -> ExchangeCalendar:
+    """
+    Returns the (shared, lazily built) calendar of an exchange timezone.
+
+    Timezones without holiday rules (see CALENDAR_RULES) or a registered
+    calendar get a weekdays-only calendar, which takes their holidays for
+    sessions; a warning is logged once per timezone.
+    """
+    if tz_name in _calendars or tz_name in CALENDAR_RULES:
+        return _get(tz_name)  # type: ignore[arg-type]
+    if tz_name not in _fallbacks:
+        with _lock:
+            warn = tz_name not in _fallbacks
+            _fallbacks.add(tz_name)
+        if warn:
+            logger.warning(
+                f"No holiday calendar for {tz_name}, only weekends are skipped. "
+                "Use register_calendar to provide one."
+            )
+    return _get("weekdays")
+
+
+def register_calendar(tz_name: str, calendar: ExchangeCalendar) -> None:
+    """Sets the calendar used for equities traded in `tz_name`."""
+    with _lock:
+        _calendars[tz_name] = calendar
+
+
+def session_calendar(
+    asset_type: str | None, cutoff: ResolvedCutoff
+) -> ExchangeCalendar:
+    """
+    Calendar for an asset: every day for crypto, weekdays for assets with a
+    forced timezone (futures, currencies) and the exchange calendar otherwise.
+    """
+    if asset_type == "CRYPTOCURRENCY":
+        return _get("24/7")
+    if cutoff.forced:
+        return _get("weekdays")
+    return get_calendar(cutoff.tz_name)
+
+
+def effective_cutoff(
+    cutoff: ResolvedCutoff, calendar: ExchangeCalendar, day: date
+) -> tuple[int, int]:
+    """Configured cutoff, moved earlier on an early-close day."""
+    early = calendar.early_close(day)
+    if early is None:
+        return cutoff.hour, cutoff.minute
+    early_cutoff = divmod(early[0] * 60 + early[1] + CLOSE_DELAY_MINUTES, 60)
+    return min((cutoff.hour, cutoff.minute), early_cutoff)
+
+
+def session_cutoff(
+    cutoff: ResolvedCutoff, calendar: ExchangeCalendar, day: date
+) -> datetime:
+    """Cutoff of the session on `day`, as a timezone-aware datetime."""
+    hour, minute = effective_cutoff(cutoff, calendar, day)
+    return cutoff.tz.localize(datetime.combine(day, time(hour, minute)))  # type: ignore[attr-defined]
+
+
+def next_cutoff(
+    cutoff: ResolvedCutoff, calendar: ExchangeCalendar, after: datetime
+) -> datetime:
+    """
+    Returns the first session cutoff strictly after `after` (timezone-aware),
+    as a timezone-aware datetime in the market's timezone.
+    """
+    day = after.astimezone(cutoff.tz).date()
+    if not calendar.is_session(day):
+        day = calendar.next_session(day)
+    while True:
+        when = session_cutoff(cutoff, calendar, day)
+        if when > after:
+            return when
+        day = calendar.next_session(day)
@@ -0,0 +1,220 @@
+"""
+Command-line bulk downloader.
+
+    finfetcher symbols.txt --out data/ --period 4y --interval 1d --workers 8
+
+Reads one symbol per line (blank lines and `#` comments are ignored, `-`
+reads stdin), fetches them in parallel chunked requests and writes every
+chunk to a symbol- and date-partitioned Parquet dataset as soon as it is
+cleaned, so an interrupted run keeps what it finished. With `--checkpoint`
+every symbol's outcome is journaled and a rerun only fetches the symbols
+that are unfinished or failed:
+
+    finfetcher symbols.txt --out data/ --checkpoint run.jsonl
+    finfetcher symbols.txt --out data/ --checkpoint run.jsonl --retry-failed
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from collections.abc import Iterable
+from importlib.util import find_spec
+from pathlib import Path
+from typing import TYPE_CHECKING, TextIO
+
+from .bulk import BulkRunner
+from .exceptions import FinFetcherError
+from .services.dataset import PARTITIONS, PartitionedDataset
+from .services.metadata import MetadataCache
+from .services.store import OHLCVStore
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def read_symbols(lines: Iterable[str]) -> list[str]:
+    """Symbols of a symbol list, in order and without duplicates."""
+    symbols = []
+    for line in lines:
+        symbol = line.split("#", 1)[0].strip()
+        if symbol:
+            symbols.append(symbol.upper())
+    return list(dict.fromkeys(symbols))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="finfetcher",
+        description="Download cleaned OHLCV bars of many symbols into a "
+        "partitioned Parquet dataset.",
+    )
+    parser.add_argument(
+        "symbols", help="File with one symbol per line, or - for stdin."
+    )
+    parser.add_argument("-o", "--out", required=True, help="Dataset directory.")
+    parser.add_argument("--period", default="4y", help="yfinance period (4y).")
+    parser.add_argument("--interval", default="1d", help="yfinance interval (1d).")
+    parser.add_argument(
+        "--partition",
+        choices=tuple(PARTITIONS),
+        default="year",
+        help="Date partition granularity (year).",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=4, help="Parallel chunk downloads (4)."
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=100, help="Symbols per request (100)."
+    )
+    parser.add_argument(
+        "--store",
+        help="OHLCVStore directory: daily histories are topped up from it "
+        "instead of downloaded in full.",
+    )
+    parser.add_argument(
+        "--metadata-cache",
+        help="Persistent metadata cache file (JSON), reused across runs.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="Journal of per-symbol outcomes (JSON Lines). Rerunning with it "
+        "skips the symbols already written.",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Only fetch the symbols that failed in the checkpoint.",
+    )
+    parser.add_argument(
+        "--max-failure-ratio",
+        type=float,
+        help="Stop early once more than this share of symbols failed (0-1).",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Only print the summary."
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Debug logs.")
+    return parser
+
+
+def main(argv: list[str] | None = None, stdout: TextIO | None = None) -> int:
+    """
+    Entry point of the `finfetcher` console script.
+
+    Returns:
+        0 if every symbol was written, 1 if some failed or the run stopped
+        early, 2 on bad arguments.
+    """
+    out = stdout or sys.stdout
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error("--workers and --chunk-size must be positive integers.")
+    if args.max_failure_ratio is not None and not 0 <= args.max_failure_ratio <= 1:
+        parser.error("--max-failure-ratio must be between 0 and 1.")
+    if args.retry_failed and not args.checkpoint:
+        parser.error("--retry-failed needs --checkpoint.")
+    if find_spec("pyarrow") is None:
+        # Checked up front rather than failing on the first symbol written
+        parser.error(
+            "Writing Parquet datasets requires pyarrow: "
+            "pip install 'finfetcher[parquet]'"
+        )
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(levelname)s %(name)s: %(message)s",
+    )
+
+    if args.symbols == "-":
+        symbols = read_symbols(sys.stdin)
+    else:
+        try:
+            symbols = read_symbols(Path(args.symbols).read_text().splitlines())
+        except OSError as e:
+            parser.error(f"Cannot read symbol file: {e}")
+    if not symbols:
+        parser.error("The symbol list is empty.")
+
+    dataset = PartitionedDataset(args.out, partition=args.partition)
+    store = OHLCVStore(args.store) if args.store else None
+    metadata_cache = (
+        MetadataCache(path=args.metadata_cache) if args.metadata_cache else None
+    )
+
+    runner = BulkRunner(
+        symbols,
+        checkpoint=args.checkpoint,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        max_failure_ratio=args.max_failure_ratio,
+        store=store,
+        metadata_cache=metadata_cache,
+    )
+    written: dict[str, int] = {}
+    rows = files = done = 0
+
+    def write(symbol: str, df: pd.DataFrame) -> None:
+        nonlocal rows, files
+        try:
+            written[symbol] = dataset.write(symbol, df)
+        except Exception as e:
+            raise FinFetcherError(f"write failed: {e}") from e
+        rows += len(df)
+        files += written[symbol]
+
+    def report(symbol: str, df: pd.DataFrame | None, error: Exception | None) -> None:
+        nonlocal done
+        done += 1
+        if args.quiet:
+            return
+        if df is not None and error is None:
+            status = (
+                f"ok    {symbol}: {len(df)} rows, {written[symbol]} partitions written"
+            )
+        else:
+            status = f"FAIL  {symbol}: {error}"
+        total = len(runner.pending)
+        print(f"[{done:>{len(str(total))}}/{total}] {status}", file=out)
+
+    start = time.perf_counter()
+    try:
+        runner.run(
+            period=args.period,
+            interval=args.interval,
+            index_type="datetime",
+            handler=write,
+            on_result=report,
+            retry_failed_only=args.retry_failed,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    total = len(runner.pending)
+    failed = runner.errors
+    if runner.skipped:
+        print(f"Skipped {len(runner.skipped)} symbols per the checkpoint", file=out)
+    print(
+        f"{done - len(failed)}/{total} symbols, {rows} rows, {files} partition "
+        f"files in {elapsed:.1f}s ({done / elapsed:.1f} symbols/s, "
+        f"{rows / elapsed:.0f} rows/s)",
+        file=out,
+    )
+    if failed:
+        print(f"Failed: {', '.join(sorted(failed))}", file=out)
+    if runner.aborted:
+        print(
+            f"Aborted after {done}/{total} symbols: more than "
+            f"{args.max_failure_ratio:.0%} failed. Rerun with the same "
+            f"--checkpoint to resume.",
+            file=out,
+        )
+    return 1 if failed or runner.aborted else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
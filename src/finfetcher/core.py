@@ -1,12 +1,38 @@
-import copy
-import logging
+from __future__ import annotations
 
-import pandas as pd
-import yfinance as yf
+import logging
+from collections.abc import Callable
+from datetime import date, datetime, timezone
+from typing import TYPE_CHECKING, Any
 
-from .config import MARKET_CUTOFFS
+from ._lazy import lazy_import
+from .cutoffs import CutoffResolver
 from .exceptions import DataEmptyError, FinFetcherError, TickerNotFoundError
-from .services.fetch_data import fetch_data
+from .services.derive import RESAMPLE_PERIODS, derive, resample_bars
+from .services.fetch_batch import fetch_many
+from .services.fetch_data import check_index_type, fetch_data, format_index
+from .services.memory_cache import FetchCache, data_expiry, fetch_key
+from .services.metadata import MetadataCache, default_metadata_cache
+from .services.metrics import FetchObserver, observing, record_error, timed
+from .services.output import check_output, convert_output
+from .services.providers import DataProvider, YFinanceProvider, resolve_provider
+from .services.retry import RetryPolicy
+from .services.session import get_session
+from .services.store import (
+    OHLCVStore,
+    exchange_today,
+    latest_periods,
+    market_calendar,
+    merge_bars,
+)
+from .services.windows import fetch_range
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import yfinance as yf
+else:
+    pd = lazy_import("pandas")
+    yf = lazy_import("yfinance")
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +48,17 @@ class DataFetcher:
     - Calculating the next valid trading date (target_date).
     """
 
-    def __init__(self, symbol: str, custom_cutoffs: dict | None = None) -> None:
+    def __init__(
+        self,
+        symbol: str,
+        custom_cutoffs: dict | None = None,
+        store: OHLCVStore | None = None,
+        metadata_cache: MetadataCache | None = None,
+        retry_policy: RetryPolicy | None = None,
+        fetch_cache: FetchCache | None = None,
+        provider: DataProvider | None = None,
+        observer: FetchObserver | None = None,
+    ) -> None:
         """
         Initialize the DataFetcher with a ticker symbol.
 
@@ -52,6 +88,24 @@ class DataFetcher:
                         "default": {"hour": 23, "minute": 59}
                     }
                 }
+            store (OHLCVStore, optional): Local on-disk store of daily bars.
+                When given, only dates after the last stored complete bar are
+                downloaded and appended to it.
+            metadata_cache (MetadataCache, optional): Cache of asset types and
+                timezones. Defaults to the process-wide in-memory cache.
+            retry_policy (RetryPolicy, optional): Backoff, retry budget and
+                circuit breaker for downloads. Defaults to DEFAULT_RETRY_POLICY.
+            fetch_cache (FetchCache, optional): In-process cache shared between
+                fetchers. Results are reused until the symbol's next market
+                cutoff and concurrent identical requests share one download.
+                A SharedFetchCache extends this to all processes on the host.
+            provider (DataProvider, optional): Source of metadata and bars,
+                e.g. a ReplayProvider serving recorded files. Defaults to the
+                process-wide provider (yfinance).
+            observer (FetchObserver, optional): Receives per-phase timings,
+                attempts, row counts and errors of this fetcher's requests,
+                e.g. a MetricsCollector. Defaults to the process-wide
+                observer, if any.
 
         Raises:
             TickerNotFoundError: If the ticker initialization fails.
@@ -60,74 +114,142 @@ class DataFetcher:
         """
         self.symbol = symbol.upper()
         self.target_date = None
-        self.ticker = yf.Ticker(symbol)
-
-        if custom_cutoffs:
-            if not isinstance(custom_cutoffs, dict):
-                raise TypeError("custom_cutoffs must be a dictionary.")
-
-            for asset, conf in custom_cutoffs.items():
-                if not isinstance(asset, str):
-                    raise TypeError(f"Asset key '{asset}' must be a string.")
-                if not isinstance(conf, dict):
-                    raise TypeError(
-                        f"Configuration for '{asset}' must be a dictionary."
-                    )
-
-                # Validate 'default' if present
-                if "default" in conf:
-                    d = conf["default"]
-                    if (
-                        not isinstance(d, dict)
-                        or not isinstance(d.get("hour"), int)
-                        or not isinstance(d.get("minute"), int)
-                    ):
-                        raise ValueError(
-                            f"Invalid 'default' for '{asset}': "
-                            "must be dict with int 'hour' and 'minute'."
-                        )
-
-                # Validate 'timezones' if present
-                if "timezones" in conf:
-                    if not isinstance(conf["timezones"], dict):
-                        raise TypeError(
-                            f"'timezones' for '{asset}' must be a dictionary."
-                        )
-                    for tz_key, tz_val in conf["timezones"].items():
-                        if (
-                            not isinstance(tz_val, dict)
-                            or not isinstance(tz_val.get("hour"), int)
-                            or not isinstance(tz_val.get("minute"), int)
-                        ):
-                            raise ValueError(
-                                f"Invalid config for '{asset}'->'{tz_key}': "
-                                "must be dict with int 'hour' and 'minute'."
-                            )
-
-        self.config = copy.deepcopy(MARKET_CUTOFFS)
-        if custom_cutoffs:
-            for key, value in custom_cutoffs.items():
-                if (
-                    key in self.config
-                    and isinstance(self.config[key], dict)
-                    and isinstance(value, dict)
-                ):
-                    self.config[key].update(value)
-                else:
-                    self.config[key] = value
-
-    def get_data(self, period: str = "4y", interval: str = "1d") -> pd.DataFrame:
+        self._ticker: yf.Ticker | None = None
+        self.store = store
+        self.metadata_cache = (
+            metadata_cache if metadata_cache is not None else default_metadata_cache
+        )
+        self.retry_policy = retry_policy
+        self.fetch_cache = fetch_cache
+        self.provider = provider
+        self.observer = observer
+        # (period, daily bars, target date, expiry) of the last daily fetch
+        self._held: tuple[str, pd.DataFrame, date, datetime] | None = None
+
+        self.config = CutoffResolver.from_custom(custom_cutoffs)
+
+    @property
+    def ticker(self) -> yf.Ticker:
+        """
+        The yfinance Ticker of the symbol, created on first use.
+
+        Fetches read metadata from it once it exists; otherwise they only
+        create a Ticker on a metadata cache miss of the yfinance provider.
+        """
+        if self._ticker is None:
+            provider = resolve_provider(self.provider)
+            if isinstance(provider, YFinanceProvider):
+                self._ticker = provider.ticker(self.symbol)
+            else:
+                self._ticker = yf.Ticker(self.symbol, session=get_session())
+        return self._ticker
+
+    def _fetch(self, period: str, interval: str) -> tuple[pd.DataFrame, date]:
+        """Cleaned data with a datetime64 index, via the fetch cache if any."""
+
+        def fetch() -> tuple[pd.DataFrame, date]:
+            return fetch_data(
+                ticker_obj=self._ticker,
+                symbol=self.symbol,
+                period=period,
+                interval=interval,
+                index_type="datetime",
+                market_config=self.config,
+                store=self.store,
+                metadata_cache=self.metadata_cache,
+                retry_policy=self.retry_policy,
+                provider=self.provider,
+            )
+
+        cache = self.fetch_cache
+        if cache is None:
+            return fetch()
+        return cache.get_or_fetch(
+            fetch_key(
+                self.symbol, period, interval, self.config, self.store, self.provider
+            ),
+            fetch,
+            lambda: cache.expiry(
+                self.symbol, interval, self.metadata_cache, self.config
+            ),
+        )
+
+    def _hold(self, period: str, daily: pd.DataFrame, target_date: date) -> None:
+        expires = data_expiry(self.symbol, "1d", self.metadata_cache, self.config)
+        if expires is not None and not daily.empty:
+            self._held = (period, daily, target_date, expires)
+
+    def _from_held(
+        self, period: str, interval: str
+    ) -> tuple[pd.DataFrame, date] | None:
+        if self._held is None:
+            return None
+        held_period, daily, target_date, expires = self._held
+        if datetime.now(timezone.utc) >= expires:
+            self._held = None
+            return None
+        # Held data implies cached metadata, see data_expiry
+        meta = self.metadata_cache.get(self.symbol)
+        if meta is None:
+            calendar, today = None, None
+        else:
+            calendar = market_calendar(*meta, self.config)
+            today = exchange_today(*meta, self.config)
+        data = derive(daily, held_period, period, interval, calendar, today)
+        return None if data is None else (data, target_date)
+
+    def _get(self, period: str, interval: str) -> tuple[pd.DataFrame, date]:
+        held = self._from_held(period, interval)
+        if held is not None:
+            logger.info(
+                f"Serving {self.symbol} (period={period}, interval={interval}) "
+                f"from held daily data"
+            )
+            return held
+
+        if interval in RESAMPLE_PERIODS and self.store is not None:
+            # Top up the stored daily bars and resample them locally
+            daily, target_date = self._fetch(period, "1d")
+            self._hold(period, daily, target_date)
+            return resample_bars(daily, interval), target_date
+
+        data, target_date = self._fetch(period, interval)
+        if interval == "1d":
+            self._hold(period, data, target_date)
+        return data, target_date
+
+    def get_data(
+        self,
+        period: str = "4y",
+        interval: str = "1d",
+        index_type: str = "date",
+        output: str = "pandas",
+    ) -> pd.DataFrame:
         """
         Fetch historical data for the initialized symbol.
 
+        Daily data is kept until the next market cutoff. Requests for a shorter
+        period or a weekly, monthly or quarterly interval are then sliced or
+        resampled from it without a new download. With a store, coarser
+        intervals are resampled from the topped-up daily history.
+
         Args:
             period (str): Data period to download (default: "4y").
             interval (str): Data interval (default: "1d").
+            index_type (str): Index of the returned data: "date" (datetime.date
+                objects, default), "datetime" (datetime64 normalised to the
+                exchange date) or "period" (daily PeriodIndex). The default
+                will change to "datetime" in a future version.
+            output (str): Format of the returned data: "pandas" (default),
+                "compact" (DataFrame with float32 prices and uint32 volume),
+                "arrow" (pyarrow.Table, requires pyarrow) or "numpy"
+                (structured array with a "Date" field).
 
         Returns:
             pd.DataFrame: A pandas DataFrame with the cleaned historical data.
                           The DataFrame will have date index and columns like
-                          Open, High, Low, Close, Volume.
+                          Open, High, Low, Close, Volume. Other `output`
+                          formats hold the same data.
 
         Raises:
             TickerNotFoundError: If the ticker does not exist.
@@ -135,29 +257,334 @@ class DataFetcher:
             YFinanceConnectionError: If connection to Yahoo Finance fails.
             FinFetcherError: Base exception for other library errors.
         """
-        try:
-            data, target_date = fetch_data(
-                ticker_obj=self.ticker,
-                symbol=self.symbol,
-                period=period,
-                interval=interval,
-                market_config=self.config,
-            )
+        return self._run(lambda: self._get(period, interval), index_type, output)
+
+    def get_latest(
+        self, n: int = 1, index_type: str = "date", output: str = "pandas"
+    ) -> pd.DataFrame:
+        """
+        Fetch only the newest `n` complete daily bars, e.g. for live prediction.
+
+        Requests the shortest period that still holds `n` complete bars after
+        the unfinished candle is removed ("5d" for the newest bar), widening
+        it only if a long market closure leaves fewer. Bars are served from
+        held daily data while it is current. Otherwise they are merged into
+        the held data, and with a store, the stored history is topped up.
+
+        Args:
+            n (int): Number of bars to return (default: 1).
+            index_type (str): "date", "datetime" or "period"; see `get_data`.
+            output (str): "pandas", "compact", "arrow" or "numpy"; see
+                `get_data`.
+
+        Returns:
+            pd.DataFrame: The last `n` complete bars, fewer only if the
+                symbol has no longer history. `target_date` is set as by
+                `get_data`.
+
+        Raises:
+            ValueError: If n is not positive.
+            TickerNotFoundError: If the ticker does not exist.
+            DataEmptyError: If no complete bar is available.
+            YFinanceConnectionError: If connection to Yahoo Finance fails.
+            FinFetcherError: Base exception for other library errors.
+        """
+        periods = latest_periods(n)
+        return self._run(lambda: self._latest(n, periods), index_type, output)
+
+    def _latest(self, n: int, periods: list[str]) -> tuple[pd.DataFrame, date]:
+        if self._held is not None:
+            _, daily, target_date, expires = self._held
+            if datetime.now(timezone.utc) < expires and len(daily) >= n:
+                logger.info(f"Serving latest bars of {self.symbol} from held data")
+                return daily.iloc[-n:], target_date
+
+        for period in periods[:-1]:
+            try:
+                data, target_date = self._fetch(period, "1d")
+            except DataEmptyError:
+                continue
+            if len(data) >= n:
+                break
+            logger.debug(f"Only {len(data)} complete bars of {self.symbol} in {period}")
+        else:
+            period = periods[-1]
+            data, target_date = self._fetch(period, "1d")
+
+        held = self._held
+        if held is not None and not data.empty and data.index[0] <= held[1].index[-1]:
+            # Overlaps the held history: extend it instead of replacing it
+            self._hold(held[0], merge_bars(held[1], data), target_date)
+        else:
+            self._hold(period, data, target_date)
+        return data.iloc[-n:], target_date
+
+    def _run(
+        self,
+        get: Callable[[], tuple[pd.DataFrame, date]],
+        index_type: str,
+        output: str,
+    ) -> Any:
+        """Runs a fetch with the observer, error handling and output format."""
+        with observing(self.observer), timed(self.symbol, "total"):
+            try:
+                check_index_type(index_type)
+                check_output(output)
+                data, target_date = get()
+                data = convert_output(format_index(data, index_type), output)
+
+                logger.info(f"Successfully fetched {len(data)} rows for {self.symbol}")
+                self.target_date = target_date
+                return data
+
+            except TickerNotFoundError as e:
+                logger.error(f"Ticker not found error for {self.symbol}: {e}")
+                record_error(self.symbol, e)
+                raise
+
+            except DataEmptyError as e:
+                logger.error(f"Data empty error for {self.symbol}: {e}")
+                record_error(self.symbol, e)
+                raise
+
+            except Exception as e:
+                logger.exception(
+                    f"Unexpected error while fetching data for {self.symbol}"
+                )
+                record_error(self.symbol, e)
+                raise FinFetcherError(
+                    f"An unexpected error occurred for {self.symbol}"
+                ) from e
+
+    def get_range(
+        self,
+        start: datetime | str,
+        end: datetime | str | None = None,
+        interval: str = "1h",
+        max_workers: int = 4,
+    ) -> pd.DataFrame:
+        """
+        Fetch a long intraday history between `start` and `end`.
+
+        Yahoo caps the span of one intraday request, so the range is split
+        into the largest allowed windows, fetched concurrently and stitched
+        into one frame. Only the unfinished last bar is removed.
+
+        Args:
+            start (datetime | str): Start of the range (naive values are UTC).
+            end (datetime | str, optional): End of the range (default: now).
+            interval (str): Intraday interval, e.g. "1m", "5m" or "1h".
+            max_workers (int): Maximum number of concurrent requests.
+
+        Returns:
+            pd.DataFrame: Bars with the exchange-timezone DatetimeIndex.
 
+        Raises:
+            DataEmptyError: If no data is returned for the range.
+            YFinanceConnectionError: If connection to Yahoo Finance fails.
+            FinFetcherError: Base exception for other library errors, including
+                an unsupported interval or an empty range.
+        """
+        try:
+            with observing(self.observer):
+                data = fetch_range(
+                    self.symbol,
+                    start,
+                    end,
+                    interval=interval,
+                    max_workers=max_workers,
+                    retry_policy=self.retry_policy,
+                    provider=self.provider,
+                )
             logger.info(f"Successfully fetched {len(data)} rows for {self.symbol}")
-            self.target_date = target_date
             return data
 
-        except TickerNotFoundError as e:
-            logger.error(f"Ticker not found error for {self.symbol}: {e}")
-            raise
-
         except DataEmptyError as e:
             logger.error(f"Data empty error for {self.symbol}: {e}")
             raise
 
+        except FinFetcherError as e:
+            logger.error(f"Error fetching {self.symbol}: {e}")
+            raise
+
         except Exception as e:
             logger.exception(f"Unexpected error while fetching data for {self.symbol}")
             raise FinFetcherError(
                 f"An unexpected error occurred for {self.symbol}"
             ) from e
+
+
+class MultiFetcher:
+    """
+    Batched counterpart of DataFetcher for a whole universe of symbols.
+
+    Symbols are downloaded in chunked multi-ticker requests and every symbol
+    is cleaned with its own asset type and timezone. Failures are collected
+    per symbol instead of aborting the whole batch.
+    """
+
+    def __init__(
+        self,
+        symbols: list[str],
+        custom_cutoffs: dict | None = None,
+        chunk_size: int = 100,
+        store: OHLCVStore | None = None,
+        metadata_cache: MetadataCache | None = None,
+        retry_policy: RetryPolicy | None = None,
+        provider: DataProvider | None = None,
+        observer: FetchObserver | None = None,
+    ) -> None:
+        """
+        Initialize the MultiFetcher with a list of ticker symbols.
+
+        Args:
+            symbols (list[str]): The ticker symbols (e.g., ['AAPL', 'BTC-USD']).
+            custom_cutoffs (dict, optional): Dictionary to merge with/override
+                default MARKET_CUTOFFS. Same structure as for DataFetcher.
+            chunk_size (int): Maximum number of symbols per download request.
+            store (OHLCVStore, optional): Local on-disk store of daily bars,
+                topped up incrementally as in DataFetcher.
+            metadata_cache (MetadataCache, optional): Cache of asset types and
+                timezones. Defaults to the process-wide in-memory cache.
+            retry_policy (RetryPolicy, optional): Backoff, retry budget and
+                circuit breaker for downloads. Defaults to DEFAULT_RETRY_POLICY.
+            provider (DataProvider, optional): Source of metadata and bars.
+                Defaults to the process-wide provider (yfinance).
+            observer (FetchObserver, optional): Receives per-phase timings,
+                attempts, row counts and errors; see DataFetcher.
+
+        Raises:
+            TypeError: If custom_cutoffs or its internal structure has invalid types.
+            ValueError: If custom_cutoffs is invalid or chunk_size is not positive.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+
+        # Keep order, drop duplicates
+        self.symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        self.chunk_size = chunk_size
+        self.store = store
+        self.metadata_cache = (
+            metadata_cache if metadata_cache is not None else default_metadata_cache
+        )
+        self.retry_policy = retry_policy
+        self.provider = provider
+        self.observer = observer
+        self.target_dates: dict = {}
+        self.errors: dict[str, FinFetcherError] = {}
+        self.config = CutoffResolver.from_custom(custom_cutoffs)
+
+    def get_data(
+        self,
+        period: str = "4y",
+        interval: str = "1d",
+        index_type: str = "date",
+        output: str = "pandas",
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Fetch historical data for all initialized symbols.
+
+        Args:
+            period (str): Data period to download (default: "4y").
+            interval (str): Data interval (default: "1d").
+            index_type (str): "date", "datetime" or "period"; see DataFetcher.
+            output (str): "pandas", "compact", "arrow" or "numpy"; see
+                DataFetcher.
+
+        Returns:
+            dict[str, pd.DataFrame]: Cleaned DataFrames keyed by symbol. Symbols
+                that failed are left out and listed in `errors`; per-symbol
+                target dates are stored in `target_dates`.
+        """
+        with observing(self.observer):
+            data, self.target_dates, self.errors = fetch_many(
+                self.symbols,
+                period=period,
+                interval=interval,
+                index_type=index_type,
+                output=output,
+                chunk_size=self.chunk_size,
+                market_config=self.config,
+                store=self.store,
+                metadata_cache=self.metadata_cache,
+                retry_policy=self.retry_policy,
+                provider=self.provider,
+            )
+
+            self._report_errors()
+
+        return data
+
+    def get_latest(
+        self, n: int = 1, index_type: str = "date", output: str = "pandas"
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Fetch only the newest `n` complete daily bars of all symbols.
+
+        Batched counterpart of `DataFetcher.get_latest`: the symbols are
+        downloaded for the shortest sufficient period, and only those left
+        with fewer than `n` complete bars are requested again for a longer one.
+
+        Args:
+            n (int): Number of bars per symbol (default: 1).
+            index_type (str): "date", "datetime" or "period"; see DataFetcher.
+            output (str): "pandas", "compact", "arrow" or "numpy"; see
+                DataFetcher.
+
+        Returns:
+            dict[str, pd.DataFrame]: The last `n` complete bars keyed by
+                symbol. Failures and target dates are stored as by `get_data`.
+
+        Raises:
+            ValueError: If n is not positive.
+        """
+        periods = latest_periods(n)
+        check_index_type(index_type)
+        check_output(output)
+
+        data: dict[str, pd.DataFrame] = {}
+        self.target_dates, self.errors = {}, {}
+        pending = self.symbols
+        with observing(self.observer):
+            for period in periods:
+                fetched, target_dates, errors = fetch_many(
+                    pending,
+                    period=period,
+                    index_type="datetime",
+                    chunk_size=self.chunk_size,
+                    market_config=self.config,
+                    store=self.store,
+                    metadata_cache=self.metadata_cache,
+                    retry_policy=self.retry_policy,
+                    provider=self.provider,
+                )
+                # Widened once more for symbols short of bars, except at "max"
+                widen = period != periods[-1]
+                short = []
+                for symbol in pending:
+                    if symbol in fetched:
+                        if widen and len(fetched[symbol]) < n:
+                            short.append(symbol)
+                        else:
+                            data[symbol] = fetched[symbol].iloc[-n:]
+                            self.target_dates[symbol] = target_dates[symbol]
+                    elif widen and isinstance(errors[symbol], DataEmptyError):
+                        short.append(symbol)
+                    else:
+                        self.errors[symbol] = errors[symbol]
+                if not short:
+                    break
+                logger.debug(f"Widening the period of {len(short)} symbols")
+                pending = short
+
+            self._report_errors()
+
+        return {
+            symbol: convert_output(format_index(df, index_type), output)
+            for symbol, df in data.items()
+        }
+
+    def _report_errors(self) -> None:
+        for symbol, error in self.errors.items():
+            logger.error(f"Failed to fetch {symbol}: {error}")
+            record_error(symbol, error)
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import logging
+import threading
+from collections.abc import Callable, Iterator, Mapping
+from datetime import tzinfo
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from ._lazy import lazy_import
+from .config import MARKET_CUTOFFS
+
+if TYPE_CHECKING:
+    import pytz
+else:
+    pytz = lazy_import("pytz")
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_ASSET = "EQUITY"
+FALLBACK_TZ = "America/New_York"
+
+
+class ResolvedCutoff(NamedTuple):
+    """Cutoff of one (asset type, timezone) pair, in the market's timezone."""
+
+    tz_name: str
+    tz: tzinfo
+    hour: int
+    minute: int
+    forced: bool = False  # Timezone forced by config ("force_tz")
+
+
+def validate_custom_cutoffs(custom_cutoffs: Any) -> None:
+    """
+    Raises:
+        TypeError: If custom_cutoffs or its internal structure has invalid types.
+        ValueError: If custom_cutoffs has missing required keys or invalid values.
+    """
+    if not isinstance(custom_cutoffs, dict):
+        raise TypeError("custom_cutoffs must be a dictionary.")
+
+    for asset, conf in custom_cutoffs.items():
+        if not isinstance(asset, str):
+            raise TypeError(f"Asset key '{asset}' must be a string.")
+        if not isinstance(conf, dict):
+            raise TypeError(f"Configuration for '{asset}' must be a dictionary.")
+
+        # Validate 'default' if present
+        if "default" in conf:
+            d = conf["default"]
+            if (
+                not isinstance(d, dict)
+                or not isinstance(d.get("hour"), int)
+                or not isinstance(d.get("minute"), int)
+            ):
+                raise ValueError(
+                    f"Invalid 'default' for '{asset}': "
+                    "must be dict with int 'hour' and 'minute'."
+                )
+
+        # Validate 'timezones' if present
+        if "timezones" in conf:
+            if not isinstance(conf["timezones"], dict):
+                raise TypeError(f"'timezones' for '{asset}' must be a dictionary.")
+            for tz_key, tz_val in conf["timezones"].items():
+                if (
+                    not isinstance(tz_val, dict)
+                    or not isinstance(tz_val.get("hour"), int)
+                    or not isinstance(tz_val.get("minute"), int)
+                ):
+                    raise ValueError(
+                        f"Invalid config for '{asset}'->'{tz_key}': "
+                        "must be dict with int 'hour' and 'minute'."
+                    )
+
+
+def build_market_config(custom_cutoffs: dict | None = None) -> dict:
+    """
+    Validates `custom_cutoffs` and merges them into a copy of MARKET_CUTOFFS.
+
+    Raises:
+        TypeError: If custom_cutoffs or its internal structure has invalid types.
+        ValueError: If custom_cutoffs has missing required keys or invalid values.
+    """
+    if custom_cutoffs:
+        validate_custom_cutoffs(custom_cutoffs)
+
+    config = copy.deepcopy(MARKET_CUTOFFS)
+    if custom_cutoffs:
+        for key, value in custom_cutoffs.items():
+            if (
+                key in config
+                and isinstance(config[key], dict)
+                and isinstance(value, dict)
+            ):
+                config[key].update(value)
+            else:
+                config[key] = value
+
+    return config
+
+
+@lru_cache(maxsize=None)
+def get_timezone(tz_name: str | None) -> tzinfo:
+    """Returns a (cached) pytz timezone, falling back to America/New_York."""
+    try:
+        if not tz_name:
+            raise ValueError("Timezone not specified")
+        return pytz.timezone(tz_name)
+    except Exception:
+        logger.warning(f"Unknown timezone '{tz_name}', fallback to {FALLBACK_TZ}")
+        return pytz.timezone(FALLBACK_TZ)
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable, order-independent representation of a nested config."""
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _read_only(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _read_only(v) for k, v in value.items()})
+    return value
+
+
+class CutoffResolver(Mapping):
+    """
+    Compiled, immutable market-cutoff table shared between fetchers.
+
+    Built once from MARKET_CUTOFFS merged with optional custom cutoffs (same
+    validation and merge rules as DataFetcher), it maps (asset type, timezone)
+    to a timezone object and cutoff time in O(1). Resolvers are hashable and
+    `from_custom` returns the same instance for equal configurations.
+
+    The resolver is also a read-only mapping of the merged configuration, so
+    it can be passed wherever a `market_config` dictionary is accepted.
+    """
+
+    __slots__ = ("_config", "_key", "_assets", "_resolved")
+
+    def __init__(self, config: Mapping | None = None) -> None:
+        """
+        Args:
+            config: Full (already merged) market configuration. Defaults to
+                MARKET_CUTOFFS.
+        """
+        config = MARKET_CUTOFFS if config is None else config
+        self._config = _read_only(config)
+        self._key = _freeze(config)
+        self._resolved: dict[tuple[str | None, str | None], ResolvedCutoff] = {}
+
+        # asset -> (force_tz | None, {tz_name: (hour, minute)}, (hour, minute))
+        assets = {}
+        for asset, conf in config.items():
+            default = conf.get("default")
+            timezones = {
+                tz_name: (t["hour"], t["minute"])
+                for tz_name, t in conf.get("timezones", {}).items()
+            }
+            assets[asset] = (
+                conf.get("force_tz") or None,
+                timezones,
+                (default["hour"], default["minute"]) if default else None,
+            )
+        self._assets = assets
+
+    @classmethod
+    def from_custom(cls, custom_cutoffs: dict | None = None) -> "CutoffResolver":
+        """
+        Returns the shared resolver for MARKET_CUTOFFS merged with `custom_cutoffs`.
+
+        Raises:
+            TypeError: If custom_cutoffs or its internal structure has invalid types.
+            ValueError: If custom_cutoffs has missing required keys or invalid values.
+        """
+        if not custom_cutoffs:
+            return _default_resolver()
+        validate_custom_cutoffs(custom_cutoffs)
+        return _shared(
+            ("custom", _freeze(custom_cutoffs)),
+            lambda: build_market_config(custom_cutoffs),
+        )
+
+    @classmethod
+    def coerce(cls, market_config: Mapping | None) -> "CutoffResolver":
+        """Returns a resolver for a resolver, a full config dict or None."""
+        if isinstance(market_config, CutoffResolver):
+            return market_config
+        if market_config is None:
+            return _default_resolver()
+        return _shared(("config", _freeze(market_config)), lambda: market_config)
+
+    def resolve(self, asset_type: str | None, tz_name: str | None) -> ResolvedCutoff:
+        """
+        Returns the cutoff for an asset type and exchange timezone.
+
+        Unknown asset types fall back to EQUITY rules, unknown timezones to
+        America/New_York.
+        """
+        key = (asset_type, tz_name)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            resolved = self._compile(asset_type, tz_name)
+            self._resolved[key] = resolved
+        return resolved
+
+    def _compile(self, asset_type: str | None, tz_name: str | None) -> ResolvedCutoff:
+        entry = self._assets.get(asset_type)  # type: ignore[arg-type]
+        if entry is None:
+            logger.warning(
+                f"Unknown asset type '{asset_type}', falling back to EQUITY rules."
+            )
+            entry = (
+                self._assets.get(FALLBACK_ASSET)
+                or _default_resolver()._assets[FALLBACK_ASSET]
+            )
+
+        force_tz, timezones, default_time = entry
+        if force_tz:
+            # CRYPTO, FOREX, FUTURES
+            tz_name = force_tz
+            time = default_time
+        elif tz_name in timezones:
+            # EQUITY, ETF, INDEX
+            time = timezones[tz_name]
+        else:
+            time = default_time
+        if time is None:
+            raise ValueError(f"No cutoff configured for '{asset_type}' in '{tz_name}'.")
+
+        tz = get_timezone(tz_name)
+        if getattr(tz, "zone", None) != tz_name:
+            tz_name = FALLBACK_TZ
+        return ResolvedCutoff(tz_name, tz, *time, forced=bool(force_tz))  # type: ignore[arg-type]
+
+    def __getitem__(self, key: str) -> Any:
+        return self._config[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._config)
+
+    def __len__(self) -> int:
+        return len(self._config)
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CutoffResolver):
+            return self._key == other._key
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CutoffResolver(assets={list(self._config)})"
+
+    @property
+    def fingerprint(self) -> str:
+        """Digest of the configuration, equal across processes for equal ones."""
+        return hashlib.sha1(repr(self._key).encode()).hexdigest()[:12]
+
+
+_SHARED_MAXSIZE = 256
+_shared_resolvers: dict[Any, CutoffResolver] = {}
+_shared_lock = threading.Lock()
+
+
+def _shared(key: Any, build: Callable[[], Mapping]) -> CutoffResolver:
+    """Returns the resolver compiled for `key`, compiling it on first use."""
+    resolver = _shared_resolvers.get(key)
+    if resolver is not None:
+        return resolver
+    compiled = CutoffResolver(build())
+    with _shared_lock:
+        if len(_shared_resolvers) >= _SHARED_MAXSIZE:
+            _shared_resolvers.clear()
+        return _shared_resolvers.setdefault(key, compiled)
+
+
+@lru_cache(maxsize=1)
+def _default_resolver() -> CutoffResolver:
+    return CutoffResolver(MARKET_CUTOFFS)
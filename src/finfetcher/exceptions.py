@@ -22,3 +22,9 @@ class YFinanceConnectionError(FinFetcherError):
     """Raised when there are network or API issues with yfinance."""
 
     pass
+
+
+class CircuitOpenError(YFinanceConnectionError):
+    """Raised without contacting Yahoo Finance while the circuit breaker is open."""
+
+    pass
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_import
+from .store import merge_bars
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ("Open", "High", "Low", "Close")
+# Per-bar action series of `auto_adjust=False, actions=True` downloads; 0
+# means no action on that date
+ACTION_COLUMNS = ("Dividends", "Stock Splits")
+
+# Relative difference of overlapping prices tolerated as rounding noise
+PRICE_RTOL = 1e-4
+
+
+def apply_split(df: pd.DataFrame, ratio: float) -> pd.DataFrame:
+    """
+    Restates bars in post-split terms, as Yahoo does with all history before a
+    split: prices and dividends divided by `ratio`, volume multiplied by it.
+    """
+    df = df.copy()
+    for column in (*PRICE_COLUMNS, "Dividends"):
+        if column in df:
+            df[column] = df[column] / ratio
+    if "Volume" in df:
+        df["Volume"] = df["Volume"] * ratio
+    return df
+
+
+def reconcile(
+    cached: pd.DataFrame | None, new: pd.DataFrame, rtol: float = PRICE_RTOL
+) -> pd.DataFrame | None:
+    """
+    Merges newly downloaded raw bars into a stored raw history.
+
+    Splits after the last stored bar are applied to the stored history first.
+    The bars both frames hold must then agree in prices and actions; new
+    dividends only enter the locally computed adjustment.
+
+    Args:
+        cached: Stored raw bars with action columns, indexed by exchange date.
+        new: Downloaded raw bars overlapping the end of `cached`, indexed the
+            same way.
+        rtol: Relative price difference tolerated on overlapping bars.
+
+    Returns:
+        The merged history, or None if the download conflicts with the stored
+        history (a revised bar, a late action or a store without action
+        series), which then has to be downloaded in full.
+    """
+    if cached is None or cached.empty:
+        return new
+    if new.empty:
+        return cached
+    if any(column not in cached or column not in new for column in ACTION_COLUMNS):
+        logger.debug("Stored or downloaded bars have no action series")
+        return None
+
+    splits = new["Stock Splits"]
+    later = splits[(new.index > cached.index[-1]) & (splits > 0)]
+    if not later.empty:
+        ratio = float(later.prod())
+        logger.debug(f"Applying split ratio {ratio} to the stored history")
+        cached = apply_split(cached, ratio)
+
+    overlap = cached.index.intersection(new.index)
+    if not overlap.empty:
+        columns = [c for c in (*PRICE_COLUMNS, *ACTION_COLUMNS) if c in new]
+        stored = cached.loc[overlap, columns].fillna(0).to_numpy(dtype=float)
+        fresh = new.loc[overlap, columns].fillna(0).to_numpy(dtype=float)
+        if not np.allclose(stored, fresh, rtol=rtol, atol=1e-8):
+            logger.debug(f"Downloaded bars differ from the stored ones on {overlap}")
+            return None
+
+    return merge_bars(cached, new)
+
+
+def adjust_prices(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Computes dividend- and split-adjusted OHLCV bars from raw bars and their
+    action series in one vectorized pass, as `auto_adjust=True` returns them.
+
+    Prices are already split-adjusted; every dividend scales the prices
+    before its ex-date by `1 - dividend / previous close`. Volume is kept.
+    """
+    columns = [c for c in raw.columns if c not in (*ACTION_COLUMNS, "Adj Close")]
+    if "Dividends" not in raw or raw.empty:
+        return raw[columns]
+
+    close = raw["Close"].to_numpy(dtype=float)
+    dividends = raw["Dividends"].fillna(0).to_numpy(dtype=float)
+    previous = np.empty_like(close)
+    previous[0] = np.nan
+    previous[1:] = close[:-1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        multiplier = np.where(dividends > 0, 1 - dividends / previous, 1.0)
+    multiplier = np.where(np.isfinite(multiplier), multiplier, 1.0)
+    # Factor of a bar: product of the multipliers of all later bars
+    factor = np.ones_like(close)
+    factor[:-1] = np.cumprod(multiplier[::-1])[::-1][1:]
+
+    adjusted = raw[columns].copy()
+    for column in PRICE_COLUMNS:
+        if column in adjusted:
+            adjusted[column] = adjusted[column].to_numpy(dtype=float) * factor
+    return adjusted
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import logging
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_import
+from .store import merge_bars
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+# Partition granularity -> strftime format of the partition value
+PARTITIONS = {"year": "%Y", "month": "%Y-%m", "day": "%Y-%m-%d"}
+
+
+class PartitionedDataset:
+    """
+    Parquet dataset of OHLCV bars partitioned by symbol and date.
+
+    Files are laid out Hive-style as
+    `<directory>/symbol=<SYMBOL>/<partition>=<value>/part.parquet`, e.g.
+    `symbol=AAPL/year=2024/part.parquet`, which pyarrow, DuckDB, Polars and
+    Spark read as one table with `symbol` and date partition columns.
+
+    Writes are incremental: new bars are merged into the existing partition
+    files and only partitions whose content changed are rewritten.
+    """
+
+    def __init__(self, directory: str | Path, partition: str = "year") -> None:
+        """
+        Args:
+            directory: Root directory of the dataset (created if missing).
+            partition: Date partition granularity: "year", "month" or "day".
+
+        Raises:
+            ValueError: If partition is not supported.
+        """
+        if partition not in PARTITIONS:
+            raise ValueError(
+                f"Unsupported partition '{partition}', use one of {tuple(PARTITIONS)}."
+            )
+
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.partition = partition
+
+    def symbol_dir(self, symbol: str) -> Path:
+        safe_symbol = re.sub(r"[^A-Za-z0-9._=^-]", "_", symbol)
+        return self.directory / f"symbol={safe_symbol}"
+
+    def path(self, symbol: str, value: str) -> Path:
+        return self.symbol_dir(symbol) / f"{self.partition}={value}" / "part.parquet"
+
+    def _read(self, path: Path) -> pd.DataFrame | None:
+        if not path.exists():
+            return None
+        try:
+            df = pd.read_parquet(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable dataset file {path}: {e}")
+            return None
+        df.index = pd.to_datetime(df.index)
+        df.index.name = None
+        return df
+
+    def load(self, symbol: str) -> pd.DataFrame | None:
+        """Returns all stored bars of a symbol, or None if there are none."""
+        frames = [
+            df
+            for path in sorted(self.symbol_dir(symbol).glob("*/part.parquet"))
+            if (df := self._read(path)) is not None
+        ]
+        if not frames:
+            return None
+        return pd.concat(frames).sort_index()
+
+    def write(self, symbol: str, df: pd.DataFrame) -> int:
+        """
+        Merges bars into the symbol's partitions, newer values winning.
+
+        Args:
+            symbol: Ticker symbol.
+            df: Bars with a DatetimeIndex (or date index).
+
+        Returns:
+            The number of partition files written.
+        """
+        if df.empty:
+            return 0
+
+        df = df.copy()
+        df.index = pd.to_datetime(df.index)
+        keys = df.index.strftime(PARTITIONS[self.partition])
+
+        written = 0
+        for value, new in df.groupby(keys, sort=True):
+            path = self.path(symbol, str(value))
+            existing = self._read(path)
+            merged = merge_bars(existing, new)
+            if existing is not None and merged.equals(existing):
+                continue
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            out = merged.copy()
+            out.index = pd.DatetimeIndex(out.index, name="Date")
+            tmp_path = path.with_suffix(".parquet.tmp")
+            out.to_parquet(tmp_path)
+            tmp_path.replace(path)
+            written += 1
+
+        logger.debug(f"Wrote {written} partitions of {symbol} in {self.directory}")
+        return written
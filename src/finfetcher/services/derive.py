@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_import
+from .store import period_start, trim_to_period
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from ..calendars import ExchangeCalendar
+else:
+    pd = lazy_import("pandas")
+
+# yfinance interval -> pandas period of one bar. Weekly bars run Monday to
+# Sunday and monthly/quarterly bars follow the calendar, all labelled with
+# their first day like yfinance does.
+RESAMPLE_PERIODS = {"1wk": "W-SUN", "1mo": "M", "3mo": "Q-DEC"}
+
+AGGREGATIONS = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Adj Close": "last",
+    "Volume": "sum",
+    "Dividends": "sum",
+    "Stock Splits": "prod",
+}
+
+
+def can_derive(interval: str) -> bool:
+    """Whether bars of `interval` can be built from daily bars."""
+    return interval == "1d" or interval in RESAMPLE_PERIODS
+
+
+def resample_bars(daily: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    Aggregates complete daily bars into weekly, monthly or quarterly bars.
+
+    The index holds exchange dates, so weeks and months follow the exchange's
+    local calendar rather than UTC.
+    """
+    index = pd.DatetimeIndex(daily.index)
+    periods = index.to_period(RESAMPLE_PERIODS[interval])
+    how = {col: AGGREGATIONS.get(str(col), "last") for col in daily.columns}
+    if "Stock Splits" in how:
+        # yfinance reports "no split" as 0, not as a factor of 1
+        daily = daily.assign(**{"Stock Splits": daily["Stock Splits"].replace(0, 1)})
+    bars = daily.groupby(periods).agg(how)
+    if "Stock Splits" in bars:
+        bars["Stock Splits"] = bars["Stock Splits"].replace(1, 0)
+    bars.index = pd.PeriodIndex(bars.index).start_time
+    return bars
+
+
+def covers(
+    held_period: str,
+    period: str,
+    calendar: ExchangeCalendar | None = None,
+    today: date | None = None,
+) -> bool:
+    """
+    Whether data fetched for `held_period` contains all of `period`, with "Nd"
+    periods counted in sessions of `calendar` if given, back from `today`.
+    """
+    if held_period == "max":
+        return True
+    held_start = period_start(held_period, today, calendar)
+    start = period_start(period, today, calendar)
+    if held_start is None or start is None:
+        return False
+    return held_start <= start
+
+
+def derive(
+    daily: pd.DataFrame,
+    held_period: str,
+    period: str,
+    interval: str,
+    calendar: ExchangeCalendar | None = None,
+    today: date | None = None,
+) -> pd.DataFrame | None:
+    """
+    Builds the bars for (`period`, `interval`) from daily bars fetched for
+    `held_period`, or returns None if they cannot be derived. `calendar` is
+    the symbol's session calendar and `today` the exchange-local date; see
+    `period_start`.
+    """
+    if not can_derive(interval) or not covers(held_period, period, calendar, today):
+        return None
+    data = trim_to_period(daily, period, calendar, today)
+    if data.empty:
+        return None
+    if interval != "1d":
+        data = resample_bars(data, interval)
+    return data
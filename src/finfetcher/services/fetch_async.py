@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Mapping
+from datetime import date
+from typing import TYPE_CHECKING, Any
+
+from .._lazy import lazy_import
+from .fetch_data import (
+    adjust_kwargs,
+    check_index_type,
+    finish_fetch,
+    plan_fetch,
+    raw_bars,
+)
+from .metadata import MetadataCache, get_ticker_meta
+from .metrics import record_attempt, timed
+from .output import check_output
+from .providers import DataProvider, DateLike, resolve_provider
+from .rate_limit import get_rate_limiter
+from .retry import RetryPolicy, resolve_policy
+from .store import OHLCVStore
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+
+async def adownload(
+    symbol: str,
+    period: str | None = "4y",
+    interval: str = "1d",
+    retry_policy: RetryPolicy | None = None,
+    allow_empty: bool = False,
+    start: DateLike | None = None,
+    end: DateLike | None = None,
+    provider: DataProvider | None = None,
+    auto_adjust: bool = True,
+) -> pd.DataFrame:
+    """
+    Async counterpart of `download`.
+
+    Each provider request runs in a worker thread and the wait between
+    attempts is an `asyncio.sleep`, so the event loop is never blocked.
+
+    Raises:
+        DataEmptyError: If yfinance returns no data.
+        YFinanceConnectionError: If connection fails after retries.
+        CircuitOpenError: If the circuit breaker is open.
+    """
+    provider = resolve_provider(provider)
+    state = resolve_policy(retry_policy).start(symbol)
+
+    with timed(symbol, "download"):
+        while True:
+            state.check()
+            try:
+                df = await get_rate_limiter().acall(
+                    provider.history,
+                    symbol,
+                    interval,
+                    period=period,
+                    start=start,
+                    end=end,
+                    **adjust_kwargs(auto_adjust),
+                )
+            except Exception as e:
+                record_attempt([symbol], e)
+                delay = state.on_error(e)
+            except BaseException:
+                state.on_abort()
+                raise
+            else:
+                record_attempt([symbol], None)
+                state.on_success()
+                if df is not None and not df.empty:
+                    return df
+                if allow_empty:
+                    return pd.DataFrame()
+                delay = state.on_empty()
+
+            if delay is None:
+                raise state.error(period)
+            await asyncio.sleep(delay)
+
+
+async def afetch_data(
+    symbol: str,
+    period: str = "4y",
+    interval: str = "1d",
+    attempts: int | None = None,
+    market_config: Mapping | None = None,
+    store: OHLCVStore | None = None,
+    metadata_cache: MetadataCache | None = None,
+    retry_policy: RetryPolicy | None = None,
+    index_type: str = "date",
+    output: str = "pandas",
+    provider: DataProvider | None = None,
+) -> tuple[Any, date]:
+    """
+    Async counterpart of `fetch_data`.
+
+    Blocking yfinance and file I/O calls run in worker threads; cached metadata
+    is resolved without leaving the event loop.
+
+    Raises:
+        TickerNotFoundError: If the ticker info cannot be retrieved.
+        DataEmptyError: If yfinance returns no data.
+        YFinanceConnectionError: If connection fails after retries.
+        CircuitOpenError: If the circuit breaker is open.
+    """
+    check_index_type(index_type)
+    check_output(output)
+    retry_policy = resolve_policy(retry_policy, attempts)
+
+    meta = metadata_cache.get(symbol) if metadata_cache is not None else None
+    if meta is None:
+        meta = await asyncio.to_thread(
+            get_ticker_meta, None, symbol, cache=metadata_cache, provider=provider
+        )
+
+    plan = await asyncio.to_thread(
+        plan_fetch, symbol, meta, period, interval, market_config, store
+    )
+    df = pd.DataFrame()
+    if not plan.current:
+        df = await adownload(
+            symbol,
+            interval=interval,
+            retry_policy=retry_policy,
+            provider=provider,
+            **plan.request(period),
+        )
+
+    bars = plan.merge(df)
+    if bars is None:
+        bars = raw_bars(
+            await adownload(
+                symbol,
+                interval=interval,
+                retry_policy=retry_policy,
+                provider=provider,
+                **plan.request(period, full=True),
+            )
+        )
+    result = await asyncio.to_thread(
+        finish_fetch,
+        plan,
+        bars,
+        period,
+        interval,
+        market_config,
+        store,
+        index_type,
+        output,
+    )
+
+    logger.info(f"Fetched {symbol} data from yfinance")
+
+    return result
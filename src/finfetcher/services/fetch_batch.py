@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from datetime import date
+from typing import TYPE_CHECKING, Any
+
+from .._lazy import lazy_import
+from ..exceptions import DataEmptyError, FinFetcherError
+from .fetch_data import (
+    FetchPlan,
+    check_index_type,
+    download,
+    finish_fetch,
+    plan_fetch,
+    raw_bars,
+)
+from .metadata import MetadataCache, resolve_many
+from .output import check_output
+from .providers import DataProvider
+from .retry import RetryPolicy, resolve_policy
+from .store import OHLCVStore
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+
+def split_by_symbol(df: pd.DataFrame, symbols: list[str]) -> dict[str, pd.DataFrame]:
+    """
+    Splits a multi-ticker `yf.download(group_by="ticker")` frame per symbol.
+
+    Rows that are all-NaN for a symbol (dates on which only other tickers
+    traded) are dropped. Symbols missing from the frame are left out.
+    """
+    if not isinstance(df.columns, pd.MultiIndex):
+        # Single ticker frame with flat columns
+        if len(symbols) != 1:
+            return {}
+        return {symbols[0]: df.dropna(how="all")}
+
+    available = set(df.columns.get_level_values(0))
+    frames = {}
+    for symbol in symbols:
+        if symbol not in available:
+            continue
+        sym_df = df[symbol].dropna(how="all")
+        sym_df.columns.name = None
+        if not sym_df.empty:
+            frames[symbol] = sym_df
+
+    return frames
+
+
+def fetch_many(
+    symbols: list[str],
+    period: str = "4y",
+    interval: str = "1d",
+    chunk_size: int = 100,
+    attempts: int | None = None,
+    market_config: Mapping | None = None,
+    store: OHLCVStore | None = None,
+    metadata_cache: MetadataCache | None = None,
+    retry_policy: RetryPolicy | None = None,
+    index_type: str = "date",
+    output: str = "pandas",
+    provider: DataProvider | None = None,
+) -> tuple[dict[str, Any], dict[str, date], dict[str, FinFetcherError]]:
+    """
+    Fetches and cleans historical data for many symbols in chunked requests.
+
+    Each chunk of symbols is downloaded with a single multi-ticker request;
+    the result is split per symbol and cleaned with the symbol's own asset
+    type and timezone.
+
+    Args:
+        symbols: Ticker symbol strings.
+        period: Data period to download.
+        interval: Data interval.
+        chunk_size: Maximum number of symbols per download request.
+        attempts: Maximum number of attempts per chunk, overriding the policy.
+        market_config: Optional dictionary to override market cutoffs.
+        store: Optional on-disk store. Symbols with a stored history covering
+            the period are topped up together from their last stored date.
+            Symbols whose raw history conflicts with the download are
+            downloaded again in full, one by one.
+        metadata_cache: Optional cache consulted for asset types and timezones;
+            missing symbols are looked up concurrently.
+        retry_policy: Backoff, retry budget and circuit breaker for downloads.
+        index_type: "date", "datetime" or "period"; see `fetch_data`.
+        output: "pandas", "compact", "arrow" or "numpy"; see `fetch_data`.
+        provider: Data provider (default: the process-wide provider).
+
+    Returns:
+        A tuple of (data, target_dates, errors), each a dict keyed by symbol.
+        Symbols that failed are only present in `errors`.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    check_index_type(index_type)
+    check_output(output)
+    retry_policy = resolve_policy(retry_policy, attempts)
+
+    data: dict[str, Any] = {}
+    target_dates: dict[str, date] = {}
+    errors: dict[str, FinFetcherError] = {}
+
+    meta, meta_errors = resolve_many(symbols, cache=metadata_cache, provider=provider)
+    errors.update(meta_errors)
+
+    # Group symbols by download start: None is a full `period` download,
+    # a date tops up a stored history from that date on
+    plans: dict[str, FetchPlan] = {}
+    groups: dict[date | None, list[str]] = {}
+    for symbol in symbols:
+        if symbol in meta:
+            plan = plan_fetch(
+                symbol, meta[symbol], period, interval, market_config, store
+            )
+            plans[symbol] = plan
+            groups.setdefault(plan.start, []).append(symbol)
+
+    requests = 0
+    for top_up_start, group in groups.items():
+        for offset in range(0, len(group), chunk_size):
+            chunk = group[offset : offset + chunk_size]
+
+            df = pd.DataFrame()
+            if top_up_start != date.max:
+                try:
+                    df = download(
+                        chunk,
+                        interval=interval,
+                        retry_policy=retry_policy,
+                        provider=provider,
+                        **plans[chunk[0]].request(period),
+                    )
+                except FinFetcherError as e:
+                    for symbol in chunk:
+                        errors[symbol] = e
+                    continue
+                requests += 1
+
+            # Symbols given up on their own, the others' bars are kept
+            failed = df.attrs.get("errors", {})
+            errors.update(failed)
+            frames = split_by_symbol(df, chunk) if not df.empty else {}
+
+            for symbol in chunk:
+                if symbol in failed:
+                    continue
+                if top_up_start is None and symbol not in frames:
+                    errors[symbol] = DataEmptyError(
+                        f"No historical data found for symbol '{symbol}' "
+                        f"(period={period})."
+                    )
+                    continue
+
+                plan = plans[symbol]
+                try:
+                    bars = plan.merge(frames.get(symbol, pd.DataFrame()))
+                    if bars is None:
+                        full = download(
+                            symbol,
+                            interval=interval,
+                            retry_policy=retry_policy,
+                            provider=provider,
+                            **plan.request(period, full=True),
+                        )
+                        requests += 1
+                        bars = raw_bars(full)
+                    data[symbol], target_dates[symbol] = finish_fetch(
+                        plan,
+                        bars,
+                        period,
+                        interval,
+                        market_config,
+                        store,
+                        index_type,
+                        output,
+                    )
+                except FinFetcherError as e:
+                    errors[symbol] = e
+
+    logger.info(
+        f"Fetched {len(data)}/{len(symbols)} symbols from yfinance "
+        f"in {requests} requests"
+    )
+
+    return data, target_dates, errors
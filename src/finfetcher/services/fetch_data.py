@@ -1,77 +1,127 @@
+from __future__ import annotations
+
 import logging
 import time
-from datetime import date, datetime, timedelta
-
-import pandas as pd
-import pytz
-import yfinance as yf
-from pandas.tseries.offsets import BusinessDay
-
-from ..config import MARKET_CUTOFFS
-from ..exceptions import (
-    DataEmptyError,
-    TickerNotFoundError,
-    YFinanceConnectionError,
+from collections.abc import Mapping
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .._lazy import lazy_import
+from ..calendars import effective_cutoff, session_calendar
+from ..cutoffs import CutoffResolver
+from ..exceptions import DataEmptyError, FinFetcherError, YFinanceConnectionError
+from .actions import adjust_prices, reconcile
+from .metadata import MetadataCache, get_ticker_meta
+from .metrics import get_observer, record_attempt, record_result, timed
+from .output import check_output, convert_output
+from .providers import DataProvider, DateLike, resolve_provider
+from .rate_limit import get_rate_limiter, is_throttle_error
+from .retry import RetryPolicy, resolve_policy
+from .store import (
+    OHLCVStore,
+    exchange_today,
+    history_is_current,
+    market_calendar,
+    merge_bars,
+    persist,
+    plan_top_up,
 )
 
+if TYPE_CHECKING:
+    import pandas as pd
+    import yfinance as yf
+
+    from ..calendars import ExchangeCalendar
+else:
+    pd = lazy_import("pandas")
+    yf = lazy_import("yfinance")
+
 logger = logging.getLogger(__name__)
 
+# "date": object index of datetime.date (current default, will change to
+# "datetime" in a future version), "datetime": datetime64 index normalised to
+# the exchange date, "period": daily PeriodIndex
+INDEX_TYPES = ("date", "datetime", "period")
 
-def get_complete_close(
-    df: pd.DataFrame,
-    asset_type: str | None,
-    last_day_df: date,
-    ticker_tz_name: str | None,
-    market_config: dict | None = None,
-) -> pd.DataFrame:
-    if market_config is None:
-        market_config = MARKET_CUTOFFS
 
-    conf = market_config.get(asset_type)  # type: ignore
-    if not conf:
-        logger.warning(
-            f"Unknown asset type '{asset_type}', falling back to EQUITY rules."
+def check_index_type(index_type: str) -> None:
+    if index_type not in INDEX_TYPES:
+        raise ValueError(
+            f"Unsupported index_type '{index_type}', use one of {INDEX_TYPES}."
         )
-        conf = market_config.get("EQUITY", MARKET_CUTOFFS["EQUITY"])
 
-    if conf.get("force_tz"):
-        # CRYPTO, FOREX, FUTURES
-        ticker_tz_name = conf["force_tz"]
-        close_time = conf["default"]
+
+def to_exchange_dates(index: pd.Index) -> pd.DatetimeIndex:
+    """
+    Normalises an index to a tz-naive datetime64 index of exchange dates.
+
+    Timezone-aware timestamps (yfinance reports them in the exchange timezone)
+    keep their local date.
+    """
+    # pd.to_datetime re-parses even a DatetimeIndex: only call it for others
+    if isinstance(index, pd.DatetimeIndex):
+        idx = index
     else:
-        # EQUITY, ETF, INDEX
-        conf_timezones = conf.get("timezones", {})
-        if ticker_tz_name in conf_timezones:
-            close_time = conf_timezones[ticker_tz_name]
-            logger.debug(
-                f"EQUITY TICKER: Using override close_time for {ticker_tz_name}: "
-                f"{close_time}"
-            )
-        else:
-            close_time = conf["default"]
-            logger.debug(
-                f"EQUITY TICKER: Using default fallback close_time for "
-                f"{ticker_tz_name}: {close_time}"
-            )
+        idx = pd.DatetimeIndex(pd.to_datetime(index))
+    if idx.tz is not None:
+        idx = idx.tz_localize(None)
+    # Truncate in numpy: DatetimeIndex.normalize() also infers a frequency
+    values = idx.to_numpy()
+    return pd.DatetimeIndex(values.astype("datetime64[D]").astype(values.dtype))
 
-    try:
-        if not ticker_tz_name:
-            raise ValueError("Timezone not specified")
-        tz = pytz.timezone(ticker_tz_name)
-    except Exception:
-        logger.warning(
-            f"Unknown timezone '{ticker_tz_name}', fallback to America/New_York"
-        )
-        tz = pytz.timezone("America/New_York")
 
-    now_in_tz = datetime.now(tz)
+def format_index(df: pd.DataFrame, index_type: str = "date") -> pd.DataFrame:
+    """
+    Converts the datetime64 index of cleaned data to the requested type.
+
+    Always returns a new (shallow) frame, so cached data handed out by a
+    FetchCache cannot be modified through the result.
+    """
+    check_index_type(index_type)
+    df = df.copy(deep=False)
+    if index_type == "datetime":
+        return df
+
+    idx = pd.DatetimeIndex(df.index)
+    if index_type == "period":
+        df.index = idx.to_period("D")
+    else:
+        df.index = idx.date  # type: ignore
+    return df
+
+
+def as_date(value: date | pd.Timestamp | pd.Period) -> date:
+    """Converts a single index label (date, Timestamp or Period) to a date."""
+    if isinstance(value, pd.Period):
+        return value.start_time.date()
+    if type(value) is date:
+        return value
+    return pd.Timestamp(value).date()
+
+
+def get_complete_close(
+    df: pd.DataFrame,
+    asset_type: str | None,
+    last_day_df: date | pd.Timestamp | pd.Period,
+    ticker_tz_name: str | None,
+    market_config: Mapping | None = None,
+) -> pd.DataFrame:
+    cutoff = CutoffResolver.coerce(market_config).resolve(asset_type, ticker_tz_name)
+    ticker_tz_name = cutoff.tz_name
+
+    now_in_tz = datetime.now(cutoff.tz)
     today_in_tz = now_in_tz.date()
 
-    cutoff_time = now_in_tz.replace(
-        hour=close_time["hour"], minute=close_time["minute"], second=0, microsecond=0
+    # Early closes (half-days) move the cutoff earlier
+    hour, minute = effective_cutoff(
+        cutoff, session_calendar(asset_type, cutoff), today_in_tz
     )
+    logger.debug(
+        f"Using close_time {hour:02d}:{minute:02d} for {asset_type} in {ticker_tz_name}"
+    )
+    cutoff_time = now_in_tz.replace(hour=hour, minute=minute, second=0, microsecond=0)
 
-    if (last_day_df == today_in_tz) and (now_in_tz < cutoff_time):
+    if (as_date(last_day_df) == today_in_tz) and (now_in_tz < cutoff_time):
         df = df.iloc[:-1]
         logger.debug(
             f"Removed unfinished day {last_day_df}. "
@@ -83,114 +133,396 @@ def get_complete_close(
     return df
 
 
+def clean_data(
+    df: pd.DataFrame,
+    symbol: str,
+    quote_type: str | None,
+    ticker_tz_name: str | None,
+    market_config: Mapping | None = None,
+    calendar: ExchangeCalendar | None = None,
+) -> tuple[pd.DataFrame, date]:
+    """
+    Normalises the index to exchange dates, removes the unfinished candle and
+    computes the target date for a single-symbol OHLCV frame.
+
+    The returned frame keeps a datetime64 index; see `format_index`. Pass the
+    asset's session `calendar` if already resolved.
+
+    Raises:
+        DataEmptyError: If no complete candle is left after filtering.
+    """
+    with timed(symbol, "clean"):
+        df.index = to_exchange_dates(df.index)
+
+        data = get_complete_close(
+            df, quote_type, df.index[-1], ticker_tz_name, market_config
+        )
+
+        if data.empty:
+            raise DataEmptyError(
+                f"Data for {symbol} is empty after filtering unfinished days."
+            )
+
+        last_data_date = data.index[-1]
+
+        # Next session on the exchange calendar (every day for crypto)
+        if calendar is None:
+            calendar = market_calendar(quote_type, ticker_tz_name, market_config)
+        target_date = calendar.next_session(last_data_date)
+
+    logger.debug(f"Final data date range: {data.index[0]} -> {last_data_date}")
+
+    return data, target_date
+
+
+def adjust_kwargs(auto_adjust: bool) -> dict[str, bool]:
+    """
+    Provider keyword for the adjustment mode. Only passed when unadjusted bars
+    are wanted, so providers without the argument keep working otherwise.
+    """
+    return {} if auto_adjust else {"auto_adjust": False}
+
+
+def merge_download(
+    cached: pd.DataFrame | None, df: pd.DataFrame, raw: bool = False
+) -> pd.DataFrame | None:
+    """
+    Merges a download into the stored bars, newer values winning.
+
+    For a raw store the download is reconciled with the stored history (see
+    `reconcile`); None means they conflict and the history must be downloaded
+    in full.
+    """
+    if not raw:
+        return merge_bars(cached, df)
+    return reconcile(cached, raw_bars(df))
+
+
+def raw_bars(df: pd.DataFrame) -> pd.DataFrame:
+    """Unadjusted download as stored by raw stores, indexed by exchange date."""
+    if df.empty:
+        return df
+    df = df.drop(columns="Adj Close", errors="ignore")
+    df.index = to_exchange_dates(df.index)
+    return df
+
+
+def _as_list(tickers: str | list[str]) -> list[str]:
+    return [tickers] if isinstance(tickers, str) else tickers
+
+
+def _combine(
+    frames: list[pd.DataFrame], failed: Mapping[str, Exception], attempts: int
+) -> pd.DataFrame:
+    """
+    Joins the frames of a download answered in parts, listing the symbols
+    given up in `df.attrs["errors"]`.
+    """
+    if not frames:
+        df = pd.DataFrame()
+    elif len(frames) == 1:
+        df = frames[0]
+    else:
+        df = pd.concat(frames, axis=1, sort=True)
+    errors: dict[str, FinFetcherError] = {}
+    for symbol, exception in failed.items():
+        error = YFinanceConnectionError(
+            f"Failed to download data for {symbol} after {attempts} attempts."
+        )
+        error.__cause__ = exception
+        errors[symbol] = error
+    df.attrs = {"errors": errors} if errors else {}
+    return df
+
+
+def download(
+    tickers: str | list[str],
+    period: str | None = "4y",
+    interval: str = "1d",
+    retry_policy: RetryPolicy | None = None,
+    allow_empty: bool = False,
+    start: DateLike | None = None,
+    end: DateLike | None = None,
+    provider: DataProvider | None = None,
+    auto_adjust: bool = True,
+) -> pd.DataFrame:
+    """
+    Downloads raw OHLCV data from the data provider with retries.
+
+    Args:
+        tickers: A single symbol, or a list of symbols for a multi-ticker
+            request returning (symbol, field) columns.
+        period: Data period to download. Pass None when requesting by `start`.
+        interval: Data interval.
+        retry_policy: Backoff, retry budget and circuit breaker to apply
+            (default: DEFAULT_RETRY_POLICY).
+        allow_empty: Return an empty frame instead of retrying when the
+            provider returns no data (e.g. topping up a history that is
+            already current).
+        start: First date or time to download, instead of `period`.
+        end: End of the requested range (exclusive).
+        provider: Data provider (default: the process-wide provider).
+        auto_adjust: False requests unadjusted prices with dividend and split
+            series, for raw stores.
+
+    Returns:
+        The downloaded bars. Symbols of a multi-ticker request that failed on
+        their own are retried alone; those given up are left out and listed
+        with a YFinanceConnectionError in `df.attrs["errors"]`.
+
+    Raises:
+        DataEmptyError: If the provider returns no data.
+        YFinanceConnectionError: If connection fails after retries.
+        CircuitOpenError: If the circuit breaker is open.
+    """
+    provider = resolve_provider(provider)
+    if isinstance(tickers, str):
+        symbols, request = [tickers], provider.history
+    else:
+        symbols, request = tickers, provider.history_many
+
+    state = resolve_policy(retry_policy).start(", ".join(symbols))
+    observer = get_observer()
+    started = time.perf_counter() if observer is not None else 0.0
+    # Symbols still to request and the frames of those already answered
+    pending: str | list[str] = tickers
+    done: list[pd.DataFrame] = []
+
+    try:
+        while True:
+            state.check()
+            failed: dict[str, Exception] = {}
+            try:
+                df = get_rate_limiter().call(
+                    request,
+                    pending,
+                    interval,
+                    period=period,
+                    start=start,
+                    end=end,
+                    **adjust_kwargs(auto_adjust),
+                )
+            except Exception as e:
+                failed = dict.fromkeys(_as_list(pending), e)
+                record_attempt(_as_list(pending), e)
+                if len(failed) < len(symbols) and not is_throttle_error(e):
+                    # Retried symbols failing on their own, the upstream is up
+                    delay = state.on_partial(e)
+                else:
+                    delay = state.on_error(e)
+            except BaseException:
+                state.on_abort()
+                raise
+            else:
+                failed = dict(df.attrs.get("errors") or {}) if df is not None else {}
+                record_attempt([s for s in _as_list(pending) if s not in failed], None)
+                for symbol, error in failed.items():
+                    record_attempt([symbol], error)
+                state.on_success()
+                if df is not None and not df.empty:
+                    done.append(df)
+                if failed:
+                    # Only the failed symbols are requested again
+                    pending = list(failed)
+                    delay = state.on_partial(next(iter(failed.values())))
+                elif done:
+                    return _combine(done, {}, state.attempts)
+                elif allow_empty:
+                    return pd.DataFrame()
+                else:
+                    delay = state.on_empty()
+
+            if delay is None:
+                if failed and len(failed) < len(symbols):
+                    return _combine(done, failed, state.attempts)
+                raise state.error(period)
+            time.sleep(delay)
+    finally:
+        if observer is not None:
+            elapsed = time.perf_counter() - started
+            for symbol in symbols:
+                observer.on_phase(symbol, "download", elapsed)
+
+
+class FetchPlan(NamedTuple):
+    """What a fetch of one symbol has to download; see `plan_fetch`."""
+
+    symbol: str
+    quote_type: str | None
+    tz_name: str | None
+    calendar: ExchangeCalendar
+    cached: pd.DataFrame | None  # Stored history to top up, if any
+    start: date | None  # None: full download, date.max: nothing to download
+    raw: bool  # Unadjusted bars for a raw store
+    today: date  # Exchange-local date the plan was made on
+
+    @property
+    def current(self) -> bool:
+        """Whether the stored history is current and nothing is downloaded."""
+        return self.start == date.max
+
+    def request(self, period: str, full: bool = False) -> dict[str, Any]:
+        """
+        Keyword arguments of `download` for the bars the plan misses, or for
+        the whole period with `full`.
+        """
+        if full or self.start is None:
+            return {"period": period, **adjust_kwargs(not self.raw)}
+        return {
+            "period": None,
+            "start": self.start.isoformat(),
+            "allow_empty": True,
+            **adjust_kwargs(not self.raw),
+        }
+
+    def merge(self, df: pd.DataFrame) -> pd.DataFrame | None:
+        """
+        Merges the download into the stored history; None if a raw history
+        conflicts with it and the period must be downloaded in full.
+        """
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.droplevel(1)
+        merged = merge_download(self.cached, df, self.raw)
+        if merged is None:
+            logger.info(f"Stored history of {self.symbol} conflicts with upstream data")
+        return merged
+
+
+def plan_fetch(
+    symbol: str,
+    meta: tuple[str | None, str | None],
+    period: str,
+    interval: str,
+    market_config: Mapping | None = None,
+    store: OHLCVStore | None = None,
+) -> FetchPlan:
+    """
+    Plans the download of one symbol: the whole period, a top-up of its
+    stored history, or nothing if no bar after the stored ones can be
+    complete yet.
+    """
+    quote_type, tz_name = meta
+    calendar = market_calendar(quote_type, tz_name, market_config)
+    today = exchange_today(quote_type, tz_name, market_config, clock=datetime.now)
+    cached, start = plan_top_up(store, symbol, period, interval, calendar, today)
+    if start is not None and (
+        start > today
+        or history_is_current(
+            cached, quote_type, tz_name, market_config, clock=datetime.now
+        )
+    ):
+        logger.debug(f"Cached history for {symbol} is current, nothing to download")
+        start = date.max
+    elif start is not None:
+        logger.debug(f"Topping up cached history for {symbol} from {start}")
+    raw = store is not None and store.raw
+    return FetchPlan(symbol, quote_type, tz_name, calendar, cached, start, raw, today)
+
+
+def finish_fetch(
+    plan: FetchPlan,
+    bars: pd.DataFrame,
+    period: str,
+    interval: str,
+    market_config: Mapping | None = None,
+    store: OHLCVStore | None = None,
+    index_type: str = "date",
+    output: str = "pandas",
+) -> tuple[Any, date]:
+    """
+    Turns the merged bars of a plan (see `FetchPlan.merge`) into the fetch
+    result: cleans, persists and adjusts them, reports them to the observer
+    and converts them to `index_type` and `output`.
+
+    Raises:
+        DataEmptyError: If no complete candle is left after filtering.
+    """
+    symbol = plan.symbol
+    data, target_date = clean_data(
+        bars, symbol, plan.quote_type, plan.tz_name, market_config, plan.calendar
+    )
+    dropped = len(bars) - len(data)
+    data = persist(store, symbol, period, interval, data, plan.calendar, plan.today)
+    if plan.raw:
+        data = adjust_prices(data)
+    record_result(symbol, data, dropped)
+
+    return convert_output(format_index(data, index_type), output), target_date
+
+
 def fetch_data(
-    ticker_obj: yf.Ticker,
+    ticker_obj: yf.Ticker | None,
     symbol: str,
     period: str = "4y",
     interval: str = "1d",
-    attempts=10,
-    market_config: dict | None = None,
-) -> tuple[pd.DataFrame, date]:
+    attempts: int | None = None,
+    market_config: Mapping | None = None,
+    store: OHLCVStore | None = None,
+    metadata_cache: MetadataCache | None = None,
+    retry_policy: RetryPolicy | None = None,
+    index_type: str = "date",
+    output: str = "pandas",
+    provider: DataProvider | None = None,
+) -> tuple[Any, date]:
     """
     Fetches and cleans historical data for a given symbol.
 
     Args:
-        ticker_obj: Initialized yfinance Ticker object.
+        ticker_obj: Initialized yfinance Ticker object used for the metadata
+            lookup, or None to ask the data provider.
         symbol: Ticker symbol string.
         period: Data period to download.
         interval: Data interval.
-        attempts: Number of retry attempts.
+        attempts: Maximum number of attempts, overriding the retry policy.
         market_config: Optional dictionary to override market cutoffs.
+        store: Optional on-disk store. Daily history found there is topped up
+            with the missing dates only and complete bars are written back.
+        metadata_cache: Optional cache consulted for the asset type and
+            timezone before asking yfinance.
+        retry_policy: Backoff, retry budget and circuit breaker for downloads.
+        index_type: "date" (datetime.date objects), "datetime" (datetime64)
+            or "period" (daily PeriodIndex).
+        output: "pandas", "compact" (float32/uint32 DataFrame), "arrow"
+            (pyarrow.Table) or "numpy" (structured array).
+        provider: Data provider (default: the process-wide provider).
 
     Raises:
         TickerNotFoundError: If the ticker info cannot be retrieved.
         DataEmptyError: If yfinance returns no data.
         YFinanceConnectionError: If connection fails after retries.
+        CircuitOpenError: If the circuit breaker is open.
     """
-    try:
-        ticker_info = ticker_obj.fast_info
-        quote_type = ticker_info.get("quoteType")
-        if quote_type:
-            quote_type = quote_type.upper()
-        ticker_tz_name = ticker_info.get("timezone")
-
-    except Exception as e:
-        try:
-            quote_type = ticker_obj.info.get("quoteType")
-            ticker_tz_name = ticker_obj.info.get("timezone")
-        except Exception:
-            logger.error(f"Could not retrieve ticker info for {symbol}")
-            raise TickerNotFoundError(
-                f"Ticker '{symbol}' information not found or accessible."
-            ) from e
-
-    logger.debug(f"Detected asset type for {symbol}: {quote_type}")
-    logger.debug(f"Detected timezone for {symbol}: {ticker_tz_name}")
-
-    df = None
-    last_exception = None
-
-    for i in range(attempts):
-        try:
-            df = yf.download(
+    check_index_type(index_type)
+    check_output(output)
+    retry_policy = resolve_policy(retry_policy, attempts)
+    meta = get_ticker_meta(ticker_obj, symbol, cache=metadata_cache, provider=provider)
+
+    plan = plan_fetch(symbol, meta, period, interval, market_config, store)
+    df = pd.DataFrame()
+    if not plan.current:
+        df = download(
+            symbol,
+            interval=interval,
+            retry_policy=retry_policy,
+            provider=provider,
+            **plan.request(period),
+        )
+
+    bars = plan.merge(df)
+    if bars is None:
+        bars = raw_bars(
+            download(
                 symbol,
-                period=period,
                 interval=interval,
-                auto_adjust=True,
-                progress=False,
-            )
-
-            if df is not None and not df.empty:
-                break
-
-            logger.debug(
-                f"Ticker {symbol} returned no data.\n"
-                f"Attempt: {i + 1}/{attempts}\nRetrying..."
-            )
-
-        except Exception as e:
-            last_exception = e
-            logger.debug(
-                f"Exception fetching {symbol}: {e}\n"
-                f"Attempt: {i + 1}/{attempts}\nRetrying..."
+                retry_policy=retry_policy,
+                provider=provider,
+                **plan.request(period, full=True),
             )
-
-        if i < attempts - 1:
-            time.sleep(2)
-
-    if df is None or df.empty:
-        if last_exception:
-            raise YFinanceConnectionError(
-                f"Failed to download data for {symbol} after {attempts} attempts."
-            ) from last_exception
-        raise DataEmptyError(
-            f"No historical data found for symbol '{symbol}' (period={period})."
         )
-
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.droplevel(1)
-
-    df.index = pd.to_datetime(df.index).date  # type: ignore
-
-    last_df_date = df.index[-1]
-
-    data = get_complete_close(
-        df, quote_type, last_df_date, ticker_tz_name, market_config
+    result = finish_fetch(
+        plan, bars, period, interval, market_config, store, index_type, output
     )
 
-    if data.empty:
-        raise DataEmptyError(
-            f"Data for {symbol} is empty after filtering unfinished days."
-        )
-
-    last_data_date = data.index[-1]
-
-    if quote_type == "CRYPTOCURRENCY":
-        target_date = last_data_date + timedelta(days=1)
-    else:
-        target_date = (last_data_date + BusinessDay(1)).date()
-
-    logger.debug(f"Final data date range: {data.index.min()} -> {last_data_date}")
     logger.info(f"Fetched {symbol} data from yfinance")
 
-    return data, target_date
+    return result
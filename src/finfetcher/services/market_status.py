@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_import
+from ..calendars import effective_cutoff, session_calendar
+from ..cutoffs import CutoffResolver
+from .metadata import TickerMeta
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+STATUS_COLUMNS = (
+    "asset_type",
+    "timezone",
+    "local_date",
+    "cutoff",
+    "is_complete",
+    "until_cutoff",
+)
+
+
+def _as_arrays(
+    symbols_meta: Mapping[str, TickerMeta] | pd.DataFrame,
+) -> tuple[pd.Index, np.ndarray, np.ndarray]:
+    if isinstance(symbols_meta, pd.DataFrame):
+        return (
+            symbols_meta.index,
+            symbols_meta["asset_type"].to_numpy(dtype=object),
+            symbols_meta["timezone"].to_numpy(dtype=object),
+        )
+    symbols = pd.Index(list(symbols_meta), name="symbol")
+    meta = list(symbols_meta.values())
+    return (
+        symbols,
+        np.array([m[0] for m in meta], dtype=object),
+        np.array([m[1] for m in meta], dtype=object),
+    )
+
+
+def _or_none(value: object) -> str | None:
+    return None if pd.isna(value) else str(value)  # type: ignore[arg-type]
+
+
+def market_status(
+    symbols_meta: Mapping[str, TickerMeta] | pd.DataFrame,
+    now: datetime | None = None,
+    market_config: Mapping | None = None,
+) -> pd.DataFrame:
+    """
+    Computes today's cutoff and candle status for a whole universe at once.
+
+    Cutoffs are resolved once per distinct (asset type, timezone) pair and
+    evaluated once per timezone, including early closes from the exchange
+    calendar; the per-symbol comparison is a single NumPy pass. A symbol's
+    candle is complete exactly when `get_complete_close` would keep a bar
+    dated `local_date`.
+
+    Args:
+        symbols_meta: Mapping of symbol to (asset type, timezone), e.g. the
+            metadata from `resolve_many`, or a DataFrame indexed by symbol with
+            "asset_type" and "timezone" columns.
+        now: Evaluation time (default: current time). Naive values are UTC.
+        market_config: Market cutoffs (dict or CutoffResolver, default:
+            MARKET_CUTOFFS).
+
+    Returns:
+        A DataFrame indexed by symbol with columns "asset_type", "timezone"
+        (the timezone the cutoff applies in), "local_date" (today in that
+        timezone), "cutoff" (UTC timestamp), "is_complete" and "until_cutoff"
+        (zero once the cutoff has passed).
+    """
+    resolver = CutoffResolver.coerce(market_config)
+    if now is None:
+        now = datetime.now(timezone.utc)
+    elif now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+
+    symbols, asset_types, timezones = _as_arrays(symbols_meta)
+    if len(symbols) == 0:
+        return pd.DataFrame(columns=list(STATUS_COLUMNS), index=symbols)
+
+    # Distinct (asset type, timezone) pairs, missing values included
+    asset_codes, asset_uniques = pd.factorize(asset_types, use_na_sentinel=False)
+    tz_codes, tz_uniques = pd.factorize(timezones, use_na_sentinel=False)
+    pair_keys, codes = np.unique(
+        asset_codes * len(tz_uniques) + tz_codes, return_inverse=True
+    )
+    asset_types_of_pairs = [
+        _or_none(asset_uniques[key // len(tz_uniques)]) for key in pair_keys
+    ]
+    resolved = [
+        resolver.resolve(asset_type, _or_none(tz_uniques[key % len(tz_uniques)]))
+        for asset_type, key in zip(asset_types_of_pairs, pair_keys, strict=True)
+    ]
+
+    # One now-in-tz conversion per timezone, one cutoff per distinct time
+    local_now: dict[str, datetime] = {}
+    cutoffs: dict[tuple[str, int, int], datetime] = {}
+    pair_cutoff = np.empty(len(resolved), dtype="datetime64[ns]")
+    pair_date = np.empty(len(resolved), dtype="datetime64[D]")
+    pair_tz = np.empty(len(resolved), dtype=object)
+    for i, cutoff in enumerate(resolved):
+        now_in_tz = local_now.get(cutoff.tz_name)
+        if now_in_tz is None:
+            now_in_tz = local_now[cutoff.tz_name] = now.astimezone(cutoff.tz)
+        calendar = session_calendar(asset_types_of_pairs[i], cutoff)
+        hour, minute = effective_cutoff(cutoff, calendar, now_in_tz.date())
+        key = (cutoff.tz_name, hour, minute)
+        cutoff_time = cutoffs.get(key)
+        if cutoff_time is None:
+            # Same construction as get_complete_close
+            cutoff_time = cutoffs[key] = now_in_tz.replace(
+                hour=hour, minute=minute, second=0, microsecond=0
+            )
+        pair_cutoff[i] = np.datetime64(
+            cutoff_time.astimezone(timezone.utc).replace(tzinfo=None), "ns"
+        )
+        pair_date[i] = np.datetime64(now_in_tz.date(), "D")
+        pair_tz[i] = cutoff.tz_name
+
+    now_ns = np.datetime64(now.astimezone(timezone.utc).replace(tzinfo=None), "ns")
+    cutoff_ns = pair_cutoff[codes]
+    until = cutoff_ns - now_ns
+    is_complete = until <= np.timedelta64(0, "ns")
+    until[is_complete] = np.timedelta64(0, "ns")
+
+    return pd.DataFrame(
+        {
+            "asset_type": asset_types,
+            "timezone": pair_tz[codes],
+            "local_date": pd.DatetimeIndex(pair_date[codes]),
+            "cutoff": pd.DatetimeIndex(cutoff_ns).tz_localize("UTC"),
+            "is_complete": is_complete,
+            "until_cutoff": pd.TimedeltaIndex(until),
+        },
+        index=symbols,
+    )
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from datetime import date, datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+from .._lazy import lazy_import
+from ..calendars import next_cutoff, session_calendar
+from ..cutoffs import CutoffResolver
+from .metadata import MetadataCache
+from .providers import DataProvider, resolve_provider
+from .store import OHLCVStore
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+# Bars of these intervals only change at the market cutoff; intraday results
+# are coalesced but not kept
+DAILY_INTERVALS = ("1d", "5d", "1wk", "1mo", "3mo")
+
+# (symbol, period, interval, variant)
+CacheKey = tuple[str, ...]
+Result = tuple["pd.DataFrame", date]
+
+
+def fetch_key(
+    symbol: str,
+    period: str,
+    interval: str,
+    market_config: Mapping | None = None,
+    store: OHLCVStore | None = None,
+    provider: DataProvider | None = None,
+) -> CacheKey:
+    """
+    Cache key of a fetch.
+
+    Besides the symbol, period and interval, the key holds a digest of the
+    cutoff configuration, the store (directory, format and raw mode) and the
+    provider, so fetchers configured differently never share entries.
+    """
+    store_part = (
+        None
+        if store is None
+        else (str(store.directory.resolve()), store.file_format, store.raw)
+    )
+    parts = (
+        CutoffResolver.coerce(market_config).fingerprint,
+        store_part,
+        resolve_provider(provider).identity,
+    )
+    variant = hashlib.sha1(repr(parts).encode()).hexdigest()[:12]
+    return (symbol.upper(), period, interval, variant)
+
+
+def data_expiry(
+    symbol: str,
+    interval: str,
+    metadata_cache: MetadataCache | None,
+    market_config: Mapping | None = None,
+    now: datetime | None = None,
+) -> datetime | None:
+    """
+    Next cutoff of `symbol`, until which its daily data cannot change, or None
+    if the data should not be kept (intraday interval or unknown metadata).
+    """
+    if interval not in DAILY_INTERVALS or metadata_cache is None:
+        return None
+    meta = metadata_cache.get(symbol)
+    if meta is None:
+        return None
+    asset_type, tz_name = meta
+    cutoff = CutoffResolver.coerce(market_config).resolve(asset_type, tz_name)
+    now = now or datetime.now(timezone.utc)
+    return next_cutoff(cutoff, session_calendar(asset_type, cutoff), now)
+
+
+class _InFlight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Result | None = None
+        self.error: BaseException | None = None
+
+
+class FetchCache:
+    """
+    In-process cache of cleaned data keyed by `fetch_key`.
+
+    Daily entries expire at the symbol's next market cutoff, since a complete
+    daily bar cannot change before then. Concurrent requests for the same key
+    share a single in-flight download (singleflight); errors are passed to
+    all waiting callers and never cached.
+
+    Cached frames are shared between callers and must not be modified in place.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        clock: Callable[[], datetime] | None = None,
+    ) -> None:
+        """
+        Args:
+            maxsize: Maximum number of entries, least recently used are evicted.
+            clock: Function returning the current timezone-aware time.
+        """
+        self.maxsize = maxsize
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[CacheKey, tuple[Result, datetime]] = OrderedDict()
+        self._in_flight: dict[CacheKey, _InFlight] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: CacheKey) -> Result | None:
+        with self._lock:
+            return self._lookup(key)
+
+    def _lookup(self, key: CacheKey) -> Result | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        result, expires = entry
+        if self._clock() >= expires:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def get_or_fetch(
+        self,
+        key: CacheKey,
+        fetch: Callable[[], Result],
+        expires: Callable[[], datetime | None],
+    ) -> Result:
+        """
+        Returns the cached result for `key`, or calls `fetch` once for all
+        concurrent callers and caches its result until `expires()`.
+        """
+        with self._lock:
+            result = self._lookup(key)
+            if result is not None:
+                self.hits += 1
+                return result
+            call = self._in_flight.get(key)
+            leader = call is None
+            if call is None:
+                call = self._in_flight[key] = _InFlight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            logger.debug(f"Waiting for in-flight fetch of {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[return-value]
+
+        try:
+            result = fetch()
+            expiry = expires()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+            raise
+
+        call.result = result
+        with self._lock:
+            if expiry is not None and expiry > self._clock():
+                self._entries[key] = (result, expiry)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            del self._in_flight[key]
+        call.done.set()
+        return result
+
+    def invalidate(self, symbol: str | None = None) -> None:
+        """Drops the entries of `symbol`, or all entries."""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[0] == symbol.upper()]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def expiry(
+        self,
+        symbol: str,
+        interval: str,
+        metadata_cache: MetadataCache | None,
+        market_config: Mapping | None = None,
+    ) -> datetime | None:
+        """Next cutoff of `symbol`; see `data_expiry`."""
+        return data_expiry(
+            symbol, interval, metadata_cache, market_config, self._clock()
+        )
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "in_flight": len(self._in_flight),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+            }
+
+
+default_fetch_cache = FetchCache()
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_import
+from ..exceptions import FinFetcherError, TickerNotFoundError
+from .metrics import timed
+from .providers import (
+    DataProvider,
+    TickerMeta,
+    YFinanceProvider,
+    read_ticker_meta,
+    resolve_provider,
+)
+from .rate_limit import get_rate_limiter
+
+if TYPE_CHECKING:
+    import yfinance as yf
+else:
+    yf = lazy_import("yfinance")
+
+logger = logging.getLogger(__name__)
+
+
+class MetadataCache:
+    """
+    Cache of ticker metadata (asset type and exchange timezone) keyed by symbol.
+
+    Entries live in an in-memory LRU and, if a `path` is given, in a JSON file
+    shared between runs. Both expire after `ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        ttl: float = 7 * 24 * 3600,
+        path: str | Path | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            maxsize: Maximum number of symbols kept in memory.
+            ttl: Entry lifetime in seconds.
+            path: Optional JSON file persisting the cache between runs.
+            clock: Function returning the current time in seconds.
+
+        Raises:
+            ValueError: If maxsize or ttl is not positive.
+        """
+        if maxsize < 1 or ttl <= 0:
+            raise ValueError("maxsize and ttl must be positive.")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = Path(path).expanduser() if path else None
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[str | None, str | None, float]] = (
+            OrderedDict()
+        )
+
+        if self.path and self.path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, symbol: str) -> TickerMeta | None:
+        """Returns (quote_type, timezone) for a symbol, or None if missing/expired."""
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is None:
+                return None
+            if self._clock() - entry[2] > self.ttl:
+                del self._entries[symbol]
+                return None
+            self._entries.move_to_end(symbol)
+            return entry[0], entry[1]
+
+    def set(self, symbol: str, quote_type: str | None, timezone: str | None) -> None:
+        """Stores metadata for a symbol and writes the file if persistent."""
+        self.set_many({symbol: (quote_type, timezone)})
+
+    def set_many(self, meta: dict[str, TickerMeta]) -> None:
+        """Stores metadata for many symbols with a single file write."""
+        now = self._clock()
+        with self._lock:
+            for symbol, (quote_type, timezone) in meta.items():
+                self._entries[symbol] = (quote_type, timezone, now)
+                self._entries.move_to_end(symbol)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        if self.path and meta:
+            self._save()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _load(self) -> None:
+        assert self.path is not None
+        try:
+            raw = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable metadata cache {self.path}: {e}")
+            return
+
+        now = self._clock()
+        fresh = sorted(
+            (
+                (symbol, entry)
+                for symbol, entry in raw.items()
+                if now - entry.get("fetched_at", 0) <= self.ttl
+            ),
+            key=lambda item: item[1]["fetched_at"],
+        )
+        for symbol, entry in fresh[-self.maxsize :]:
+            self._entries[symbol] = (
+                entry.get("quoteType"),
+                entry.get("timezone"),
+                entry["fetched_at"],
+            )
+
+        logger.debug(f"Loaded {len(self._entries)} symbols from {self.path}")
+
+    def _save(self) -> None:
+        assert self.path is not None
+        with self._lock:
+            raw = {
+                symbol: {"quoteType": qt, "timezone": tz, "fetched_at": ts}
+                for symbol, (qt, tz, ts) in self._entries.items()
+            }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per writer, as several processes may share the file
+        tmp_path = self.path.with_name(
+            f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        tmp_path.write_text(json.dumps(raw))
+        tmp_path.replace(self.path)
+
+
+# Process-wide cache used by DataFetcher and MultiFetcher unless one is passed
+default_metadata_cache = MetadataCache()
+
+
+def get_ticker_meta(
+    ticker_obj: yf.Ticker | None,
+    symbol: str,
+    cache: MetadataCache | None = None,
+    provider: DataProvider | None = None,
+) -> TickerMeta:
+    """
+    Resolves the asset type (quoteType) and exchange timezone of a ticker.
+
+    Checks `cache` first, then asks the data provider. With the yfinance
+    provider an existing `ticker_obj` is read instead (lightweight `fast_info`,
+    falling back to the heavier `info`). Resolved metadata is stored in `cache`.
+
+    Raises:
+        TickerNotFoundError: If the ticker info cannot be retrieved.
+    """
+    if cache is not None:
+        cached = cache.get(symbol)
+        if cached is not None:
+            logger.debug(f"Using cached metadata for {symbol}: {cached}")
+            return cached
+
+    provider = resolve_provider(provider)
+    limiter = get_rate_limiter()
+
+    try:
+        with timed(symbol, "metadata"):
+            if ticker_obj is not None and isinstance(provider, YFinanceProvider):
+                quote_type, ticker_tz_name = limiter.call(
+                    read_ticker_meta, ticker_obj, symbol
+                )
+            else:
+                quote_type, ticker_tz_name = limiter.call(provider.get_meta, symbol)
+    except Exception as e:
+        logger.error(f"Could not retrieve ticker info for {symbol}")
+        raise TickerNotFoundError(
+            f"Ticker '{symbol}' information not found or accessible."
+        ) from e
+
+    logger.debug(f"Detected asset type for {symbol}: {quote_type}")
+    logger.debug(f"Detected timezone for {symbol}: {ticker_tz_name}")
+
+    if cache is not None:
+        cache.set(symbol, quote_type, ticker_tz_name)
+
+    return quote_type, ticker_tz_name
+
+
+def resolve_many(
+    symbols: list[str],
+    cache: MetadataCache | None = None,
+    max_workers: int = 8,
+    provider: DataProvider | None = None,
+) -> tuple[dict[str, TickerMeta], dict[str, FinFetcherError]]:
+    """
+    Resolves metadata for many symbols, looking up cache misses concurrently.
+
+    Returns:
+        A tuple of (meta, errors), each a dict keyed by symbol.
+    """
+    meta: dict[str, TickerMeta] = {}
+    errors: dict[str, FinFetcherError] = {}
+
+    missing = []
+    for symbol in symbols:
+        cached = cache.get(symbol) if cache is not None else None
+        if cached is not None:
+            meta[symbol] = cached
+        else:
+            missing.append(symbol)
+
+    def resolve(symbol: str) -> TickerMeta | FinFetcherError:
+        try:
+            # The cache is filled in bulk below, with a single file write
+            return get_ticker_meta(None, symbol, provider=provider)
+        except FinFetcherError as e:
+            return e
+
+    if missing:
+        # Each lookup runs in a copy of the caller's context (e.g. its observer)
+        contexts = [contextvars.copy_context() for _ in missing]
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            results = dict(
+                zip(
+                    missing,
+                    pool.map(lambda c, s: c.run(resolve, s), contexts, missing),
+                    strict=True,
+                )
+            )
+
+        resolved = {}
+        for symbol, result in results.items():
+            if isinstance(result, FinFetcherError):
+                errors[symbol] = result
+            else:
+                resolved[symbol] = result
+        if cache is not None:
+            cache.set_many(resolved)
+        meta.update(resolved)
+
+    logger.debug(
+        f"Resolved metadata for {len(meta)}/{len(symbols)} symbols "
+        f"({len(missing)} looked up)"
+    )
+
+    return meta, errors
+
+
+def prefetch_metadata(
+    symbols: list[str],
+    cache: MetadataCache | None = None,
+    max_workers: int = 8,
+    provider: DataProvider | None = None,
+) -> dict[str, FinFetcherError]:
+    """
+    Warms the metadata cache for a whole universe of symbols.
+
+    Args:
+        symbols: Ticker symbol strings.
+        cache: Cache to fill (default: the process-wide cache).
+        max_workers: Number of concurrent lookups.
+        provider: Data provider (default: the process-wide provider).
+
+    Returns:
+        Errors for symbols whose metadata could not be resolved.
+    """
+    if cache is None:
+        cache = default_metadata_cache
+
+    _, errors = resolve_many(
+        [s.upper() for s in symbols],
+        cache=cache,
+        max_workers=max_workers,
+        provider=provider,
+    )
+    for symbol, error in errors.items():
+        logger.warning(f"Could not prefetch metadata for {symbol}: {error}")
+
+    return errors
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from .._lazy import lazy_import
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+
+# Phases reported by the fetch functions:
+# "metadata": asset type and timezone lookup (cache misses only),
+# "fast_info" / "info": the yfinance requests behind it,
+# "download": all attempts of one download including retry waits,
+# "clean": unfinished-candle removal and target date,
+# "total": one DataFetcher.get_data or MultiFetcher.get_data call
+PHASES = ("metadata", "fast_info", "info", "download", "clean", "total")
+
+
+class FetchObserver:
+    """
+    Receives timings and outcomes of fetches.
+
+    Every method is a no-op; override the ones you need. Methods may be called
+    from worker threads. Batch downloads report the same request for each of
+    their symbols.
+    """
+
+    def on_phase(self, symbol: str, phase: str, seconds: float) -> None:
+        """A phase of fetching `symbol` took `seconds`."""
+
+    def on_attempt(self, symbol: str, error: BaseException | None) -> None:
+        """A download attempt finished, with the error if it failed."""
+
+    def on_result(self, symbol: str, rows: int, nbytes: int, dropped: int) -> None:
+        """Cleaned data was returned; `dropped` unfinished rows were removed."""
+
+    def on_error(self, symbol: str, error: BaseException) -> None:
+        """Fetching `symbol` failed with `error`."""
+
+
+_observer: FetchObserver | None = None
+_scoped: ContextVar[FetchObserver | None] = ContextVar(
+    "finfetcher_observer", default=None
+)
+
+
+def get_observer() -> FetchObserver | None:
+    """Returns the observer of the current fetch, or None if disabled."""
+    scoped = _scoped.get()
+    return scoped if scoped is not None else _observer
+
+
+def set_observer(observer: FetchObserver | None) -> FetchObserver | None:
+    """Sets the process-wide observer (None disables it), returns the previous."""
+    global _observer
+    previous, _observer = _observer, observer
+    return previous
+
+
+@contextmanager
+def observing(observer: FetchObserver | None) -> Iterator[None]:
+    """Reports fetches in this context (and its copies) to `observer`."""
+    if observer is None:
+        yield
+        return
+    token = _scoped.set(observer)
+    try:
+        yield
+    finally:
+        _scoped.reset(token)
+
+
+class _Stats:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def as_dict(self) -> dict[str, float]:
+        return {"count": self.count, "total": self.total, "max": self.max}
+
+
+class _SymbolMetrics:
+    def __init__(self) -> None:
+        self.phases: dict[str, _Stats] = {}
+        self.attempts = 0
+        self.failed_attempts = 0
+        self.rows = 0
+        self.nbytes = 0
+        self.dropped = 0
+        self.errors: dict[str, int] = {}
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "phases": {name: s.as_dict() for name, s in self.phases.items()},
+            "attempts": self.attempts,
+            "failed_attempts": self.failed_attempts,
+            "rows": self.rows,
+            "bytes": self.nbytes,
+            "rows_dropped": self.dropped,
+            "errors": dict(self.errors),
+        }
+
+
+class MetricsCollector(FetchObserver):
+    """
+    Built-in observer aggregating fetch metrics per symbol.
+
+    Export them with `summary` (a dict) or `to_prometheus` (text exposition
+    format), e.g. at the end of a nightly run.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._symbols: dict[str, _SymbolMetrics] = {}
+
+    def _get(self, symbol: str) -> _SymbolMetrics:
+        metrics = self._symbols.get(symbol)
+        if metrics is None:
+            metrics = self._symbols[symbol] = _SymbolMetrics()
+        return metrics
+
+    def on_phase(self, symbol: str, phase: str, seconds: float) -> None:
+        with self._lock:
+            phases = self._get(symbol).phases
+            stats = phases.get(phase)
+            if stats is None:
+                stats = phases[phase] = _Stats()
+            stats.add(seconds)
+
+    def on_attempt(self, symbol: str, error: BaseException | None) -> None:
+        with self._lock:
+            metrics = self._get(symbol)
+            metrics.attempts += 1
+            if error is not None:
+                metrics.failed_attempts += 1
+
+    def on_result(self, symbol: str, rows: int, nbytes: int, dropped: int) -> None:
+        with self._lock:
+            metrics = self._get(symbol)
+            metrics.rows += rows
+            metrics.nbytes += nbytes
+            metrics.dropped += dropped
+
+    def on_error(self, symbol: str, error: BaseException) -> None:
+        name = type(error).__name__
+        with self._lock:
+            errors = self._get(symbol).errors
+            errors[name] = errors.get(name, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._symbols.clear()
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Returns {"symbols": per-symbol metrics, "totals": the same summed over
+        all symbols}. Phase stats hold count, total and max seconds.
+        """
+        with self._lock:
+            symbols = {s: m.as_dict() for s, m in self._symbols.items()}
+
+        totals: dict[str, Any] = {
+            "phases": {},
+            "attempts": 0,
+            "failed_attempts": 0,
+            "rows": 0,
+            "bytes": 0,
+            "rows_dropped": 0,
+            "errors": {},
+        }
+        for metrics in symbols.values():
+            for name, stats in metrics["phases"].items():
+                total = totals["phases"].setdefault(
+                    name, {"count": 0, "total": 0.0, "max": 0.0}
+                )
+                total["count"] += stats["count"]
+                total["total"] += stats["total"]
+                total["max"] = max(total["max"], stats["max"])
+            for key in ("attempts", "failed_attempts", "rows", "bytes", "rows_dropped"):
+                totals[key] += metrics[key]
+            for name, count in metrics["errors"].items():
+                totals["errors"][name] = totals["errors"].get(name, 0) + count
+
+        return {"symbols": symbols, "totals": totals}
+
+    def to_prometheus(self, per_symbol: bool = False) -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+
+        Args:
+            per_symbol: Add a `symbol` label to every sample. Off by default,
+                since large universes create one series per symbol.
+        """
+        summary = self.summary()
+        if per_symbol:
+            groups = [({"symbol": s}, m) for s, m in summary["symbols"].items()]
+        else:
+            groups = [({}, summary["totals"])]
+
+        lines: list[str] = []
+
+        def metric(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP finfetcher_{name} {help_text}")
+            lines.append(f"# TYPE finfetcher_{name} {kind}")
+
+        def sample(name: str, labels: dict[str, str], value: float) -> None:
+            label_text = ",".join(
+                f'{key}="{_escape(str(val))}"' for key, val in labels.items()
+            )
+            lines.append(
+                f"finfetcher_{name}{{{label_text}}} {value}"
+                if label_text
+                else f"finfetcher_{name} {value}"
+            )
+
+        metric("phase_seconds", "summary", "Time spent in each fetch phase.")
+        for labels, metrics in groups:
+            for phase, stats in metrics["phases"].items():
+                phase_labels = {**labels, "phase": phase}
+                sample("phase_seconds_sum", phase_labels, stats["total"])
+                sample("phase_seconds_count", phase_labels, stats["count"])
+
+        counters = [
+            ("attempts_total", "attempts", "Download attempts."),
+            ("failed_attempts_total", "failed_attempts", "Failed download attempts."),
+            ("rows_total", "rows", "Rows of cleaned data returned."),
+            ("bytes_total", "bytes", "Bytes of cleaned data returned."),
+            ("rows_dropped_total", "rows_dropped", "Unfinished rows removed."),
+        ]
+        for name, key, help_text in counters:
+            metric(name, "counter", help_text)
+            for labels, metrics in groups:
+                sample(name, labels, metrics[key])
+
+        metric("errors_total", "counter", "Failed fetches by error class.")
+        for labels, metrics in groups:
+            for error, count in metrics["errors"].items():
+                sample("errors_total", {**labels, "error": error}, count)
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _PhaseTimer:
+    __slots__ = ("symbol", "phase", "observer", "_start")
+
+    def __init__(self, symbol: str, phase: str) -> None:
+        self.symbol = symbol
+        self.phase = phase
+        self.observer = get_observer()
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        if self.observer is not None:
+            self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        if self.observer is not None:
+            self.observer.on_phase(
+                self.symbol, self.phase, time.perf_counter() - self._start
+            )
+
+
+def timed(symbol: str, phase: str) -> _PhaseTimer:
+    """
+    Times a `with` block as `phase` of `symbol` for the current observer.
+
+    Without an observer it only costs the lookup of the observer.
+    """
+    return _PhaseTimer(symbol, phase)
+
+
+def record_result(symbol: str, data: pd.DataFrame, dropped: int) -> None:
+    """Reports the rows and bytes of cleaned data to the current observer."""
+    observer = get_observer()
+    if observer is not None:
+        nbytes = int(data.memory_usage(index=True).sum())
+        observer.on_result(symbol, len(data), nbytes, dropped)
+
+
+def record_attempt(symbols: list[str], error: BaseException | None) -> None:
+    """Reports one download attempt of `symbols` to the current observer."""
+    observer = get_observer()
+    if observer is not None:
+        for symbol in symbols:
+            observer.on_attempt(symbol, error)
+
+
+def record_error(symbol: str, error: BaseException) -> None:
+    """Reports a failed fetch to the current observer."""
+    observer = get_observer()
+    if observer is not None:
+        observer.on_error(symbol, error)
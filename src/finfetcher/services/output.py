@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from .._lazy import lazy_import
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+
+
+# "pandas": DataFrame as returned by yfinance (float64 prices, int64 volume)
+# "compact": DataFrame with float32 prices and uint32 (or int64) volume
+# "arrow": pyarrow.Table (requires pyarrow)
+# "numpy": contiguous structured array with a "Date" datetime64[D] field
+OUTPUT_FORMATS = ("pandas", "compact", "arrow", "numpy")
+
+_UINT32_MAX = 2**32 - 1
+
+
+def check_output(output: str) -> None:
+    if output not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output '{output}', use one of {OUTPUT_FORMATS}.")
+
+
+def downcast(df: pd.DataFrame) -> pd.DataFrame:
+    """Returns a copy with float32 prices and the smallest safe volume dtype."""
+    columns = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if col == "Volume" and not np.isnan(values.astype(np.float64)).any():
+            fits = values.size == 0 or (
+                values.min() >= 0 and values.max() <= _UINT32_MAX
+            )
+            columns[col] = values.astype(np.uint32 if fits else np.int64)
+        elif values.dtype.kind == "f":
+            columns[col] = values.astype(np.float32)
+        else:
+            columns[col] = values
+    # Built from arrays: much cheaper than a column-wise DataFrame.astype
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def to_datetime64(index: pd.Index) -> np.ndarray:
+    """Converts a date, datetime64 or Period index to a datetime64[D] array."""
+    if isinstance(index, pd.PeriodIndex):
+        index = index.to_timestamp()
+    elif not isinstance(index, pd.DatetimeIndex):
+        index = pd.to_datetime(index)
+    return np.asarray(index.tz_localize(None) if index.tz else index).astype(
+        "datetime64[D]"
+    )
+
+
+def to_structured(df: pd.DataFrame) -> np.ndarray:
+    """Packs a frame into one contiguous NumPy structured array."""
+    dtype = [("Date", "datetime64[D]")] + [
+        (str(col), df[col].dtype) for col in df.columns
+    ]
+    records = np.empty(len(df), dtype=dtype)
+    records["Date"] = to_datetime64(df.index)
+    for col in df.columns:
+        records[str(col)] = df[col].to_numpy()
+    return records
+
+
+def to_arrow(df: pd.DataFrame) -> Any:
+    """Converts a frame to a pyarrow.Table, zero-copy where the dtypes allow."""
+    try:
+        pa = importlib.import_module("pyarrow")
+    except ImportError as e:
+        raise ImportError(
+            "output='arrow' requires pyarrow: pip install finfetcher[arrow]"
+        ) from e
+
+    df = df.copy(deep=False)
+    df.index = pd.Index(to_datetime64(df.index), name="Date")
+    return pa.Table.from_pandas(df, preserve_index=True)
+
+
+def convert_output(df: pd.DataFrame, output: str = "pandas") -> Any:
+    """
+    Converts cleaned data to the requested output format.
+
+    Returns:
+        A pandas DataFrame ("pandas", "compact"), a pyarrow.Table ("arrow") or a
+        NumPy structured array ("numpy").
+    """
+    check_output(output)
+    if output == "pandas":
+        return df
+    if output == "compact":
+        return downcast(df)
+    if output == "arrow":
+        return to_arrow(df)
+    return to_structured(df)
@@ -0,0 +1,516 @@
+from __future__ import annotations
+
+import json
+import logging
+import random
+import re
+import threading
+import time
+import warnings
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .._lazy import lazy_import
+from ..exceptions import TickerNotFoundError
+from .actions import adjust_prices
+from .metrics import timed
+from .rate_limit import is_throttle_error
+from .session import get_session
+from .store import period_start
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    import yfinance as yf
+else:
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+    yf = lazy_import("yfinance")
+
+logger = logging.getLogger(__name__)
+
+# Concurrent single-ticker requests of a multi-ticker download
+MAX_DOWNLOAD_THREADS = 8
+
+TickerMeta = tuple[str | None, str | None]
+DateLike = date | datetime | str
+
+
+class DataProvider(ABC):
+    """
+    Source of ticker metadata and raw OHLCV bars.
+
+    Providers only perform the requests. Retries, the circuit breaker, rate
+    limiting and cleaning are applied by the fetch functions around them, so
+    every provider goes through the same pipeline.
+    """
+
+    name = "provider"
+
+    @property
+    def identity(self) -> str:
+        """Where the provider's data comes from, part of fetch cache keys."""
+        return self.name
+
+    @abstractmethod
+    def get_meta(self, symbol: str) -> TickerMeta:
+        """
+        Returns (quote_type, timezone) of a symbol.
+
+        Raises:
+            Exception: If the symbol is unknown or the lookup failed.
+        """
+
+    @abstractmethod
+    def history(
+        self,
+        symbol: str,
+        interval: str = "1d",
+        period: str | None = None,
+        start: DateLike | None = None,
+        end: DateLike | None = None,
+        auto_adjust: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Returns the bars of one symbol with flat OHLCV columns, or an empty
+        frame if there are none. Pass either `period` or `start`.
+
+        `auto_adjust=False` (only passed by raw `OHLCVStore`s) asks for
+        unadjusted prices plus "Dividends" and "Stock Splits" columns.
+        """
+
+    @abstractmethod
+    def history_many(
+        self,
+        symbols: list[str],
+        interval: str = "1d",
+        period: str | None = None,
+        start: DateLike | None = None,
+        end: DateLike | None = None,
+        auto_adjust: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Returns the bars of many symbols in one frame with (symbol, field)
+        column levels, as `yf.download(group_by="ticker")` does.
+
+        Symbols whose own request failed may be left out and listed with
+        their exception in `df.attrs["errors"]`, so only they are retried.
+        """
+
+
+def read_ticker_meta(ticker_obj: Any, symbol: str = "") -> TickerMeta:
+    """
+    Reads (quote_type, timezone) from a yfinance Ticker, trying the
+    lightweight `fast_info` before the heavier `info`.
+    """
+    try:
+        with timed(symbol, "fast_info"):
+            ticker_info = ticker_obj.fast_info
+            quote_type = ticker_info.get("quoteType")
+            timezone = ticker_info.get("timezone")
+        return (quote_type.upper() if quote_type else quote_type), timezone
+    except Exception:
+        with timed(symbol, "info"):
+            ticker_info = ticker_obj.info
+        return ticker_info.get("quoteType"), ticker_info.get("timezone")
+
+
+def _range_kwargs(
+    period: str | None, start: DateLike | None, end: DateLike | None
+) -> dict[str, Any]:
+    kwargs = {"period": period, "start": start, "end": end}
+    return {key: value for key, value in kwargs.items() if value is not None}
+
+
+def _no_data_errors() -> tuple[type[Exception], ...]:
+    # Yahoo answered, but has no bars for the symbol, range or period
+    from yfinance.exceptions import YFInvalidPeriodError, YFTickerMissingError
+
+    return (YFTickerMissingError, YFInvalidPeriodError)
+
+
+_quiet_lock = threading.Lock()
+_quiet_requests = 0
+_quiet_filter: tuple | None = None
+
+
+@contextmanager
+def _raise_errors_quietly() -> Iterator[None]:
+    """
+    Silences the deprecation warning of `history(raise_errors=True)` while
+    requests run.
+
+    `raise_errors` is deprecated in favour of a process-wide yfinance switch,
+    but it is the only way to have a single request raise. The filter is only
+    installed while requests run. `warnings.catch_warnings` is not used: it
+    restores the filters saved on entry, which leaks or drops this filter
+    when requests of several threads overlap.
+    """
+    global _quiet_requests, _quiet_filter
+    with _quiet_lock:
+        if _quiet_requests == 0:
+            warnings.filterwarnings(
+                "ignore",
+                message="'raise_errors' deprecated",
+                category=DeprecationWarning,
+            )
+            _quiet_filter = warnings.filters[0]
+        _quiet_requests += 1
+    try:
+        yield
+    finally:
+        with _quiet_lock:
+            _quiet_requests -= 1
+            if _quiet_requests == 0:
+                warnings.filters = [
+                    f for f in warnings.filters if f is not _quiet_filter
+                ]
+                _quiet_filter = None
+
+
+def _ticker_history(
+    symbol: str, session: Any, interval: str, **kwargs: Any
+) -> pd.DataFrame:
+    try:
+        with _raise_errors_quietly():
+            df = yf.Ticker(symbol, session=session).history(
+                interval=interval, raise_errors=True, **kwargs
+            )
+    except _no_data_errors() as e:
+        logger.debug(f"No data for {symbol}: {e}")
+        return pd.DataFrame()
+    if df is None:
+        return pd.DataFrame()
+    if interval[-1] not in ("m", "h") and isinstance(df.index, pd.DatetimeIndex):
+        # Daily and coarser bars are dated in exchange time, as yf.download has it
+        df.index = df.index.tz_localize(None)
+    return df
+
+
+def yf_download(
+    tickers: str | list[str],
+    interval: str = "1d",
+    session: Any = None,
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """
+    `yf.download` that raises request errors instead of logging them.
+
+    yf.download turns every failure, including outages and HTTP 429 responses,
+    into an empty frame, which the retry policy, circuit breaker and rate
+    limiter would take for a symbol without data. Here only "no data" answers
+    from Yahoo give an empty frame. Other errors of single symbols are left
+    out of the frame and listed in `df.attrs["errors"]`; throttling and
+    connection errors, or every symbol failing, raise once all are done.
+
+    Returns:
+        Flat OHLCV columns for a single ticker string, otherwise (symbol,
+        field) column levels as `yf.download(group_by="ticker")` returns.
+    """
+    if isinstance(tickers, str):
+        return _ticker_history(tickers, session, interval, **kwargs)
+
+    def history(symbol: str) -> pd.DataFrame | Exception:
+        try:
+            return _ticker_history(symbol, session, interval, **kwargs)
+        except Exception as e:
+            return e
+
+    workers = max(1, min(len(tickers), MAX_DOWNLOAD_THREADS))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = dict(zip(tickers, pool.map(history, tickers)))
+
+    errors = {
+        symbol: result
+        for symbol, result in results.items()
+        if isinstance(result, Exception)
+    }
+    for error in errors.values():
+        # Throttling or an outage concerns every symbol of the request
+        if is_throttle_error(error):
+            raise error
+    if errors and len(errors) == len(tickers):
+        raise next(iter(errors.values()))
+
+    frames = {
+        symbol: df
+        for symbol, df in results.items()
+        if isinstance(df, pd.DataFrame) and not df.empty
+    }
+    if frames:
+        df = pd.concat(frames, axis=1, sort=True, names=["Ticker", "Price"])
+    else:
+        df = pd.DataFrame()
+    df.attrs["errors"] = errors
+    return df
+
+
+class YFinanceProvider(DataProvider):
+    """Yahoo Finance through yfinance, with auto-adjusted prices by default."""
+
+    name = "yfinance"
+
+    def __init__(self, session: Any = None) -> None:
+        """
+        Args:
+            session: HTTP session for all requests, e.g. from `make_session`.
+                Defaults to the process-wide session of `get_session`.
+        """
+        self.session = session
+
+    def _session(self) -> Any:
+        return self.session if self.session is not None else get_session()
+
+    def ticker(self, symbol: str) -> yf.Ticker:
+        """A yfinance Ticker requesting through this provider's session."""
+        return yf.Ticker(symbol, session=self._session())
+
+    def get_meta(self, symbol: str) -> TickerMeta:
+        return read_ticker_meta(self.ticker(symbol), symbol)
+
+    def history(
+        self,
+        symbol: str,
+        interval: str = "1d",
+        period: str | None = None,
+        start: DateLike | None = None,
+        end: DateLike | None = None,
+        auto_adjust: bool = True,
+    ) -> pd.DataFrame:
+        df = yf_download(
+            symbol,
+            interval=interval,
+            auto_adjust=auto_adjust,
+            actions=not auto_adjust,
+            session=self._session(),
+            **_range_kwargs(period, start, end),
+        )
+        if df is not None and isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.droplevel(1)
+        return df if df is not None else pd.DataFrame()
+
+    def history_many(
+        self,
+        symbols: list[str],
+        interval: str = "1d",
+        period: str | None = None,
+        start: DateLike | None = None,
+        end: DateLike | None = None,
+        auto_adjust: bool = True,
+    ) -> pd.DataFrame:
+        df = yf_download(
+            symbols,
+            interval=interval,
+            auto_adjust=auto_adjust,
+            actions=not auto_adjust,
+            session=self._session(),
+            **_range_kwargs(period, start, end),
+        )
+        return df if df is not None else pd.DataFrame()
+
+
+class ReplayProvider(DataProvider):
+    """
+    Serves recorded bars from local files, for offline load tests and
+    benchmarks of the fetch pipeline.
+
+    Fixtures are named `<SYMBOL>_<interval>.parquet` or `.csv`, the layout
+    `OHLCVStore` writes, so a store filled by real fetches can be replayed.
+    Metadata comes from `metadata` or a `meta.json` file in the directory in
+    the persistent `MetadataCache` format. Recordings of a raw store (with
+    dividend and split series) are adjusted locally unless `auto_adjust=False`
+    is requested.
+
+    Every request waits `latency` seconds (plus uniform `jitter`) and fails
+    with a ConnectionError at `failure_rate`, which the retry policy and the
+    rate limiter treat like a real connection problem.
+    """
+
+    name = "replay"
+
+    @property
+    def identity(self) -> str:
+        return f"{self.name}:{self.directory.resolve()}"
+
+    def __init__(
+        self,
+        directory: str | Path,
+        metadata: Mapping[str, TickerMeta] | None = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int | None = None,
+        sleep: Callable[[float], Any] = time.sleep,
+    ) -> None:
+        """
+        Args:
+            directory: Directory holding the recorded files.
+            metadata: (quote_type, timezone) per symbol, overriding meta.json.
+            latency: Simulated request time in seconds.
+            jitter: Maximum random time in seconds added to `latency`.
+            failure_rate: Probability of a request raising ConnectionError.
+            seed: Seed of the random generator, for reproducible failures.
+            sleep: Function used to wait, in seconds.
+
+        Raises:
+            ValueError: If latency or jitter is negative, or failure_rate is
+                not between 0 and 1.
+        """
+        if latency < 0 or jitter < 0:
+            raise ValueError("latency and jitter must be non-negative.")
+        if not 0 <= failure_rate <= 1:
+            raise ValueError("failure_rate must be between 0 and 1.")
+
+        self.directory = Path(directory).expanduser()
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._sleep = sleep
+        self._frames: dict[tuple[str, str], pd.DataFrame] = {}
+        self.metadata = self._load_metadata()
+        if metadata is not None:
+            self.metadata.update(metadata)
+        self.requests = 0
+
+    def _load_metadata(self) -> dict[str, TickerMeta]:
+        path = self.directory / "meta.json"
+        if not path.exists():
+            return {}
+        raw = json.loads(path.read_text())
+        return {
+            symbol: (entry.get("quoteType"), entry.get("timezone"))
+            for symbol, entry in raw.items()
+        }
+
+    def _simulate(self, label: str) -> None:
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.failure_rate
+        if delay > 0:
+            self._sleep(delay)
+        if failed:
+            raise ConnectionError(f"Simulated failure replaying {label}")
+
+    def _load(self, symbol: str, interval: str) -> pd.DataFrame:
+        key = (symbol, interval)
+        if key not in self._frames:
+            safe_symbol = re.sub(r"[^A-Za-z0-9._=^-]", "_", symbol)
+            df = pd.DataFrame()
+            for suffix in ("parquet", "csv"):
+                path = self.directory / f"{safe_symbol}_{interval}.{suffix}"
+                if path.exists():
+                    if suffix == "parquet":
+                        df = pd.read_parquet(path)
+                    else:
+                        df = pd.read_csv(path, index_col=0)
+                    df.index = pd.to_datetime(df.index)
+                    df.index.name = None
+                    logger.debug(f"Loaded {len(df)} recorded bars from {path}")
+                    break
+            self._frames[key] = df
+        return self._frames[key]
+
+    def _select(
+        self,
+        symbol: str,
+        interval: str,
+        period: str | None,
+        start: DateLike | None,
+        end: DateLike | None,
+    ) -> pd.DataFrame:
+        df = self._load(symbol, interval)
+        if df.empty:
+            return df
+        index = pd.DatetimeIndex(df.index)
+        mask = np.ones(len(index), dtype=bool)
+        if start is not None:
+            mask &= index >= _bound(start, index)
+        elif period is not None and period != "max":
+            # Periods count back from the last recorded bar, so old recordings
+            # replay the same way on any day. "Nd" is N sessions, i.e. bars.
+            days = re.fullmatch(r"(\d+)d", period)
+            if days is not None:
+                mask[: max(0, len(index) - int(days.group(1)))] = False
+            else:
+                first = period_start(period, index[-1].date())
+                if first is not None:
+                    mask &= index >= _bound(first, index)
+        if end is not None:
+            mask &= index < _bound(end, index)
+        return df[mask]
+
+    def get_meta(self, symbol: str) -> TickerMeta:
+        self._simulate(symbol)
+        if symbol not in self.metadata:
+            raise TickerNotFoundError(f"No recorded metadata for '{symbol}'.")
+        return self.metadata[symbol]
+
+    def history(
+        self,
+        symbol: str,
+        interval: str = "1d",
+        period: str | None = None,
+        start: DateLike | None = None,
+        end: DateLike | None = None,
+        auto_adjust: bool = True,
+    ) -> pd.DataFrame:
+        self._simulate(symbol)
+        df = self._select(symbol, interval, period, start, end).copy()
+        return adjust_prices(df) if auto_adjust else df
+
+    def history_many(
+        self,
+        symbols: list[str],
+        interval: str = "1d",
+        period: str | None = None,
+        start: DateLike | None = None,
+        end: DateLike | None = None,
+        auto_adjust: bool = True,
+    ) -> pd.DataFrame:
+        self._simulate(", ".join(symbols))
+        frames = {
+            symbol: adjust_prices(frame) if auto_adjust else frame
+            for symbol in symbols
+            if not (frame := self._select(symbol, interval, period, start, end)).empty
+        }
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1, names=["Ticker", "Price"], sort=True)
+
+
+def _bound(value: DateLike, index: pd.DatetimeIndex) -> pd.Timestamp:
+    """`value` as a Timestamp comparable with `index`."""
+    ts = pd.Timestamp(value)
+    if index.tz is not None and ts.tzinfo is None:
+        return ts.tz_localize(index.tz)
+    if index.tz is None and ts.tzinfo is not None:
+        return ts.tz_convert(None)
+    return ts
+
+
+_provider: DataProvider = YFinanceProvider()
+
+
+def get_provider() -> DataProvider:
+    """Returns the process-wide provider used unless one is passed."""
+    return _provider
+
+
+def set_provider(provider: DataProvider) -> DataProvider:
+    """Replaces the process-wide provider and returns the previous one."""
+    global _provider
+    previous, _provider = _provider, provider
+    return previous
+
+
+def resolve_provider(provider: DataProvider | None) -> DataProvider:
+    """Returns `provider`, or the process-wide one if it is None."""
+    return provider if provider is not None else get_provider()
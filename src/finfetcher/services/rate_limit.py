@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def is_throttle_error(exception: BaseException) -> bool:
+    """
+    Whether an exception looks like rate limiting or a connection problem.
+
+    Recognizes yfinance's YFRateLimitError, HTTP errors carrying a 429
+    response (requests and curl_cffi) and connection or timeout errors.
+    """
+    if isinstance(exception, (ConnectionError, TimeoutError)):
+        return True
+    response = getattr(exception, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    name = type(exception).__name__
+    if "RateLimit" in name or "Connection" in name or "Timeout" in name:
+        return True
+    message = str(exception)
+    return "Too Many Requests" in message or "429" in message
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with AIMD rate adjustment.
+
+    Every request takes a token; tokens refill at `rate` per second up to
+    `burst`. Successful requests raise the rate additively by `increase`,
+    rate-limit or connection errors cut it multiplicatively by `decrease`
+    (at most once per `cooldown` seconds), always within
+    [`min_rate`, `max_rate`].
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: float = 20.0,
+        min_rate: float = 0.5,
+        max_rate: float = 50.0,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = time.sleep,
+    ) -> None:
+        """
+        Args:
+            rate: Initial requests per second.
+            burst: Bucket capacity, i.e. requests allowed back-to-back.
+            min_rate: Lower bound of the adjusted rate.
+            max_rate: Upper bound of the adjusted rate.
+            increase: Rate added after each successful request.
+            decrease: Factor (0-1) applied to the rate on throttling.
+            cooldown: Minimum seconds between two rate decreases.
+            clock: Function returning monotonic time in seconds.
+            sleep: Function used to wait for a token in synchronous code.
+
+        Raises:
+            ValueError: If any of the values is out of range.
+        """
+        if not 0 < min_rate <= rate <= max_rate:
+            raise ValueError("Rates must satisfy 0 < min_rate <= rate <= max_rate.")
+        if burst < 1 or increase < 0 or not 0 < decrease < 1:
+            raise ValueError(
+                "burst must be at least 1, increase non-negative and decrease "
+                "between 0 and 1."
+            )
+
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._rate = rate
+        self._tokens = burst
+        self._updated = clock()
+        self._last_decrease = float("-inf")
+        self._waiting = 0
+        self._throttled = 0
+
+    @property
+    def rate(self) -> float:
+        """Current allowed requests per second."""
+        return self._rate
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers currently waiting for a token."""
+        return self._waiting
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            self._refill()
+            return {
+                "rate": self._rate,
+                "tokens": self._tokens,
+                "queue_depth": self._waiting,
+                "throttled": self._throttled,
+            }
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def _reserve(self) -> float:
+        """Takes a token (possibly ahead of time) and returns the wait."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            self._waiting += 1
+            return -self._tokens / self._rate
+
+    def _release(self) -> None:
+        with self._lock:
+            self._waiting -= 1
+
+    def acquire(self) -> float:
+        """Blocks until a request may be sent. Returns the time waited."""
+        wait = self._reserve()
+        if wait > 0:
+            try:
+                self._sleep(wait)
+            finally:
+                self._release()
+        return wait
+
+    async def aacquire(self) -> float:
+        """Async counterpart of `acquire`."""
+        wait = self._reserve()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._release()
+        return wait
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._rate = min(self.max_rate, self._rate + self.increase)
+
+    def record_throttle(self) -> None:
+        with self._lock:
+            self._throttled += 1
+            now = self._clock()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self._refill()
+            self._rate = max(self.min_rate, self._rate * self.decrease)
+            rate = self._rate
+        logger.warning(f"Throttled by upstream, reducing rate to {rate:.2f} req/s")
+
+    def record(self, exception: BaseException | None) -> None:
+        """Adjusts the rate according to the outcome of a request."""
+        if exception is None:
+            self.record_success()
+        elif is_throttle_error(exception):
+            self.record_throttle()
+
+    def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Calls `func` once a token is available and records its outcome."""
+        self.acquire()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.record(e)
+            raise
+        self.record(None)
+        return result
+
+    async def acall(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Runs blocking `func` in a worker thread once a token is available."""
+        await self.aacquire()
+        try:
+            result = await asyncio.to_thread(func, *args, **kwargs)
+        except Exception as e:
+            self.record(e)
+            raise
+        self.record(None)
+        return result
+
+
+_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Returns the process-wide limiter every yfinance request goes through."""
+    return _limiter
+
+
+def set_rate_limiter(limiter: RateLimiter) -> RateLimiter:
+    """Replaces the process-wide limiter and returns the previous one."""
+    global _limiter
+    previous, _limiter = _limiter, limiter
+    return previous
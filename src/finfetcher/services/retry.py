@@ -0,0 +1,335 @@
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+
+from ..exceptions import (
+    CircuitOpenError,
+    DataEmptyError,
+    FinFetcherError,
+    YFinanceConnectionError,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Fails fast once the upstream looks down, shared across all fetchers.
+
+    After `failure_threshold` consecutive failed requests the circuit opens and
+    requests are rejected for `recovery_timeout` seconds. Then one trial request
+    is let through: success closes the circuit, failure opens it again. A trial
+    that is abandoned (e.g. cancelled) is released, so the next request becomes
+    the trial.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1 or recovery_timeout < 0:
+            raise ValueError(
+                "failure_threshold must be positive and recovery_timeout non-negative."
+            )
+
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if (
+                self._state == self.OPEN
+                and self._clock() - self._opened_at >= self.recovery_timeout
+            ):
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Returns whether a request may be sent now."""
+        return self.admit() is not None
+
+    def admit(self) -> str | None:
+        """
+        Admits a request if possible.
+
+        Returns:
+            HALF_OPEN if the request is the trial, CLOSED if it is a regular
+            request, None if it is rejected.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return self.CLOSED
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.recovery_timeout:
+                    return None
+                # Let a single trial request through
+                self._state = self.HALF_OPEN
+                return self.HALF_OPEN
+            # HALF_OPEN: a trial request is already in flight
+            return None
+
+    def release(self) -> None:
+        """Gives up an unfinished trial request, letting the next one through."""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.OPEN
+                self._opened_at = self._clock() - self.recovery_timeout
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Circuit breaker closed, upstream recovered")
+            self._failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state == self.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                if self._state != self.OPEN:
+                    logger.warning(
+                        f"Circuit breaker opened after {self._failures} failures, "
+                        f"failing fast for {self.recovery_timeout}s"
+                    )
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+    def reset(self) -> None:
+        self.record_success()
+
+
+# Process-wide breaker shared by every fetcher unless a policy overrides it
+default_circuit_breaker = CircuitBreaker()
+
+
+class RetryPolicy:
+    """
+    Retry behaviour of download requests.
+
+    Network errors are retried up to `max_attempts` times, empty responses
+    (usually an invalid or delisted symbol) only up to `empty_attempts` times.
+    Waits grow exponentially from `base_delay` up to `max_delay`, with up to
+    `jitter` of each wait randomized away so workers do not retry in lockstep.
+    No retry is started once `deadline` seconds would be exceeded.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 10,
+        empty_attempts: int = 2,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.5,
+        deadline: float | None = 30.0,
+        circuit_breaker: CircuitBreaker | None = default_circuit_breaker,
+    ) -> None:
+        """
+        Args:
+            max_attempts: Maximum number of attempts when requests fail.
+            empty_attempts: Maximum number of attempts when data comes back empty.
+            base_delay: Wait in seconds before the first retry.
+            max_delay: Upper bound of a single wait in seconds.
+            multiplier: Growth factor of consecutive waits.
+            jitter: Fraction (0-1) of each wait that is randomized.
+            deadline: Maximum total time in seconds, None for no limit.
+            circuit_breaker: Breaker consulted before every attempt, None to
+                disable. Defaults to the process-wide breaker.
+
+        Raises:
+            ValueError: If any of the values is out of range.
+        """
+        if max_attempts < 1 or empty_attempts < 1:
+            raise ValueError("max_attempts and empty_attempts must be positive.")
+        if base_delay < 0 or max_delay < 0 or multiplier < 1:
+            raise ValueError("Delays must be non-negative and multiplier at least 1.")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1.")
+
+        self.max_attempts = max_attempts
+        self.empty_attempts = empty_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.deadline = deadline
+        self.circuit_breaker = circuit_breaker
+
+    def replace(self, **changes) -> "RetryPolicy":
+        """Returns a copy of the policy with some values changed."""
+        values = {
+            "max_attempts": self.max_attempts,
+            "empty_attempts": self.empty_attempts,
+            "base_delay": self.base_delay,
+            "max_delay": self.max_delay,
+            "multiplier": self.multiplier,
+            "jitter": self.jitter,
+            "deadline": self.deadline,
+            "circuit_breaker": self.circuit_breaker,
+        }
+        values.update(changes)
+        return RetryPolicy(**values)
+
+    def delay(self, retry: int) -> float:
+        """Wait in seconds before the given retry (0 for the first one)."""
+        delay = min(self.max_delay, self.base_delay * self.multiplier**retry)
+        return delay * (1 - self.jitter * random.random())
+
+    def start(self, label: str) -> "RetryState":
+        return RetryState(self, label)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def resolve_policy(
+    retry_policy: RetryPolicy | None, attempts: int | None = None
+) -> RetryPolicy:
+    """Returns the policy to use, with `attempts` overriding max_attempts."""
+    policy = retry_policy or DEFAULT_RETRY_POLICY
+    if attempts is not None:
+        policy = policy.replace(max_attempts=attempts)
+    return policy
+
+
+class RetryState:
+    """Tracks the attempts of a single download request under a RetryPolicy."""
+
+    def __init__(self, policy: RetryPolicy, label: str) -> None:
+        self.policy = policy
+        self.label = label
+        self.attempts = 0
+        self.empty_count = 0
+        self.error_count = 0
+        self.last_exception: Exception | None = None
+        self._started = time.monotonic()
+        self._waited = 0.0
+        self._trial = False
+
+    def check(self) -> None:
+        """
+        Call before each attempt.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker rejects the request.
+        """
+        breaker = self.policy.circuit_breaker
+        if breaker is not None:
+            admitted = breaker.admit()
+            if admitted is None:
+                raise CircuitOpenError(
+                    f"Not fetching {self.label}: circuit breaker is open after "
+                    "repeated failures."
+                ) from self.last_exception
+            self._trial = admitted == CircuitBreaker.HALF_OPEN
+        self.attempts += 1
+
+    def on_success(self) -> None:
+        """Call when a request went through, even if the data was empty."""
+        self._trial = False
+        if self.policy.circuit_breaker is not None:
+            self.policy.circuit_breaker.record_success()
+
+    def on_abort(self) -> None:
+        """
+        Call when an attempt ends without a result, e.g. when it is cancelled.
+
+        A trial request of the circuit breaker is released, so the breaker does
+        not wait forever for its outcome.
+        """
+        if self._trial and self.policy.circuit_breaker is not None:
+            self.policy.circuit_breaker.release()
+        self._trial = False
+
+    def on_empty(self) -> float | None:
+        """Returns the wait before the next attempt, or None to give up."""
+        self.empty_count += 1
+        self.last_exception = None
+        logger.debug(
+            f"Ticker {self.label} returned no data.\n"
+            f"Attempt: {self.attempts}/{self.policy.empty_attempts}"
+        )
+        if self.empty_count >= self.policy.empty_attempts:
+            return None
+        return self._next_delay()
+
+    def on_error(self, exception: Exception) -> float | None:
+        """Returns the wait before the next attempt, or None to give up."""
+        self.error_count += 1
+        self.last_exception = exception
+        logger.debug(
+            f"Exception fetching {self.label}: {exception}\n"
+            f"Attempt: {self.attempts}/{self.policy.max_attempts}"
+        )
+        if self.error_count >= self.policy.max_attempts:
+            delay = None
+        else:
+            delay = self._next_delay()
+
+        # The breaker counts failed requests, not attempts: a request counts
+        # once it is given up, a failed trial re-opens the circuit at once
+        if self.policy.circuit_breaker is not None and (delay is None or self._trial):
+            self.policy.circuit_breaker.record_failure()
+        self._trial = False
+        return delay
+
+    def on_partial(self, exception: Exception) -> float | None:
+        """
+        Call when a multi-symbol request went through but some symbols failed.
+
+        Counts against the retry budget like `on_error`, but not against the
+        circuit breaker: the upstream answered. Returns the wait before the
+        failed symbols are requested again, or None to give up.
+        """
+        self.error_count += 1
+        self.last_exception = exception
+        logger.debug(
+            f"Exception fetching part of {self.label}: {exception}\n"
+            f"Attempt: {self.attempts}/{self.policy.max_attempts}"
+        )
+        if self.error_count >= self.policy.max_attempts:
+            return None
+        return self._next_delay()
+
+    def _next_delay(self) -> float | None:
+        if self.attempts >= self.policy.max_attempts:
+            return None
+        delay = self.policy.delay(self.attempts - 1)
+        deadline = self.policy.deadline
+        elapsed = max(time.monotonic() - self._started, self._waited)
+        if deadline is not None and elapsed + delay > deadline:
+            logger.debug(f"Retry deadline of {deadline}s reached for {self.label}")
+            return None
+        self._waited += delay
+        logger.debug(f"Retrying {self.label} in {delay:.2f}s...")
+        return delay
+
+    def error(self, period: str | None) -> FinFetcherError:
+        """Builds the error raised once the request is given up."""
+        if self.last_exception is not None:
+            error: FinFetcherError = YFinanceConnectionError(
+                f"Failed to download data for {self.label} "
+                f"after {self.attempts} attempts."
+            )
+            error.__cause__ = self.last_exception
+            return error
+        return DataEmptyError(
+            f"No historical data found for symbol '{self.label}' (period={period})."
+        )
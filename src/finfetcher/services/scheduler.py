@@ -0,0 +1,253 @@
+import logging
+import threading
+from collections.abc import Callable
+from datetime import date, datetime, timezone
+from typing import Any, NamedTuple
+
+from ..calendars import ExchangeCalendar, next_cutoff, session_calendar
+from ..cutoffs import CutoffResolver, ResolvedCutoff
+from ..exceptions import FinFetcherError
+from .fetch_batch import fetch_many
+from .metadata import MetadataCache, default_metadata_cache, resolve_many
+from .metrics import FetchObserver, observing, record_error
+from .providers import DataProvider
+from .retry import RetryPolicy
+from .store import OHLCVStore
+
+logger = logging.getLogger(__name__)
+
+Sink = Callable[[str, Any, date], Any]
+
+# Wait in seconds before retrying metadata when no symbol could be scheduled
+METADATA_RETRY_DELAY = 15 * 60.0
+
+
+class ScheduledFetch(NamedTuple):
+    """Next wake-up of one exchange group."""
+
+    when: datetime
+    tz_name: str
+    symbols: tuple[str, ...]
+
+
+class _Group:
+    def __init__(
+        self, cutoff: ResolvedCutoff, calendar: ExchangeCalendar, due: datetime
+    ) -> None:
+        self.cutoff = cutoff
+        self.calendar = calendar
+        self.due = due
+        self.symbols: list[str] = []
+
+
+class FetchScheduler:
+    """
+    Fetches a multi-exchange universe as each market closes.
+
+    Symbols are grouped by exchange, i.e. by their resolved cutoff and session
+    calendar. The scheduler sleeps until the earliest group cutoff, fetches
+    only that group through the batched path (`fetch_many`) and passes every
+    completed frame to `sink`. Time is read from an injectable clock, so
+    schedules can be tested offline.
+    """
+
+    def __init__(
+        self,
+        symbols: list[str],
+        sink: Sink | Any,
+        period: str = "5d",
+        interval: str = "1d",
+        custom_cutoffs: dict | None = None,
+        chunk_size: int = 100,
+        store: OHLCVStore | None = None,
+        metadata_cache: MetadataCache | None = None,
+        retry_policy: RetryPolicy | None = None,
+        index_type: str = "date",
+        output: str = "pandas",
+        on_error: Callable[[str, FinFetcherError], Any] | None = None,
+        clock: Callable[[], datetime] | None = None,
+        sleep: Callable[[float], Any] | None = None,
+        provider: DataProvider | None = None,
+        observer: FetchObserver | None = None,
+    ) -> None:
+        """
+        Args:
+            symbols: Ticker symbols to keep up to date.
+            sink: Called as `sink(symbol, data, target_date)` for every fetched
+                symbol, or a queue whose `put` receives that tuple.
+            period: Data period fetched at each cutoff (default: "5d").
+            interval: Data interval (default: "1d").
+            custom_cutoffs: Overrides of MARKET_CUTOFFS, as for DataFetcher.
+            chunk_size: Maximum number of symbols per download request.
+            store: Local on-disk store of daily bars.
+            metadata_cache: Cache of asset types and timezones. Defaults to
+                the process-wide in-memory cache.
+            retry_policy: Backoff, retry budget and circuit breaker.
+            index_type: "date", "datetime" or "period"; see DataFetcher.
+            output: "pandas", "compact", "arrow" or "numpy"; see DataFetcher.
+            on_error: Called as `on_error(symbol, error)` for failed symbols.
+            clock: Function returning the current timezone-aware time.
+            sleep: Function used to wait, in seconds. Defaults to waiting on
+                the stop event, so `stop` interrupts it.
+            provider: Data provider for metadata and downloads. Defaults to
+                the process-wide provider.
+            observer: Receives per-phase timings, attempts and errors, e.g. a
+                MetricsCollector. Defaults to the process-wide observer, if any.
+
+        Raises:
+            TypeError: If custom_cutoffs or its internal structure has invalid types.
+            ValueError: If custom_cutoffs has missing required keys or invalid values.
+        """
+        self.symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        self.sink = sink
+        self.period = period
+        self.interval = interval
+        self.config = CutoffResolver.from_custom(custom_cutoffs)
+        self.chunk_size = chunk_size
+        self.store = store
+        self.metadata_cache = (
+            metadata_cache if metadata_cache is not None else default_metadata_cache
+        )
+        self.retry_policy = retry_policy
+        self.index_type = index_type
+        self.output = output
+        self.on_error = on_error
+        self.provider = provider
+        self.observer = observer
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._stop = threading.Event()
+        self._sleep = sleep or self._stop.wait
+        self._groups: dict[tuple, _Group] | None = None
+        self._unresolved: list[str] = []
+
+    def _add_symbols(self, symbols: list[str]) -> None:
+        # Symbols whose metadata fails stay pending and are retried later
+        with observing(self.observer):
+            meta, errors = resolve_many(
+                symbols, self.metadata_cache, provider=self.provider
+            )
+            for symbol, error in errors.items():
+                self._report(symbol, error)
+        self._unresolved = [s for s in symbols if s not in meta]
+
+        groups = self._get_groups()
+        now = self._clock()
+        for symbol in symbols:
+            if symbol not in meta:
+                continue
+            asset_type, tz_name = meta[symbol]
+            cutoff = self.config.resolve(asset_type, tz_name)
+            calendar = session_calendar(asset_type, cutoff)
+            key = (cutoff.tz_name, cutoff.hour, cutoff.minute, calendar.name)
+            group = groups.get(key)
+            if group is None:
+                due = next_cutoff(cutoff, calendar, now)
+                group = groups[key] = _Group(cutoff, calendar, due)
+            group.symbols.append(symbol)
+
+    def _get_groups(self) -> dict[tuple, _Group]:
+        # Metadata is resolved on first use, not in __init__
+        if self._groups is None:
+            self._groups = {}
+            self._add_symbols(self.symbols)
+        return self._groups
+
+    def schedule(self) -> list[ScheduledFetch]:
+        """Returns the next wake-up of every exchange group, earliest first."""
+        return sorted(
+            ScheduledFetch(g.due, g.cutoff.tz_name, tuple(g.symbols))
+            for g in self._get_groups().values()
+        )
+
+    def run_pending(self) -> int:
+        """
+        Fetches every group whose cutoff has passed and schedules its next one.
+
+        Symbols whose metadata could not be resolved are retried first.
+
+        Returns:
+            The number of groups fetched.
+        """
+        if self._groups is not None and self._unresolved:
+            self._add_symbols(self._unresolved)
+        now = self._clock()
+        fetched = 0
+        due = [g for g in self._get_groups().values() if g.due <= now]
+        for group in sorted(due, key=lambda g: g.due):
+            self._fetch(group)
+            group.due = next_cutoff(group.cutoff, group.calendar, max(now, group.due))
+            fetched += 1
+        return fetched
+
+    def run(self, max_runs: int | None = None) -> None:
+        """
+        Sleeps until each group's cutoff and fetches it, until `stop` is called
+        or `max_runs` groups have been fetched. A `stop` issued before `run`
+        makes it return at once.
+        """
+        runs = 0
+        while not self._stop.is_set():
+            pending = [g.due for g in self._get_groups().values()]
+            if not pending:
+                if not self._unresolved:
+                    logger.warning("Nothing to schedule, scheduler stopped")
+                    return
+                logger.warning(
+                    f"No symbol could be scheduled, retrying metadata "
+                    f"in {METADATA_RETRY_DELAY:.0f}s"
+                )
+                self._sleep(METADATA_RETRY_DELAY)
+                if not self._stop.is_set():
+                    self._add_symbols(self._unresolved)
+                continue
+            delay = (min(pending) - self._clock()).total_seconds()
+            if delay > 0:
+                logger.debug(f"Sleeping {delay:.0f}s until the next cutoff")
+                self._sleep(delay)
+                continue
+            runs += self.run_pending()
+            if max_runs is not None and runs >= max_runs:
+                return
+        # The stop request is consumed, so the scheduler can be run again
+        self._stop.clear()
+
+    def stop(self) -> None:
+        """Stops `run`, or the next run if none is active (also from another thread)."""
+        self._stop.set()
+
+    def _fetch(self, group: _Group) -> None:
+        logger.info(
+            f"Cutoff reached in {group.cutoff.tz_name}, "
+            f"fetching {len(group.symbols)} symbols"
+        )
+        with observing(self.observer):
+            data, target_dates, errors = fetch_many(
+                group.symbols,
+                period=self.period,
+                interval=self.interval,
+                chunk_size=self.chunk_size,
+                market_config=self.config,
+                store=self.store,
+                metadata_cache=self.metadata_cache,
+                retry_policy=self.retry_policy,
+                index_type=self.index_type,
+                output=self.output,
+                provider=self.provider,
+            )
+            for symbol, frame in data.items():
+                self._emit(symbol, frame, target_dates[symbol])
+            for symbol, error in errors.items():
+                self._report(symbol, error)
+
+    def _emit(self, symbol: str, data: Any, target_date: date) -> None:
+        put = getattr(self.sink, "put", None)
+        if put is not None:
+            put((symbol, data, target_date))
+        else:
+            self.sink(symbol, data, target_date)
+
+    def _report(self, symbol: str, error: FinFetcherError) -> None:
+        logger.error(f"Scheduled fetch failed for {symbol}: {error}")
+        record_error(symbol, error)
+        if self.on_error is not None:
+            self.on_error(symbol, error)
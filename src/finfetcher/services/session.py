@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import functools
+import importlib
+import logging
+import threading
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# "curl_cffi": browser-impersonating client yfinance uses by default,
+# "requests": plain requests with a urllib3 connection pool
+BACKENDS = ("curl_cffi", "requests")
+
+
+def _default_backend() -> str:
+    try:
+        importlib.import_module("curl_cffi")
+    except ImportError:
+        return "requests"
+    return "curl_cffi"
+
+
+@functools.lru_cache(maxsize=None)
+def _session_class(backend: str) -> type:
+    """Session class of `backend` that applies its own timeouts to every request."""
+    if backend == "curl_cffi":
+        base = importlib.import_module("curl_cffi.requests").Session
+    else:
+        base = importlib.import_module("requests").Session
+
+    class PooledSession(base):
+        # yfinance passes fixed per-call timeouts; the configured ones win
+        finfetcher_timeout: tuple[float, float] | None = None
+
+        def request(self, method, url, *args, **kwargs):
+            if self.finfetcher_timeout is not None:
+                kwargs["timeout"] = self.finfetcher_timeout
+            return super().request(method, url, *args, **kwargs)
+
+    PooledSession.__qualname__ = PooledSession.__name__ = f"Pooled{base.__name__}"
+    return PooledSession
+
+
+def make_session(
+    pool_size: int = 10,
+    connect_timeout: float = 10.0,
+    read_timeout: float = 30.0,
+    backend: str | None = None,
+) -> Any:
+    """
+    Creates a keep-alive HTTP session with a connection pool for yfinance.
+
+    Connections to Yahoo are kept open and reused by later requests, so a
+    large universe pays the TCP and TLS handshakes once per pooled connection
+    instead of once per request.
+
+    Args:
+        pool_size: Maximum number of idle connections kept open. With
+            "curl_cffi" the pool is per thread, with "requests" it is shared.
+        connect_timeout: Seconds to wait for a connection.
+        read_timeout: Seconds to wait for the response.
+        backend: "curl_cffi" (browser impersonation, as yfinance uses by
+            default) or "requests". Defaults to curl_cffi if installed.
+
+    Returns:
+        A curl_cffi or requests Session, accepted by yfinance's `session`
+        arguments.
+
+    Raises:
+        ValueError: If an argument is out of range or the backend unknown.
+        ImportError: If the backend is not installed.
+    """
+    if pool_size < 1:
+        raise ValueError("pool_size must be a positive integer.")
+    if connect_timeout <= 0 or read_timeout <= 0:
+        raise ValueError("Timeouts must be positive.")
+    backend = backend or _default_backend()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported backend '{backend}', use one of {BACKENDS}.")
+
+    cls = _session_class(backend)
+    if backend == "curl_cffi":
+        curl_opt = importlib.import_module("curl_cffi").CurlOpt
+        session = cls(
+            impersonate="chrome",
+            curl_options={curl_opt.MAXCONNECTS: pool_size},
+        )
+    else:
+        adapters = importlib.import_module("requests.adapters")
+        session = cls()
+        adapter = adapters.HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+    session.finfetcher_timeout = (connect_timeout, read_timeout)
+
+    logger.debug(f"Created {backend} session with a pool of {pool_size} connections")
+    return session
+
+
+_session: Any = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> Any:
+    """
+    Returns the process-wide HTTP session every yfinance request uses.
+
+    Created with `make_session()` defaults on first use unless one was set.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = make_session()
+    return _session
+
+
+def set_session(session: Any) -> Any:
+    """
+    Replaces the process-wide session and returns the previous one.
+
+    Pass a session from `make_session` (or any curl_cffi or requests Session),
+    or None to create a default one on next use.
+    """
+    global _session
+    with _session_lock:
+        previous, _session = _session, session
+    return previous
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import re
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .memory_cache import CacheKey, FetchCache, Result
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+
+# Joins the parts of a key in file names; never produced by _safe_name, so
+# one symbol's prefix cannot match another symbol (e.g. BRK and BRK_B)
+_KEY_SEP = "+"
+
+
+def _safe_name(part: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._=^-]", "_", part)
+
+
+def _try_lock(fd: int) -> bool:
+    """Takes an exclusive lock on an open file without blocking."""
+    try:
+        if sys.platform == "win32":
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd: int) -> None:
+    if sys.platform == "win32":
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class SharedFetchCache(FetchCache):
+    """
+    FetchCache shared by all processes on a host through a local directory.
+
+    Results are written to one file per (symbol, period, interval) and reused
+    by every process until their expiry (the symbol's next market cutoff), so
+    many workers fetching the same popular symbols download each of them once
+    per cutoff window. A per-key file lock is held while downloading: other
+    processes wait for it and read the result instead of downloading too.
+
+    Entries are written to a temporary file and renamed into place, so readers
+    never see a partial write. Locks are released by the operating system
+    when their holder exits, so a worker dying mid-download only makes the
+    next waiter download instead. Within a process the entries are also kept
+    in memory and concurrent requests coalesced, as in FetchCache.
+
+    Entries are pickled: only point it at a directory you trust.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        maxsize: int = 1024,
+        lock_timeout: float = 300.0,
+        poll_interval: float = 0.05,
+        clock: Callable[[], datetime] | None = None,
+    ) -> None:
+        """
+        Args:
+            directory: Directory shared by the processes (created if missing).
+            maxsize: Maximum number of entries kept in memory per process.
+            lock_timeout: Seconds to wait for another process's download
+                before downloading anyway.
+            poll_interval: Seconds between attempts to take a held lock.
+            clock: Function returning the current timezone-aware time.
+
+        Raises:
+            ValueError: If lock_timeout or poll_interval is not positive.
+        """
+        if lock_timeout <= 0 or poll_interval <= 0:
+            raise ValueError("lock_timeout and poll_interval must be positive.")
+
+        super().__init__(maxsize=maxsize, clock=clock)
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.shared_hits = 0
+        self.waited = 0
+        self.downloads = 0
+
+    def path(self, key: CacheKey) -> Path:
+        name = _KEY_SEP.join(_safe_name(part) for part in key)
+        return self.directory / f"{name}.pkl"
+
+    def _read(self, path: Path) -> tuple[Result, datetime] | None:
+        """The stored result and its expiry, or None if missing or expired."""
+        try:
+            with open(path, "rb") as f:
+                result, expiry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+        if self._clock() >= expiry:
+            return None
+        return result, expiry
+
+    def _write(self, path: Path, result: Result, expiry: datetime) -> None:
+        # Unique per writer: a crashed writer's leftover never collides
+        tmp_path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump((result, expiry), f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    @contextmanager
+    def _locked(self, path: Path) -> Iterator[bool]:
+        """
+        Holds the key's file lock. Yields whether it was free at once; gives
+        up waiting (and yields without the lock) after `lock_timeout`.
+        """
+        lock_path = path.with_name(path.name + ".lock")
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            locked = _try_lock(fd)
+            free = locked
+            deadline = time.monotonic() + self.lock_timeout
+            while not locked and time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                locked = _try_lock(fd)
+            if not locked:
+                logger.warning(
+                    f"Timed out waiting for the lock on {lock_path}, fetching anyway"
+                )
+            try:
+                yield free
+            finally:
+                if locked:
+                    _unlock(fd)
+        finally:
+            os.close(fd)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _load_or_fetch(
+        self,
+        key: CacheKey,
+        fetch: Callable[[], Result],
+        expires: Callable[[], datetime | None],
+    ) -> tuple[Result, datetime | None]:
+        path = self.path(key)
+        entry = self._read(path)
+        if entry is not None:
+            self._count("shared_hits")
+            return entry
+
+        with self._locked(path) as free:
+            if not free:
+                self._count("waited")
+                logger.debug(f"Waited for another process fetching {key}")
+            # Whoever held the lock has usually stored the result by now
+            entry = self._read(path)
+            if entry is not None:
+                self._count("shared_hits")
+                return entry
+
+            result = fetch()
+            self._count("downloads")
+            expiry = expires()
+            if expiry is not None and expiry > self._clock():
+                try:
+                    self._write(path, result, expiry)
+                except OSError as e:
+                    logger.warning(f"Could not store cache entry {path}: {e}")
+            return result, expiry
+
+    def get_or_fetch(
+        self,
+        key: CacheKey,
+        fetch: Callable[[], Result],
+        expires: Callable[[], datetime | None],
+    ) -> Result:
+        """
+        Returns the result for `key` from memory or the shared directory, or
+        calls `fetch` once on the whole host and stores its result until
+        `expires()`.
+        """
+        expiry: list[datetime | None] = [None]
+
+        def shared_fetch() -> Result:
+            result, expiry[0] = self._load_or_fetch(key, fetch, expires)
+            return result
+
+        return super().get_or_fetch(key, shared_fetch, lambda: expiry[0])
+
+    def invalidate(self, symbol: str | None = None) -> None:
+        """Drops the entries of `symbol`, or all entries, in every process."""
+        super().invalidate(symbol)
+        if symbol is None:
+            pattern = "*.pkl"
+        else:
+            pattern = f"{_safe_name(symbol.upper())}{_KEY_SEP}*.pkl"
+        for path in self.directory.glob(pattern):
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> dict[str, Any]:
+        stats = super().stats()
+        stats.update(
+            shared_hits=self.shared_hits, waited=self.waited, downloads=self.downloads
+        )
+        return stats
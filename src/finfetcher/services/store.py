@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import logging
+import re
+from collections.abc import Callable, Mapping
+from datetime import date, datetime, timedelta, tzinfo
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_import
+from ..calendars import (
+    ExchangeCalendar,
+    next_cutoff,
+    session_calendar,
+    session_cutoff,
+)
+from ..cutoffs import CutoffResolver
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+# Only daily bars are stored: the unfinished-candle cutoff is defined per day
+CACHEABLE_INTERVALS = ("1d",)
+
+# Weekends and holidays: a cache starting a few days after the period start
+# still covers it
+COVERAGE_TOLERANCE = timedelta(days=7)
+
+# Stored bars re-downloaded by raw top-ups and compared with upstream data
+RAW_OVERLAP = timedelta(days=7)
+
+_PERIOD_RE = re.compile(r"^(\d+)(d|wk|mo|y)$")
+
+# Yahoo periods and the complete daily bars each holds with the unfinished
+# candle, weekends and the usual holidays removed. Week-long closures can
+# leave fewer: callers then widen the period.
+LATEST_PERIODS = (
+    ("5d", 1),
+    ("1mo", 15),
+    ("3mo", 55),
+    ("6mo", 115),
+    ("1y", 235),
+    ("2y", 475),
+    ("5y", 1200),
+    ("10y", 2400),
+)
+
+
+def period_start(
+    period: str, today: date | None = None, calendar: ExchangeCalendar | None = None
+) -> date | None:
+    """
+    Converts a yfinance period string (e.g. "4y", "6mo", "ytd") to a start date.
+
+    Yahoo counts "Nd" periods in trading sessions: with the asset's session
+    `calendar`, the start is the first of the last N sessions up to `today`.
+    Without one, N calendar days are counted. Pass the exchange-local `today`
+    (see `exchange_today`); it defaults to the host's date.
+
+    Returns None for "max" or an unrecognized period.
+    """
+    today = today or date.today()
+
+    if period == "ytd":
+        return date(today.year, 1, 1)
+
+    match = _PERIOD_RE.match(period)
+    if not match:
+        return None
+
+    n, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        if calendar is not None and n > 0:
+            return calendar.sessions_before(today, n)[0].item()
+        return today - timedelta(days=n)
+    if unit == "wk":
+        return today - timedelta(weeks=n)
+    if unit == "mo":
+        return (pd.Timestamp(today) - pd.DateOffset(months=n)).date()
+    return (pd.Timestamp(today) - pd.DateOffset(years=n)).date()
+
+
+def latest_periods(n: int) -> list[str]:
+    """
+    Yahoo periods to try, shortest first, for the last `n` complete daily
+    bars, e.g. ["5d", "1mo", ..., "max"] for the newest bar.
+
+    Raises:
+        ValueError: If n is not positive.
+    """
+    if n < 1:
+        raise ValueError("n must be a positive integer.")
+    periods = [period for period, bars in LATEST_PERIODS if n <= bars]
+    return [*periods, "max"]
+
+
+class OHLCVStore:
+    """
+    Local on-disk store of complete OHLCV bars, one file per symbol and interval.
+
+    Only bars that passed the unfinished-candle cutoff are ever written, so a
+    stored history can be topped up by downloading just the newer dates.
+
+    By default the bars are stored adjusted, as yfinance returns them, so a
+    new dividend or split leaves the stored history stale. With `raw=True`
+    unadjusted bars are stored with their dividend and split series instead:
+    new splits are applied to the stored bars, the adjustment is recomputed
+    locally and only a conflict with upstream data causes a full download.
+    """
+
+    def __init__(
+        self, directory: str | Path, file_format: str = "parquet", raw: bool = False
+    ) -> None:
+        """
+        Args:
+            directory: Directory holding the cached files (created if missing).
+            file_format: "parquet" (requires pyarrow) or "csv".
+            raw: Store unadjusted bars with dividends and splits and adjust
+                them locally. Use a separate directory from adjusted stores.
+
+        Raises:
+            ValueError: If file_format is not supported.
+        """
+        if file_format not in ("parquet", "csv"):
+            raise ValueError(
+                f"Unsupported file_format '{file_format}', use 'parquet' or 'csv'."
+            )
+
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.file_format = file_format
+        self.raw = raw
+
+    def path(self, symbol: str, interval: str) -> Path:
+        safe_symbol = re.sub(r"[^A-Za-z0-9._=^-]", "_", symbol)
+        return self.directory / f"{safe_symbol}_{interval}.{self.file_format}"
+
+    def load(self, symbol: str, interval: str) -> pd.DataFrame | None:
+        """Returns the stored bars with a DatetimeIndex, or None if not cached."""
+        path = self.path(symbol, interval)
+        if not path.exists():
+            return None
+
+        try:
+            if self.file_format == "parquet":
+                df = pd.read_parquet(path)
+            else:
+                df = pd.read_csv(path, index_col=0)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache file {path}: {e}")
+            return None
+
+        df.index = pd.to_datetime(df.index)
+        df.index.name = None
+        return df
+
+    def save(self, symbol: str, interval: str, df: pd.DataFrame) -> None:
+        """Writes complete bars, replacing the stored file atomically."""
+        df = df.copy()
+        df.index = pd.DatetimeIndex(pd.to_datetime(df.index), name="Date")
+
+        path = self.path(symbol, interval)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        if self.file_format == "parquet":
+            df.to_parquet(tmp_path)
+        else:
+            df.to_csv(tmp_path)
+        tmp_path.replace(path)
+
+        logger.debug(f"Stored {len(df)} bars for {symbol} ({interval}) in {path}")
+
+
+def plan_top_up(
+    store: OHLCVStore | None,
+    symbol: str,
+    period: str,
+    interval: str,
+    calendar: ExchangeCalendar | None = None,
+    today: date | None = None,
+) -> tuple[pd.DataFrame | None, date | None]:
+    """
+    Decides whether a request can be served by topping up the stored history.
+    `calendar` is the symbol's session calendar and `today` the exchange-local
+    date; see `period_start`.
+
+    Returns:
+        A tuple of (cached, start). `start` is the first date to download when
+        the cache covers the requested period, otherwise None (full download).
+    """
+    if store is None or interval not in CACHEABLE_INTERVALS:
+        return None, None
+
+    cached = store.load(symbol, interval)
+    if cached is None or cached.empty:
+        return cached, None
+
+    start = period_start(period, today, calendar)
+    if start is None or cached.index[0].date() > start + COVERAGE_TOLERANCE:
+        logger.debug(f"Cached history for {symbol} does not cover period={period}")
+        # A raw download replaces the stored history instead of extending it
+        return (None if store.raw else cached), None
+
+    if store.raw:
+        # Re-download the last stored bars to check them against upstream
+        return cached, cached.index[-1].date() - RAW_OVERLAP
+    return cached, cached.index[-1].date() + timedelta(days=1)
+
+
+def market_calendar(
+    asset_type: str | None, tz_name: str | None, market_config: Mapping | None = None
+) -> ExchangeCalendar:
+    """Session calendar of an asset under the given cutoff configuration."""
+    cutoff = CutoffResolver.coerce(market_config).resolve(asset_type, tz_name)
+    return session_calendar(asset_type, cutoff)
+
+
+def exchange_today(
+    asset_type: str | None,
+    tz_name: str | None,
+    market_config: Mapping | None = None,
+    clock: Callable[[tzinfo], datetime] = datetime.now,
+) -> date:
+    """Current date at the asset's exchange, which may differ from the host's."""
+    cutoff = CutoffResolver.coerce(market_config).resolve(asset_type, tz_name)
+    return clock(cutoff.tz).date()
+
+
+def history_is_current(
+    cached: pd.DataFrame | None,
+    asset_type: str | None,
+    tz_name: str | None,
+    market_config: Mapping | None = None,
+    clock: Callable[[tzinfo], datetime] = datetime.now,
+) -> bool:
+    """
+    Whether no bar after the stored history can be complete yet, i.e. the
+    cutoff of the session following the last stored bar has not passed.
+    Topping up such a history would only download unfinished candles.
+    """
+    if cached is None or cached.empty:
+        return False
+    cutoff = CutoffResolver.coerce(market_config).resolve(asset_type, tz_name)
+    calendar = session_calendar(asset_type, cutoff)
+    last_close = session_cutoff(cutoff, calendar, cached.index[-1].date())
+    return clock(cutoff.tz) < next_cutoff(cutoff, calendar, last_close)
+
+
+def merge_bars(cached: pd.DataFrame | None, new: pd.DataFrame) -> pd.DataFrame:
+    """Appends new bars to cached ones, newer values winning on overlap."""
+    if cached is None or cached.empty:
+        return new
+    if new.empty:
+        return cached
+
+    new = new.copy()
+    new.index = pd.to_datetime(new.index)
+    merged = pd.concat([cached, new])
+    return merged[~merged.index.duplicated(keep="last")].sort_index()
+
+
+def trim_to_period(
+    df: pd.DataFrame,
+    period: str,
+    calendar: ExchangeCalendar | None = None,
+    today: date | None = None,
+) -> pd.DataFrame:
+    """
+    Drops rows older than the start of the requested period, counting "Nd"
+    periods in sessions of `calendar` if given, back from the exchange-local
+    `today`; see `period_start`.
+    """
+    start = period_start(period, today, calendar)
+    if start is None or df.empty:
+        return df
+    return df[pd.to_datetime(df.index) >= pd.Timestamp(start)]
+
+
+def persist(
+    store: OHLCVStore | None,
+    symbol: str,
+    period: str,
+    interval: str,
+    data: pd.DataFrame,
+    calendar: ExchangeCalendar | None = None,
+    today: date | None = None,
+) -> pd.DataFrame:
+    """
+    Writes cleaned (complete-only) bars back to the store and returns them
+    trimmed to the requested period (in sessions of `calendar`, if given, up
+    to the exchange-local `today`).
+    """
+    if store is None or interval not in CACHEABLE_INTERVALS:
+        return data
+
+    store.save(symbol, interval, data)
+    return trim_to_period(data, period, calendar, today)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from .._lazy import lazy_import
+from ..exceptions import DataEmptyError
+from .fetch_data import download
+from .providers import DataProvider
+from .retry import RetryPolicy, resolve_policy
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+# interval -> (largest span of one request, oldest data Yahoo serves), in days
+INTRADAY_LIMITS = {
+    "1m": (7, 30),
+    "2m": (60, 60),
+    "5m": (60, 60),
+    "15m": (60, 60),
+    "30m": (60, 60),
+    "60m": (730, 730),
+    "90m": (60, 60),
+    "1h": (730, 730),
+}
+
+Window = tuple[datetime, datetime]
+
+
+def bar_length(interval: str) -> timedelta:
+    """Length of one intraday bar, e.g. "5m" -> 5 minutes."""
+    if interval not in INTRADAY_LIMITS:
+        raise ValueError(
+            f"Unsupported intraday interval '{interval}', "
+            f"use one of {tuple(INTRADAY_LIMITS)}."
+        )
+    if interval.endswith("h"):
+        return timedelta(hours=int(interval[:-1]))
+    return timedelta(minutes=int(interval[:-1]))
+
+
+def _as_utc(value: datetime | str) -> datetime:
+    ts = pd.Timestamp(value)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return ts.to_pydatetime()
+
+
+def plan_windows(
+    start: datetime | str,
+    end: datetime | str | None,
+    interval: str,
+    now: datetime | None = None,
+) -> list[Window]:
+    """
+    Splits [start, end) into the largest request windows allowed for `interval`.
+
+    Starts older than Yahoo's lookback limit are moved forward with a warning.
+    Naive datetimes are UTC.
+
+    Raises:
+        ValueError: If the interval is not intraday or the span is empty.
+    """
+    bar_length(interval)
+    window_days, lookback_days = INTRADAY_LIMITS[interval]
+    now = _as_utc(now or datetime.now(timezone.utc))
+    start_utc = _as_utc(start)
+    end_utc = min(_as_utc(end), now) if end is not None else now
+
+    # One day of margin: Yahoo counts the limit from its own clock
+    oldest = now - timedelta(days=lookback_days) + timedelta(days=1)
+    if start_utc < oldest:
+        logger.warning(
+            f"Yahoo serves {interval} bars for the last {lookback_days} days only, "
+            f"starting at {oldest:%Y-%m-%d %H:%M} instead of {start_utc:%Y-%m-%d %H:%M}"
+        )
+        start_utc = oldest
+    if start_utc >= end_utc:
+        raise ValueError(f"Empty range: start {start_utc} is not before {end_utc}.")
+
+    windows = []
+    step = timedelta(days=window_days)
+    window_start = start_utc
+    while window_start < end_utc:
+        window_end = min(window_start + step, end_utc)
+        windows.append((window_start, window_end))
+        window_start = window_end
+    return windows
+
+
+def drop_unfinished_bar(
+    df: pd.DataFrame, interval: str, now: datetime | None = None
+) -> pd.DataFrame:
+    """Removes the last bar if it is still forming at `now`."""
+    if df.empty:
+        return df
+    now = _as_utc(now or datetime.now(timezone.utc))
+    last = pd.Timestamp(df.index[-1])
+    last = last.tz_localize("UTC") if last.tzinfo is None else last
+    if last + bar_length(interval) > now:
+        logger.debug(f"Removed unfinished {interval} bar {last}")
+        return df.iloc[:-1]
+    return df
+
+
+def stitch(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenates window frames in time order, dropping overlapping bars."""
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    merged = pd.concat(frames)
+    merged = merged[~merged.index.duplicated(keep="last")]
+    return merged.sort_index()
+
+
+def fetch_range(
+    symbol: str,
+    start: datetime | str,
+    end: datetime | str | None = None,
+    interval: str = "1h",
+    max_workers: int = 4,
+    retry_policy: RetryPolicy | None = None,
+    now: datetime | None = None,
+    provider: DataProvider | None = None,
+) -> pd.DataFrame:
+    """
+    Downloads a long intraday history as concurrent windowed requests.
+
+    The span is split with `plan_windows`, windows are fetched by a worker
+    pool (every request still goes through the rate limiter) and stitched
+    into one de-duplicated frame. The unfinished bar is removed from the
+    final window only.
+
+    Returns:
+        A DataFrame with the exchange-timezone DatetimeIndex yfinance returns.
+
+    Raises:
+        ValueError: If the interval is not intraday or the span is empty.
+        DataEmptyError: If no window returned data.
+        YFinanceConnectionError: If connection fails after retries.
+        CircuitOpenError: If the circuit breaker is open.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be a positive integer.")
+    windows = plan_windows(start, end, interval, now=now)
+    retry_policy = resolve_policy(retry_policy)
+
+    def fetch_window(window: Window) -> pd.DataFrame:
+        df = download(
+            symbol,
+            period=None,
+            interval=interval,
+            retry_policy=retry_policy,
+            allow_empty=True,
+            start=window[0],
+            end=window[1],
+            provider=provider,
+        )
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.droplevel(1)
+        return df
+
+    logger.debug(f"Fetching {symbol} {interval} in {len(windows)} windows")
+    # Each window runs in a copy of the caller's context (e.g. its observer)
+    contexts = [contextvars.copy_context() for _ in windows]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(windows))) as pool:
+        frames = list(pool.map(lambda c, w: c.run(fetch_window, w), contexts, windows))
+
+    frames[-1] = drop_unfinished_bar(frames[-1], interval, now=now)
+    data = stitch(frames)
+    if data.empty:
+        raise DataEmptyError(
+            f"No {interval} data found for symbol '{symbol}' "
+            f"between {windows[0][0]} and {windows[-1][1]}."
+        )
+
+    logger.info(
+        f"Fetched {len(data)} {interval} bars for {symbol} in {len(windows)} requests"
+    )
+    return data
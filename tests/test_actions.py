@@ -0,0 +1,168 @@
+import tempfile
+import unittest
+from datetime import date, datetime, time
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from finfetcher.services.actions import adjust_prices, reconcile
+from finfetcher.services.fetch_batch import fetch_many
+from finfetcher.services.fetch_data import fetch_data
+from finfetcher.services.store import RAW_OVERLAP, OHLCVStore
+
+
+def make_raw(dates, close=None) -> pd.DataFrame:
+    n = len(dates)
+    close = [float(c) for c in (close or range(10, 10 + n))]
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "Close": close,
+            "Volume": [100.0] * n,
+            "Dividends": [0.0] * n,
+            "Stock Splits": [0.0] * n,
+        },
+        index=pd.DatetimeIndex(dates),
+    )
+
+
+def mock_now(hour, minute=0):
+    """datetime.now(tz) returning today at the given local time."""
+    return lambda tz=None: tz.localize(
+        datetime.combine(date.today(), time(hour, minute))
+    )
+
+
+class TestActions(unittest.TestCase):
+    def test_adjust_prices(self):
+        raw = make_raw(pd.date_range("2024-01-01", periods=4), [10, 20, 19, 40])
+        raw.loc[raw.index[2], "Dividends"] = 2.0
+
+        adjusted = adjust_prices(raw)
+
+        # 1 - 2 / 20 before the ex-date, unchanged from it on
+        self.assertEqual(list(adjusted["Close"]), [9.0, 18.0, 19.0, 40.0])
+        self.assertEqual(list(adjusted["Volume"]), [100.0] * 4)
+        self.assertNotIn("Dividends", adjusted)
+        self.assertNotIn("Stock Splits", adjusted)
+
+    def test_reconcile_new_split(self):
+        dates = pd.date_range("2024-01-01", periods=6)
+        cached = make_raw(dates[:4], [20, 22, 24, 26])
+        new = make_raw(dates[2:], [12, 13, 14, 15])
+        new.loc[dates[4], "Stock Splits"] = 2.0
+
+        merged = reconcile(cached, new)
+
+        assert merged is not None
+        self.assertEqual(list(merged["Close"]), [10, 11, 12, 13, 14, 15])
+        self.assertEqual(merged["Volume"].iloc[0], 200.0)
+        self.assertEqual(merged["Stock Splits"].iloc[4], 2.0)
+
+    def test_reconcile_conflicts(self):
+        dates = pd.date_range("2024-01-01", periods=6)
+        cached = make_raw(dates[:4])
+
+        # A new dividend only appends bars
+        new = make_raw(dates[2:], [12, 13, 14, 15])
+        new.loc[dates[5], "Dividends"] = 0.5
+        merged = reconcile(cached, new)
+        assert merged is not None
+        self.assertEqual(len(merged), 6)
+
+        # A revised bar or a late action needs a full download
+        revised = make_raw(dates[2:], [12, 13.5, 14, 15])
+        self.assertIsNone(reconcile(cached, revised))
+        late = make_raw(dates[2:], [12, 13, 14, 15])
+        late.loc[dates[3], "Dividends"] = 0.5
+        self.assertIsNone(reconcile(cached, late))
+        self.assertIsNone(reconcile(cached.drop(columns="Dividends"), new))
+
+
+@patch("finfetcher.services.fetch_data.datetime")
+@patch("finfetcher.services.providers.yf_download")
+class TestRawStore(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = OHLCVStore(tmp.name, file_format="csv", raw=True)
+
+        self.ticker = MagicMock()
+        # 24/7 asset, so there is a bar for today whatever the weekday
+        self.ticker.fast_info = {"quoteType": "CRYPTOCURRENCY", "timezone": "UTC"}
+        self.dates = pd.date_range(end=pd.Timestamp(date.today()), periods=40)
+        self.upstream = make_raw(self.dates)
+
+    def serve(self, mock_download):
+        """Serves `self.upstream` from the requested start on."""
+
+        def download(tickers, start=None, **kwargs):
+            self.assertFalse(kwargs["auto_adjust"])
+            self.assertTrue(kwargs["actions"])
+            upstream = self.upstream.copy()
+            return upstream if start is None else upstream.loc[start:]
+
+        mock_download.side_effect = download
+
+    def fetch(self, mock_datetime, hour, minute=0):
+        mock_datetime.now.side_effect = mock_now(hour, minute)
+        return fetch_data(self.ticker, "BTC-USD", period="1mo", store=self.store)
+
+    def test_dividend_tops_up(self, mock_download, mock_datetime):
+        self.serve(mock_download)
+        self.fetch(mock_datetime, 10)
+        self.assertEqual(mock_download.call_count, 1)
+
+        # Today's bar goes ex-dividend: adjusted locally from the stored bars
+        self.upstream.loc[self.dates[-1], "Dividends"] = 4.0
+        data, _ = self.fetch(mock_datetime, 23, 59)
+
+        self.assertEqual(mock_download.call_count, 2)
+        start = (self.dates[-2] - RAW_OVERLAP).date().isoformat()
+        self.assertEqual(mock_download.call_args.kwargs["start"], start)
+        # Previous close 48: factor 1 - 4 / 48
+        self.assertAlmostEqual(data["Close"].iloc[-2], 48 * (1 - 4 / 48))
+        self.assertEqual(data["Close"].iloc[-1], 49.0)
+        self.assertNotIn("Dividends", data)
+
+        stored = self.store.load("BTC-USD", "1d")
+        assert stored is not None
+        self.assertEqual(stored["Close"].iloc[-2], 48.0)
+        self.assertEqual(stored["Dividends"].iloc[-1], 4.0)
+
+    def test_conflict_downloads_in_full(self, mock_download, mock_datetime):
+        self.serve(mock_download)
+        self.fetch(mock_datetime, 10)
+
+        # Upstream revised a stored bar
+        self.upstream.loc[self.dates[-4], "Close"] = 99.0
+        with self.assertLogs("finfetcher.services.fetch_data", "INFO"):
+            data, _ = self.fetch(mock_datetime, 23, 59)
+
+        self.assertEqual(mock_download.call_count, 3)
+        self.assertEqual(mock_download.call_args.kwargs["period"], "1mo")
+        self.assertEqual(data["Close"].iloc[-4], 99.0)
+        stored = self.store.load("BTC-USD", "1d")
+        assert stored is not None
+        self.assertEqual(stored["Close"].iloc[-4], 99.0)
+
+    @patch("finfetcher.services.metadata.yf.Ticker")
+    def test_batch_conflict(self, mock_ticker_cls, mock_download, mock_datetime):
+        mock_ticker_cls.return_value = self.ticker
+        self.serve(mock_download)
+        mock_datetime.now.side_effect = mock_now(23, 59)
+        # Stored history ends days ago, so the batch tops it up
+        self.upstream = make_raw(self.dates[:-3])
+        fetch_many(["BTC-USD"], period="1mo", store=self.store)
+
+        self.upstream = make_raw(self.dates)
+        self.upstream.loc[self.dates[-4], "Close"] = 99.0
+        data, _, errors = fetch_many(["BTC-USD"], period="1mo", store=self.store)
+
+        self.assertEqual(errors, {})
+        self.assertEqual(mock_download.call_count, 3)
+        self.assertEqual(data["BTC-USD"]["Close"].iloc[-4], 99.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
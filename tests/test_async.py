@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import pandas as pd
+
+from finfetcher import AsyncDataFetcher, MetadataCache
+from finfetcher.exceptions import YFinanceConnectionError
+from finfetcher.services.fetch_async import adownload
+from finfetcher.services.rate_limit import RateLimiter, set_rate_limiter
+from finfetcher.services.retry import CircuitBreaker, RetryPolicy
+
+
+def make_frame() -> pd.DataFrame:
+    index = pd.to_datetime(["2023-10-25", "2023-10-26"])
+    return pd.DataFrame({"Close": [1.0, 2.0]}, index=index)
+
+
+class TestAsyncDataFetcher(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # Pre-filled metadata, so no yfinance lookups are made
+        self.cache = MetadataCache()
+        for symbol in ["AAPL", "MSFT", "SAP.DE", "BAD"]:
+            self.cache.set(symbol, "EQUITY", "America/New_York")
+
+    @patch("finfetcher.services.providers.yf_download")
+    async def test_aget_many_bounded_concurrency(self, mock_download):
+        """No more than max_concurrency downloads run at the same time."""
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+
+        def slow_download(symbol, **kwargs):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            if symbol == "BAD":
+                return pd.DataFrame()
+            return make_frame()
+
+        mock_download.side_effect = slow_download
+
+        fetcher = AsyncDataFetcher(max_concurrency=2, metadata_cache=self.cache)
+        with patch(
+            "finfetcher.services.fetch_async.asyncio.sleep", new=AsyncMock()
+        ) as mock_sleep:
+            data, target_dates, errors = await fetcher.aget_many(
+                ["aapl", "msft", "sap.de", "bad"], period="1mo"
+            )
+
+        self.assertEqual(set(data), {"AAPL", "MSFT", "SAP.DE"})
+        self.assertEqual(set(errors), {"BAD"})
+        self.assertEqual(active["max"], 2)
+        # Empty responses were retried with asyncio.sleep, not time.sleep
+        self.assertTrue(mock_sleep.await_count > 0)
+
+    @patch("finfetcher.services.providers.yf_download")
+    async def test_timeout(self, mock_download):
+        """A request exceeding the timeout raises YFinanceConnectionError."""
+        mock_download.side_effect = lambda *args, **kwargs: (
+            time.sleep(0.2) or make_frame()
+        )
+
+        fetcher = AsyncDataFetcher(timeout=0.01, metadata_cache=self.cache)
+        with self.assertRaises(YFinanceConnectionError):
+            await fetcher.aget_data("AAPL")
+
+    @patch("finfetcher.services.providers.yf_download")
+    async def test_cancellation_releases_slot(self, mock_download):
+        """Cancelling a pending request frees its concurrency slot."""
+        mock_download.side_effect = lambda *args, **kwargs: (
+            time.sleep(0.1) or make_frame()
+        )
+
+        fetcher = AsyncDataFetcher(max_concurrency=1, metadata_cache=self.cache)
+        task = asyncio.create_task(fetcher.aget_data("AAPL"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        data, _ = await asyncio.wait_for(fetcher.aget_data("MSFT"), timeout=1)
+        self.assertEqual(len(data), 2)
+
+    @patch("finfetcher.services.providers.yf_download")
+    async def test_cancelled_trial_releases_breaker(self, mock_download):
+        """A cancelled half-open trial does not leave the circuit stuck."""
+        previous = set_rate_limiter(RateLimiter(rate=1000, max_rate=1000))
+        self.addCleanup(set_rate_limiter, previous)
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        policy = RetryPolicy(max_attempts=1, circuit_breaker=breaker)
+        responses = iter(["error", "slow", "ok"])
+
+        def download(*args, **kwargs):
+            response = next(responses)
+            if response == "error":
+                raise ConnectionError("down")
+            if response == "slow":
+                time.sleep(0.2)
+            return make_frame()
+
+        mock_download.side_effect = download
+
+        with self.assertRaises(YFinanceConnectionError):
+            await adownload("AAPL", retry_policy=policy)
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+        # The trial is cancelled before the upstream answers
+        with self.assertRaises(TimeoutError):
+            await asyncio.wait_for(adownload("AAPL", retry_policy=policy), 0.01)
+
+        df = await adownload("AAPL", retry_policy=policy)
+        self.assertEqual(len(df), 2)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
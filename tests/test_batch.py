@@ -0,0 +1,148 @@
+import unittest
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from finfetcher import MultiFetcher
+from finfetcher.exceptions import (
+    DataEmptyError,
+    TickerNotFoundError,
+    YFinanceConnectionError,
+)
+from finfetcher.services.fetch_batch import fetch_many, split_by_symbol
+from finfetcher.services.rate_limit import RateLimiter, set_rate_limiter
+from finfetcher.services.retry import CircuitBreaker, RetryPolicy
+
+
+def make_multi_frame() -> pd.DataFrame:
+    """Multi-ticker frame as returned by yf.download(group_by="ticker")."""
+    index = pd.to_datetime(["2023-10-25", "2023-10-26", "2023-10-27"])
+    columns = pd.MultiIndex.from_product(
+        [["AAPL", "BTC-USD"], ["Open", "Close"]], names=["Ticker", "Price"]
+    )
+    df = pd.DataFrame(
+        [
+            [1.0, 2.0, 10.0, 20.0],
+            [3.0, 4.0, 30.0, 40.0],
+            [float("nan"), float("nan"), 50.0, 60.0],
+        ],
+        index=index,
+        columns=columns,
+    )
+    return df
+
+
+def mock_ticker(symbol, session=None):
+    ticker = MagicMock()
+    info = {
+        "AAPL": {"quoteType": "EQUITY", "timezone": "America/New_York"},
+        "BTC-USD": {"quoteType": "CRYPTOCURRENCY", "timezone": "UTC"},
+    }
+    if symbol in info:
+        ticker.fast_info = info[symbol]
+    else:
+        type(ticker).fast_info = property(MagicMock(side_effect=KeyError))
+        type(ticker).info = property(MagicMock(side_effect=KeyError))
+    return ticker
+
+
+class TestBatchFetch(unittest.TestCase):
+    def test_split_by_symbol_drops_foreign_rows(self):
+        """Rows where only another ticker traded must not leak into a symbol."""
+        frames = split_by_symbol(make_multi_frame(), ["AAPL", "BTC-USD", "MSFT"])
+
+        self.assertEqual(set(frames), {"AAPL", "BTC-USD"})
+        self.assertEqual(len(frames["AAPL"]), 2)
+        self.assertEqual(len(frames["BTC-USD"]), 3)
+        self.assertEqual(list(frames["AAPL"].columns), ["Open", "Close"])
+
+    @patch("finfetcher.services.fetch_data.get_complete_close")
+    @patch("finfetcher.services.providers.yf_download")
+    @patch("finfetcher.services.metadata.yf.Ticker")
+    def test_fetch_many_chunks_and_cleans_per_symbol(
+        self, mock_ticker_cls, mock_download, mock_complete
+    ):
+        """Symbols are downloaded in chunks and cleaned with their own meta."""
+        mock_ticker_cls.side_effect = mock_ticker
+        mock_download.return_value = make_multi_frame()
+        mock_complete.side_effect = lambda df, *args: df
+
+        data, target_dates, errors = fetch_many(
+            ["AAPL", "BTC-USD", "BAD"], period="1mo", chunk_size=1
+        )
+
+        # BAD fails on metadata, the rest is fetched one chunk at a time
+        self.assertEqual(mock_download.call_count, 2)
+        self.assertIsInstance(errors["BAD"], TickerNotFoundError)
+        self.assertEqual(set(data), {"AAPL", "BTC-USD"})
+
+        # Each symbol is cleaned with its own asset type and timezone
+        called_meta = {(c.args[1], c.args[3]) for c in mock_complete.call_args_list}
+        self.assertEqual(
+            called_meta, {("EQUITY", "America/New_York"), ("CRYPTOCURRENCY", "UTC")}
+        )
+
+        self.assertEqual(target_dates["AAPL"], date(2023, 10, 27))
+        self.assertEqual(target_dates["BTC-USD"], date(2023, 10, 28))
+
+    @patch("finfetcher.services.fetch_data.get_complete_close")
+    @patch("finfetcher.services.providers._ticker_history")
+    @patch("finfetcher.services.metadata.yf.Ticker")
+    def test_symbol_errors_stay_per_symbol(
+        self, mock_ticker_cls, mock_history, mock_complete
+    ):
+        """One failing symbol is retried alone and does not fail its chunk."""
+        from yfinance.exceptions import YFDataException
+
+        previous = set_rate_limiter(RateLimiter(rate=1000, max_rate=1000))
+        self.addCleanup(set_rate_limiter, previous)
+        mock_ticker_cls.return_value.fast_info = {
+            "quoteType": "EQUITY",
+            "timezone": "America/New_York",
+        }
+        mock_complete.side_effect = lambda df, *args: df
+
+        def history(symbol, session, interval, **kwargs):
+            if symbol == "BAD":
+                raise YFDataException("Unexpected response")
+            return make_multi_frame()["AAPL"].dropna()
+
+        mock_history.side_effect = history
+        breaker = CircuitBreaker()
+        policy = RetryPolicy(max_attempts=3, base_delay=0, circuit_breaker=breaker)
+
+        data, _, errors = fetch_many(
+            ["AAPL", "MSFT", "BAD"], period="1mo", retry_policy=policy
+        )
+
+        self.assertEqual(set(data), {"AAPL", "MSFT"})
+        self.assertIsInstance(errors["BAD"], YFinanceConnectionError)
+        self.assertIsInstance(errors["BAD"].__cause__, YFDataException)
+        requested = [c.args[0] for c in mock_history.call_args_list]
+        self.assertEqual(sorted(requested), ["AAPL", "BAD", "BAD", "BAD", "MSFT"])
+        # Yahoo answered: a bad symbol does not count against the breaker
+        self.assertEqual(breaker._failures, 0)
+
+    @patch("finfetcher.core.fetch_many")
+    def test_multi_fetcher_collects_errors(self, mock_fetch_many):
+        """MultiFetcher stores target dates and errors instead of raising."""
+        mock_df = pd.DataFrame({"Close": [100]}, index=[date(2023, 1, 2)])
+        error = DataEmptyError("Mocked empty")
+        mock_fetch_many.return_value = (
+            {"AAPL": mock_df},
+            {"AAPL": date(2023, 1, 3)},
+            {"MSFT": error},
+        )
+
+        fetcher = MultiFetcher(["aapl", "msft", "AAPL"])
+        result = fetcher.get_data(period="1mo")
+
+        self.assertEqual(fetcher.symbols, ["AAPL", "MSFT"])
+        pd.testing.assert_frame_equal(result["AAPL"], mock_df)
+        self.assertEqual(fetcher.target_dates, {"AAPL": date(2023, 1, 3)})
+        self.assertIs(fetcher.errors["MSFT"], error)
+
+
+if __name__ == "__main__":
+    unittest.main()
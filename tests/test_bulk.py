@@ -0,0 +1,131 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from finfetcher import BulkRunner, Checkpoint, MetadataCache, OHLCVStore, ReplayProvider
+from finfetcher.exceptions import TickerNotFoundError
+from finfetcher.services.rate_limit import RateLimiter, set_rate_limiter
+from finfetcher.services.retry import RetryPolicy
+
+
+def make_frame(dates: pd.DatetimeIndex) -> pd.DataFrame:
+    n = len(dates)
+    return pd.DataFrame(
+        {"Open": range(n), "Close": range(1, n + 1), "Volume": [100] * n},
+        index=dates,
+        dtype=float,
+    )
+
+
+class TestBulkRunner(unittest.TestCase):
+    def setUp(self):
+        previous = set_rate_limiter(RateLimiter(rate=1000, max_rate=1000))
+        self.addCleanup(set_rate_limiter, previous)
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+        self.checkpoint = self.directory / "run.jsonl"
+
+        # Old recorded bars, so every one of them is complete
+        symbols = ("BTC-USD", "ETH-USD", "SOL-USD")
+        store = OHLCVStore(self.directory, file_format="csv")
+        for symbol in symbols:
+            store.save(
+                symbol, "1d", make_frame(pd.date_range("2024-01-01", periods=60))
+            )
+        meta = {s: {"quoteType": "CRYPTOCURRENCY", "timezone": "UTC"} for s in symbols}
+        (self.directory / "meta.json").write_text(json.dumps(meta))
+        self.provider = ReplayProvider(self.directory)
+
+    def runner(self, symbols, **kwargs) -> BulkRunner:
+        return BulkRunner(
+            symbols,
+            checkpoint=self.checkpoint,
+            chunk_size=1,
+            workers=2,
+            metadata_cache=MetadataCache(),
+            retry_policy=RetryPolicy(base_delay=0, circuit_breaker=None),
+            provider=self.provider,
+            **kwargs,
+        )
+
+    def test_resumes_unfinished_and_failed(self):
+        runner = self.runner(["BTC-USD", "BAD"])
+        data = runner.run(period="1mo")
+
+        self.assertEqual(set(data), {"BTC-USD"})
+        self.assertIsInstance(runner.errors["BAD"], TickerNotFoundError)
+        journal = Checkpoint(self.checkpoint, {"period": "1mo", "interval": "1d"})
+        self.assertEqual(journal.done(), {"BTC-USD"})
+        self.assertEqual(journal.failed()["BAD"]["error_type"], "TickerNotFoundError")
+
+        # Done symbols are skipped, failed and new ones fetched
+        runner = self.runner(["BTC-USD", "BAD", "ETH-USD"])
+        data = runner.run(period="1mo")
+        self.assertEqual(runner.skipped, ["BTC-USD"])
+        self.assertEqual(runner.pending, ["BAD", "ETH-USD"])
+        self.assertEqual(set(data), {"ETH-USD"})
+
+        # Only the failures, not the never-attempted SOL-USD
+        runner = self.runner(["BTC-USD", "BAD", "ETH-USD", "SOL-USD"])
+        runner.run(period="1mo", retry_failed_only=True)
+        self.assertEqual(runner.pending, ["BAD"])
+
+        # Outcomes only hold for the parameters they were fetched with
+        with self.assertRaises(ValueError):
+            self.runner(["BTC-USD"]).run(period="1y")
+
+    def test_handler_and_torn_journal(self):
+        written = []
+
+        def handler(symbol, df):
+            if symbol == "ETH-USD":
+                raise OSError("disk full")
+            written.append((symbol, len(df)))
+
+        runner = self.runner(["BTC-USD", "ETH-USD"])
+        data = runner.run(period="1mo", handler=handler)
+
+        self.assertEqual(data, {})
+        self.assertEqual([symbol for symbol, _ in written], ["BTC-USD"])
+        self.assertGreater(written[0][1], 20)
+        self.assertIsInstance(runner.errors["ETH-USD"], OSError)
+
+        # A crash mid-write leaves a torn last line behind
+        with open(self.checkpoint, "a") as f:
+            f.write('{"symbol": "SOL-U')
+        with self.assertLogs("finfetcher.bulk", "WARNING"):
+            runner = self.runner(["BTC-USD", "ETH-USD", "SOL-USD"])
+            runner.run(period="1mo")
+        self.assertEqual(runner.pending, ["ETH-USD", "SOL-USD"])
+        self.assertEqual(runner.errors, {})
+
+        journal = Checkpoint(self.checkpoint)
+        self.assertEqual(journal.done(), {"BTC-USD", "ETH-USD", "SOL-USD"})
+
+    def test_max_failure_ratio(self):
+        symbols = ["BAD1", "BAD2", "BAD3", "BAD4", "BTC-USD"]
+        runner = self.runner(symbols, max_failure_ratio=0.5)
+        # One chunk at a time: the run stops right after the first failure
+        runner.workers = 1
+
+        runner.run(period="1mo")
+
+        self.assertTrue(runner.aborted)
+        self.assertEqual(list(runner.errors), ["BAD1"])
+        # The rest is left for a resumed run
+        runner = self.runner(symbols)
+        runner.run(period="1mo")
+        self.assertEqual(runner.pending, symbols)
+        self.assertFalse(runner.aborted)
+
+        with self.assertRaises(ValueError):
+            BulkRunner(symbols, max_failure_ratio=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
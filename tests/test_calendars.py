@@ -0,0 +1,130 @@
+import unittest
+from datetime import date, datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from finfetcher.calendars import (
+    ExchangeCalendar,
+    get_calendar,
+    register_calendar,
+)
+from finfetcher.services.fetch_data import clean_data, get_complete_close
+from finfetcher.services.market_status import market_status
+
+
+class TestExchangeCalendar(unittest.TestCase):
+    def test_nyse_holidays_and_early_closes(self):
+        nyse = get_calendar("America/New_York")
+
+        self.assertFalse(nyse.is_session(date(2026, 11, 26)))  # Thanksgiving
+        self.assertFalse(nyse.is_session(date(2026, 7, 3)))  # July 4th observed
+        self.assertFalse(nyse.is_session(date(2026, 4, 3)))  # Good Friday
+        self.assertTrue(nyse.is_session(date(2026, 11, 27)))
+        self.assertEqual(nyse.early_close(date(2026, 11, 27)), (13, 0))
+        self.assertEqual(nyse.early_close(date(2026, 12, 24)), (13, 0))
+        self.assertIsNone(nyse.early_close(date(2026, 12, 23)))
+
+    def test_next_session(self):
+        nyse = get_calendar("America/New_York")
+
+        self.assertEqual(nyse.next_session(date(2026, 11, 25)), date(2026, 11, 27))
+        self.assertEqual(nyse.next_session(date(2026, 12, 24)), date(2026, 12, 28))
+        self.assertEqual(nyse.next_session(date(2026, 12, 24), n=3), date(2026, 12, 30))
+        # Outside of the precomputed range
+        self.assertEqual(nyse.next_session(date(2060, 1, 2)), date(2060, 1, 5))
+
+        days = np.array(["2026-01-16", "2026-05-22", "2026-10-16"], "datetime64[D]")
+        expected = np.array(["2026-01-20", "2026-05-26", "2026-10-19"], "datetime64[D]")
+        np.testing.assert_array_equal(nyse.next_session(days), expected)
+
+        np.testing.assert_array_equal(
+            nyse.sessions_after(date(2026, 12, 23), 3),
+            np.array(["2026-12-24", "2026-12-28", "2026-12-29"], "datetime64[D]"),
+        )
+
+    def test_scalar_date_types(self):
+        nyse = get_calendar("America/New_York")
+        for day in (
+            date(2026, 11, 25),
+            datetime(2026, 11, 25, 23, 0),
+            pd.Timestamp("2026-11-25 23:00"),
+            "2026-11-25",
+            np.datetime64("2026-11-25"),
+        ):
+            with self.subTest(day=day):
+                self.assertEqual(nyse.next_session(day), date(2026, 11, 27))
+                self.assertTrue(nyse.is_session(day))
+
+    def test_lse_and_weekday_calendars(self):
+        lse = get_calendar("Europe/London")
+        self.assertFalse(lse.is_session(date(2026, 4, 6)))  # Easter Monday
+        self.assertEqual(lse.next_session(date(2026, 12, 24)), date(2026, 12, 29))
+
+        # Timezones without rules only skip weekends
+        tokyo = get_calendar("Asia/Tokyo")
+        self.assertEqual(tokyo.next_session(date(2026, 11, 25)), date(2026, 11, 26))
+
+    def test_configured_exchanges(self):
+        self.assertFalse(get_calendar("Europe/Berlin").is_session(date(2026, 12, 31)))
+        self.assertEqual(
+            get_calendar("Europe/Paris").early_close(date(2026, 12, 24)), (14, 5)
+        )
+        self.assertFalse(get_calendar("Europe/Zurich").is_session(date(2026, 5, 14)))
+        self.assertFalse(get_calendar("America/Toronto").is_session(date(2026, 5, 18)))
+        # Boxing Day on a Saturday moves to Monday
+        self.assertEqual(
+            get_calendar("Australia/Sydney").next_session(date(2026, 12, 24)),
+            date(2026, 12, 29),
+        )
+
+    def test_fallback_warns_once(self):
+        with self.assertLogs("finfetcher.calendars", "WARNING"):
+            get_calendar("Africa/Johannesburg")
+        with self.assertNoLogs("finfetcher.calendars", "WARNING"):
+            get_calendar("Africa/Johannesburg")
+
+    def test_register_calendar(self):
+        custom = ExchangeCalendar("Asia/Tokyo", holidays=[date(2026, 11, 3)])
+        previous = get_calendar("Asia/Tokyo")
+        register_calendar("Asia/Tokyo", custom)
+        self.addCleanup(register_calendar, "Asia/Tokyo", previous)
+
+        self.assertIs(get_calendar("Asia/Tokyo"), custom)
+        self.assertEqual(custom.next_session(date(2026, 11, 2)), date(2026, 11, 4))
+
+
+class TestCalendarIntegration(unittest.TestCase):
+    def test_target_date_skips_holidays(self):
+        df = pd.DataFrame(
+            {"Close": [1.0, 2.0]}, index=pd.to_datetime(["2026-11-24", "2026-11-25"])
+        )
+        _, target_date = clean_data(df, "AAPL", "EQUITY", "America/New_York")
+        self.assertEqual(target_date, date(2026, 11, 27))
+
+        df = pd.DataFrame({"Close": [1.0]}, index=pd.to_datetime(["2026-11-25"]))
+        _, target_date = clean_data(df, "BTC-USD", "CRYPTOCURRENCY", "UTC")
+        self.assertEqual(target_date, date(2026, 11, 26))
+
+    @patch("finfetcher.services.fetch_data.datetime")
+    def test_early_close_moves_cutoff(self, mock_datetime):
+        ny_tz = pytz.timezone("America/New_York")
+        now = ny_tz.localize(datetime(2026, 11, 27, 14, 0))
+        mock_datetime.now.return_value = now
+        df = pd.DataFrame({"Close": [1.0]}, index=[date(2026, 11, 27)])
+
+        # Regular cutoff is 16:20, the half-day closes at 13:00 (+20m delay)
+        kept = get_complete_close(df, "EQUITY", date(2026, 11, 27), "America/New_York")
+        self.assertEqual(len(kept), 1)
+
+        status = market_status({"AAPL": ("EQUITY", "America/New_York")}, now=now)
+        self.assertTrue(status.loc["AAPL", "is_complete"])
+        self.assertEqual(
+            status.loc["AAPL", "cutoff"], pd.Timestamp("2026-11-27 18:20", tz="UTC")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from finfetcher import OHLCVStore, PartitionedDataset, ReplayProvider, set_provider
+from finfetcher.cli import main, read_symbols
+from finfetcher.services.rate_limit import RateLimiter, set_rate_limiter
+
+
+def make_frame(dates: pd.DatetimeIndex) -> pd.DataFrame:
+    n = len(dates)
+    return pd.DataFrame(
+        {"Open": range(n), "Close": range(1, n + 1), "Volume": [100] * n},
+        index=dates,
+        dtype=float,
+    )
+
+
+class TestPartitionedDataset(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+
+    def test_incremental_writes(self):
+        dataset = PartitionedDataset(self.directory, partition="year")
+        history = make_frame(pd.date_range("2023-12-01", "2024-02-29"))
+
+        self.assertEqual(dataset.write("BTC-USD", history.iloc[:-10]), 2)
+        self.assertTrue(
+            (self.directory / "symbol=BTC-USD" / "year=2023" / "part.parquet").exists()
+        )
+        # Only the partition with new bars is rewritten
+        self.assertEqual(dataset.write("BTC-USD", history), 1)
+        self.assertEqual(dataset.write("BTC-USD", history), 0)
+
+        stored = dataset.load("BTC-USD")
+        assert stored is not None
+        pd.testing.assert_frame_equal(stored, history, check_freq=False)
+        self.assertIsNone(dataset.load("ETH-USD"))
+
+    def test_invalid_partition(self):
+        with self.assertRaises(ValueError):
+            PartitionedDataset(self.directory, partition="week")
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        previous = set_rate_limiter(RateLimiter(rate=1000, max_rate=1000))
+        self.addCleanup(set_rate_limiter, previous)
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+
+        # Old recorded bars, so every one of them is complete
+        fixtures = self.directory / "fixtures"
+        store = OHLCVStore(fixtures, file_format="csv")
+        for symbol in ("BTC-USD", "ETH-USD"):
+            store.save(
+                symbol, "1d", make_frame(pd.date_range("2023-06-01", "2024-03-31"))
+            )
+        (fixtures / "meta.json").write_text(
+            json.dumps(
+                {
+                    symbol: {"quoteType": "CRYPTOCURRENCY", "timezone": "UTC"}
+                    for symbol in ("BTC-USD", "ETH-USD")
+                }
+            )
+        )
+        previous_provider = set_provider(ReplayProvider(fixtures))
+        self.addCleanup(set_provider, previous_provider)
+
+        self.symbols = self.directory / "symbols.txt"
+        self.symbols.write_text("# universe\nBTC-USD\neth-usd  # lower case\n\nBAD\n")
+
+    def run_cli(self, *extra: str) -> tuple[int, str]:
+        out = io.StringIO()
+        code = main(
+            [
+                str(self.symbols),
+                "--out",
+                str(self.directory / "dataset"),
+                "--period",
+                "1y",
+                "--workers",
+                "2",
+                "--chunk-size",
+                "1",
+                "--metadata-cache",
+                str(self.directory / "meta-cache.json"),
+                *extra,
+            ],
+            stdout=out,
+        )
+        return code, out.getvalue()
+
+    def test_bulk_download(self):
+        code, text = self.run_cli("--partition", "month")
+
+        self.assertEqual(code, 1)
+        self.assertIn("ok    BTC-USD: 305 rows, 10 partitions written", text)
+        self.assertIn("FAIL  BAD:", text)
+        self.assertIn("2/3 symbols, 610 rows, 20 partition files", text)
+        self.assertIn("Failed: BAD", text)
+        self.assertTrue(
+            (
+                self.directory
+                / "dataset"
+                / "symbol=ETH-USD"
+                / "month=2024-03"
+                / "part.parquet"
+            ).exists()
+        )
+
+        # A repeated run leaves unchanged partitions alone
+        _, text = self.run_cli("--partition", "month", "--quiet")
+        self.assertTrue(text.startswith("2/3 symbols, 610 rows, 0 partition files"))
+
+    def test_checkpoint_resume(self):
+        checkpoint = str(self.directory / "run.jsonl")
+        code, _ = self.run_cli("--checkpoint", checkpoint, "--quiet")
+        self.assertEqual(code, 1)
+
+        # Only the failed symbol is fetched again
+        code, text = self.run_cli("--checkpoint", checkpoint, "--retry-failed")
+        self.assertEqual(code, 1)
+        self.assertIn("Skipped 2 symbols per the checkpoint", text)
+        self.assertIn("[1/1] FAIL  BAD:", text)
+        self.assertIn("0/1 symbols, 0 rows", text)
+
+        self.symbols.write_text("BTC-USD\nETH-USD\n")
+        code, text = self.run_cli("--checkpoint", checkpoint, "--quiet")
+        self.assertEqual(code, 0)
+        self.assertIn("0/0 symbols", text)
+
+    def test_requires_pyarrow(self):
+        stderr = io.StringIO()
+        with patch("finfetcher.cli.find_spec", return_value=None):
+            with redirect_stderr(stderr), self.assertRaises(SystemExit) as raised:
+                self.run_cli()
+        self.assertEqual(raised.exception.code, 2)
+        self.assertIn("pip install 'finfetcher[parquet]'", stderr.getvalue())
+        self.assertFalse((self.directory / "dataset").exists())
+
+    def test_read_symbols(self):
+        self.assertEqual(
+            read_symbols(["aapl", "MSFT # comment", "", "AAPL"]), ["AAPL", "MSFT"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
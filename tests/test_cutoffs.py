@@ -0,0 +1,90 @@
+import unittest
+from unittest.mock import patch
+
+from finfetcher.config import MARKET_CUTOFFS
+from finfetcher.core import DataFetcher
+from finfetcher.cutoffs import CutoffResolver, build_market_config
+
+
+class TestCutoffResolver(unittest.TestCase):
+    def test_resolves_timezone_override_and_default(self):
+        resolver = CutoffResolver.from_custom()
+
+        cutoff = resolver.resolve("EQUITY", "Europe/Berlin")
+        self.assertEqual(cutoff.tz_name, "Europe/Berlin")
+        self.assertEqual((cutoff.hour, cutoff.minute), (17, 50))
+        self.assertEqual(cutoff.tz.zone, "Europe/Berlin")  # type: ignore[attr-defined]
+
+        cutoff = resolver.resolve("EQUITY", "Asia/Seoul")
+        self.assertEqual((cutoff.hour, cutoff.minute), (18, 0))
+
+    def test_force_tz_and_fallbacks(self):
+        resolver = CutoffResolver.from_custom()
+
+        crypto = resolver.resolve("CRYPTOCURRENCY", "Europe/Berlin")
+        self.assertEqual(crypto.tz_name, "UTC")
+        self.assertEqual((crypto.hour, crypto.minute), (23, 59))
+
+        unknown_asset = resolver.resolve("WARRANT", "America/New_York")
+        self.assertEqual((unknown_asset.hour, unknown_asset.minute), (16, 20))
+
+        unknown_tz = resolver.resolve("EQUITY", "Not/AZone")
+        self.assertEqual(unknown_tz.tz_name, "America/New_York")
+        self.assertEqual((unknown_tz.hour, unknown_tz.minute), (18, 0))
+
+    def test_shared_and_hashable(self):
+        custom = {"EQUITY": {"default": {"hour": 10, "minute": 0}}}
+        same = {"EQUITY": {"default": {"minute": 0, "hour": 10}}}
+
+        first = CutoffResolver.from_custom(custom)
+        self.assertIs(first, CutoffResolver.from_custom(same))
+        self.assertIs(CutoffResolver.from_custom(), CutoffResolver.from_custom(None))
+        self.assertNotEqual(first, CutoffResolver.from_custom())
+        self.assertEqual(len({first, CutoffResolver.from_custom(same)}), 1)
+
+    def test_same_merge_semantics_and_read_only(self):
+        custom = {
+            "EQUITY": {"default": {"hour": 10, "minute": 0}},
+            "NEW_ASSET": {"force_tz": "UTC", "default": {"hour": 12, "minute": 0}},
+        }
+        resolver = CutoffResolver.from_custom(custom)
+
+        self.assertEqual(
+            dict(resolver), dict(CutoffResolver(build_market_config(custom)))
+        )
+        self.assertIn("timezones", resolver["EQUITY"])
+        self.assertEqual(resolver["EQUITY"]["default"], {"hour": 10, "minute": 0})
+        with self.assertRaises(TypeError):
+            resolver["EQUITY"]["default"] = {"hour": 0, "minute": 0}  # type: ignore[index]
+        with self.assertRaises(AttributeError):
+            resolver.extra = 1  # type: ignore[attr-defined]
+
+        # The base configuration is never modified
+        self.assertEqual(MARKET_CUTOFFS["EQUITY"]["default"], {"hour": 18, "minute": 0})
+
+    def test_validation(self):
+        with self.assertRaises(TypeError):
+            CutoffResolver.from_custom({"EQUITY": "bad"})  # type: ignore[dict-item]
+        with self.assertRaises(ValueError):
+            CutoffResolver.from_custom({"EQUITY": {"default": {"hour": "10"}}})
+
+    @patch("finfetcher.core.yf.Ticker")
+    def test_fetchers_share_resolver(self, _mock_ticker):
+        custom = {"EQUITY": {"default": {"hour": 10, "minute": 0}}}
+        fetchers = [DataFetcher(f"T{i}", custom_cutoffs=custom) for i in range(100)]
+
+        self.assertEqual(len({id(f.config) for f in fetchers}), 1)
+
+    def test_coerce_full_config(self):
+        config = build_market_config(
+            {"X": {"force_tz": "UTC", "default": {"hour": 1, "minute": 0}}}
+        )
+        resolver = CutoffResolver.coerce(config)
+
+        self.assertIs(resolver, CutoffResolver.coerce(config))
+        self.assertIs(CutoffResolver.coerce(resolver), resolver)
+        self.assertEqual(resolver.resolve("X", None).hour, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
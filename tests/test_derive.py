@@ -0,0 +1,156 @@
+import tempfile
+import unittest
+from datetime import date, datetime, time
+from unittest.mock import patch
+
+import pandas as pd
+import pytz
+
+from finfetcher.calendars import get_calendar
+from finfetcher.core import DataFetcher
+from finfetcher.services.derive import covers, derive, resample_bars
+from finfetcher.services.metadata import MetadataCache
+from finfetcher.services.store import OHLCVStore, history_is_current
+
+
+def make_daily(dates) -> pd.DataFrame:
+    n = len(dates)
+    return pd.DataFrame(
+        {
+            "Open": [float(i) for i in range(n)],
+            "High": [float(i + 10) for i in range(n)],
+            "Low": [float(i - 10) for i in range(n)],
+            "Close": [float(i + 1) for i in range(n)],
+            "Volume": [100] * n,
+        },
+        index=pd.DatetimeIndex(dates),
+    )
+
+
+class TestResample(unittest.TestCase):
+    def test_weekly_bars(self):
+        # Wed 2026-09-30 .. Fri 2026-10-09, weekdays only
+        daily = make_daily(pd.bdate_range("2026-09-30", "2026-10-09"))
+        weekly = resample_bars(daily, "1wk")
+
+        self.assertEqual(
+            list(weekly.index), [pd.Timestamp("2026-09-28"), pd.Timestamp("2026-10-05")]
+        )
+        first = weekly.iloc[0]
+        self.assertEqual(first["Open"], 0.0)
+        self.assertEqual(first["Close"], 3.0)
+        self.assertEqual(first["High"], 12.0)
+        self.assertEqual(first["Low"], -10.0)
+        self.assertEqual(first["Volume"], 300)
+
+    def test_monthly_and_quarterly_bars(self):
+        daily = make_daily(pd.bdate_range("2026-09-30", "2026-10-09"))
+
+        monthly = resample_bars(daily, "1mo")
+        self.assertEqual(
+            list(monthly.index),
+            [pd.Timestamp("2026-09-01"), pd.Timestamp("2026-10-01")],
+        )
+        self.assertEqual(monthly["Volume"].tolist(), [100, 700])
+
+        quarterly = resample_bars(daily, "3mo")
+        self.assertEqual(
+            list(quarterly.index),
+            [pd.Timestamp("2026-07-01"), pd.Timestamp("2026-10-01")],
+        )
+
+    def test_covers_and_derive(self):
+        self.assertTrue(covers("4y", "1mo"))
+        self.assertTrue(covers("max", "10y"))
+        self.assertFalse(covers("1mo", "4y"))
+        self.assertFalse(covers("4y", "max"))
+
+        daily = make_daily(pd.date_range(end=pd.Timestamp(date.today()), periods=60))
+        self.assertEqual(len(derive(daily, "3mo", "5d", "1d")), 6)  # type: ignore[arg-type]
+        self.assertIsNone(derive(daily, "1mo", "1y", "1d"))
+        self.assertIsNone(derive(daily, "3mo", "1mo", "1h"))
+        self.assertIsNotNone(derive(daily, "3mo", "1mo", "1wk"))
+
+        # "5d" is five sessions, not five calendar days
+        sessions = make_daily(
+            pd.bdate_range(end=pd.Timestamp(date.today()), periods=60)
+        )
+        weekdays = get_calendar("Asia/Kolkata")
+        derived = derive(sessions, "3mo", "5d", "1d", weekdays)
+        assert derived is not None
+        self.assertEqual(list(derived.index), list(sessions.index[-5:]))
+        self.assertTrue(covers("1mo", "5d", weekdays))
+
+
+class TestDataFetcherDerived(unittest.TestCase):
+    def setUp(self):
+        self.metadata = MetadataCache()
+        self.metadata.set("BTC-USD", "CRYPTOCURRENCY", "UTC")
+        self.daily = make_daily(
+            pd.date_range(end=pd.Timestamp(date.today()), periods=400)
+        )
+
+    @patch("finfetcher.core.fetch_data")
+    @patch("finfetcher.core.yf.Ticker")
+    def test_served_from_held_data(self, _mock_ticker, mock_fetch_data):
+        mock_fetch_data.return_value = (self.daily, date.today())
+        fetcher = DataFetcher("BTC-USD", metadata_cache=self.metadata)
+
+        fetcher.get_data(period="1y")
+        month = fetcher.get_data(period="1mo")
+        weekly = fetcher.get_data(period="6mo", interval="1wk", index_type="datetime")
+        self.assertEqual(mock_fetch_data.call_count, 1)
+        self.assertLess(len(month), 32)
+        self.assertTrue((weekly.index.dayofweek == 0).all())
+
+        # Not covered by the held span or granularity
+        fetcher.get_data(period="2y")
+        fetcher.get_data(period="1mo", interval="1h")
+        self.assertEqual(mock_fetch_data.call_count, 3)
+        self.assertEqual(mock_fetch_data.call_args.kwargs["interval"], "1h")
+
+    @patch("finfetcher.core.fetch_data")
+    @patch("finfetcher.core.yf.Ticker")
+    def test_coarse_interval_resampled_from_store(self, _mock_ticker, mock_fetch_data):
+        mock_fetch_data.return_value = (self.daily, date.today())
+        with tempfile.TemporaryDirectory() as tmp:
+            fetcher = DataFetcher(
+                "BTC-USD", store=OHLCVStore(tmp, "csv"), metadata_cache=self.metadata
+            )
+            monthly = fetcher.get_data(period="1y", interval="1mo")
+
+        self.assertEqual(mock_fetch_data.call_args.kwargs["interval"], "1d")
+        self.assertTrue(
+            (monthly.index == [d.replace(day=1) for d in monthly.index]).all()
+        )
+
+
+class TestHistoryIsCurrent(unittest.TestCase):
+    def test_current_until_next_cutoff(self):
+        cached = make_daily([pd.Timestamp("2026-10-15")])
+        utc = pytz.utc
+
+        def at(day, hour, minute=0):
+            return lambda tz: utc.localize(datetime.combine(day, time(hour, minute)))
+
+        self.assertTrue(
+            history_is_current(
+                cached, "CRYPTOCURRENCY", "UTC", clock=at(date(2026, 10, 16), 10)
+            )
+        )
+        self.assertFalse(
+            history_is_current(
+                cached, "CRYPTOCURRENCY", "UTC", clock=at(date(2026, 10, 16), 23, 59)
+            )
+        )
+        # Thursday's bar stays current until Friday's NYSE cutoff
+        self.assertTrue(
+            history_is_current(
+                cached, "EQUITY", "America/New_York", clock=at(date(2026, 10, 16), 20)
+            )
+        )
+        self.assertFalse(history_is_current(None, "EQUITY", "America/New_York"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import unittest
+
+from finfetcher._lazy import LazyModule, lazy_import
+
+HEAVY = ("pandas", "numpy", "yfinance", "pytz")
+
+SCRIPT = """
+import sys
+import finfetcher
+from finfetcher import DataFetcher, MultiFetcher
+
+DataFetcher("AAPL")
+MultiFetcher(["AAPL", "MSFT"])
+print(",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+class TestImportTime(unittest.TestCase):
+    def test_heavy_dependencies_not_imported(self):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", SCRIPT.format(heavy=HEAVY)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "")
+
+        # -X importtime lines: "import time: self | cumulative | module"
+        imported = {
+            line.rsplit("|", 1)[-1].strip()
+            for line in result.stderr.splitlines()
+            if line.startswith("import time:")
+        }
+        self.assertIn("finfetcher", imported)
+        self.assertEqual({name.split(".")[0] for name in imported} & set(HEAVY), set())
+
+    def test_lazy_module(self):
+        module = LazyModule("json")
+        self.assertIsNone(module.__dict__["_lazy_module"])
+        self.assertEqual(module.dumps([1]), "[1]")
+
+        import json
+
+        self.assertIs(module.__dict__["_lazy_module"], json)
+        # Writes reach the real module, so patching through the proxy works
+        module.finfetcher_marker = 1
+        self.assertEqual(json.finfetcher_marker, 1)  # type: ignore[attr-defined]
+        del module.finfetcher_marker
+        self.assertFalse(hasattr(json, "finfetcher_marker"))
+
+        self.assertIs(lazy_import("json"), json)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import tempfile
+import unittest
+from datetime import date, datetime, time, timedelta
+from unittest.mock import patch
+
+import pandas as pd
+
+from finfetcher import DataFetcher, MetadataCache, MultiFetcher, OHLCVStore
+from finfetcher.services.retry import RetryPolicy
+from finfetcher.services.store import latest_periods, period_start
+
+
+def make_frame(dates) -> pd.DataFrame:
+    n = len(dates)
+    return pd.DataFrame(
+        {"Open": range(n), "Close": range(1, n + 1)},
+        index=pd.DatetimeIndex(dates),
+        dtype=float,
+    )
+
+
+def mock_now(hour, minute=0):
+    """datetime.now(tz) returning today at the given local time."""
+    return lambda tz=None: tz.localize(
+        datetime.combine(date.today(), time(hour, minute))
+    )
+
+
+@patch("finfetcher.services.fetch_data.datetime")
+@patch("finfetcher.services.providers.yf_download")
+class TestGetLatest(unittest.TestCase):
+    def setUp(self):
+        # 24/7 assets, so there is a bar for today whatever the weekday
+        self.cache = MetadataCache()
+        self.cache.set_many(
+            {"BTC-USD": ("CRYPTOCURRENCY", "UTC"), "ETH-USD": ("CRYPTOCURRENCY", "UTC")}
+        )
+        today = pd.Timestamp(date.today())
+        self.upstream = {
+            "BTC-USD": make_frame(pd.date_range(end=today, periods=60)),
+            # Trading halted for the last week
+            "ETH-USD": make_frame(
+                pd.date_range(end=today - pd.Timedelta(days=7), periods=60)
+            ),
+        }
+
+    def serve(self, mock_download):
+        """Serves the upstream bars of the requested period or start."""
+
+        def download(tickers, period=None, start=None, **kwargs):
+            start = start or period_start(period).isoformat()
+            symbols = [tickers] if isinstance(tickers, str) else tickers
+            frames = {s: self.upstream[s].loc[start:] for s in symbols}
+            if isinstance(tickers, str):
+                return frames[tickers]
+            return pd.concat(frames, axis=1)
+
+        mock_download.side_effect = download
+
+    def periods(self, mock_download) -> list:
+        return [c.kwargs.get("period") for c in mock_download.call_args_list]
+
+    def test_latest_periods(self, mock_download, mock_datetime):
+        self.assertEqual(latest_periods(1)[0], "5d")
+        self.assertEqual(latest_periods(20)[:2], ["3mo", "6mo"])
+        self.assertEqual(latest_periods(10**5), ["max"])
+        with self.assertRaises(ValueError):
+            latest_periods(0)
+
+    def test_shortest_period(self, mock_download, mock_datetime):
+        self.serve(mock_download)
+        mock_datetime.now.side_effect = mock_now(10)
+        fetcher = DataFetcher("BTC-USD", metadata_cache=self.cache)
+
+        data = fetcher.get_latest()
+
+        self.assertEqual(self.periods(mock_download), ["5d"])
+        # Today's candle is unfinished: yesterday is the newest complete bar
+        self.assertEqual(list(data.index), [date.today() - timedelta(days=1)])
+        self.assertEqual(fetcher.target_date, date.today())
+
+        # Held until the next cutoff
+        self.assertEqual(len(fetcher.get_latest(2)), 2)
+        self.assertEqual(mock_download.call_count, 1)
+
+    def test_widens_after_closure(self, mock_download, mock_datetime):
+        self.serve(mock_download)
+        mock_datetime.now.side_effect = mock_now(10)
+        # Empty responses are retried before widening; once is enough here
+        policy = RetryPolicy(max_attempts=1, circuit_breaker=None)
+        fetcher = DataFetcher("ETH-USD", metadata_cache=self.cache, retry_policy=policy)
+
+        data = fetcher.get_latest(index_type="datetime")
+
+        self.assertEqual(self.periods(mock_download), ["5d", "1mo"])
+        self.assertEqual(list(data.index), list(self.upstream["ETH-USD"].index[-1:]))
+
+    def test_merges_into_store(self, mock_download, mock_datetime):
+        self.serve(mock_download)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        store = OHLCVStore(tmp.name, file_format="csv")
+        mock_datetime.now.side_effect = mock_now(10)
+        DataFetcher("BTC-USD", metadata_cache=self.cache, store=store).get_data("1mo")
+
+        mock_datetime.now.side_effect = mock_now(23, 59)
+        fetcher = DataFetcher("BTC-USD", metadata_cache=self.cache, store=store)
+        data = fetcher.get_latest()
+
+        # Only the new bar is downloaded and appended to the stored history
+        self.assertEqual(
+            mock_download.call_args.kwargs["start"], date.today().isoformat()
+        )
+        self.assertEqual(list(data.index), [date.today()])
+        stored = store.load("BTC-USD", "1d")
+        assert stored is not None
+        self.assertEqual(stored.index[-1], pd.Timestamp(date.today()))
+        self.assertGreater(len(stored), 28)
+
+    def test_batch_widens_short_symbols_only(self, mock_download, mock_datetime):
+        self.serve(mock_download)
+        mock_datetime.now.side_effect = mock_now(23, 59)
+        fetcher = MultiFetcher(
+            ["BTC-USD", "ETH-USD"],
+            metadata_cache=self.cache,
+            retry_policy=RetryPolicy(max_attempts=1, circuit_breaker=None),
+        )
+
+        data = fetcher.get_latest(output="numpy")
+
+        calls = [(c.args[0], c.kwargs["period"]) for c in mock_download.call_args_list]
+        self.assertEqual(calls, [(["BTC-USD", "ETH-USD"], "5d"), (["ETH-USD"], "1mo")])
+        self.assertEqual(fetcher.errors, {})
+        self.assertEqual(len(data["BTC-USD"]), 1)
+        self.assertEqual(data["BTC-USD"]["Date"][0], date.today())
+        self.assertEqual(fetcher.target_dates["ETH-USD"], date.today() - timedelta(6))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,11 @@ from unittest.mock import patch
 import pandas as pd
 import pytz
 
-from finfetcher.services.fetch_data import get_complete_close
+from finfetcher.services.fetch_data import (
+    clean_data,
+    format_index,
+    get_complete_close,
+)
 
 
 class TestCleaningLogic(unittest.TestCase):
@@ -101,6 +105,61 @@ class TestCleaningLogic(unittest.TestCase):
             "Should remove today's row for Crypto if current time < 23:59",
         )
 
+    @patch("finfetcher.services.fetch_data.datetime")
+    def test_datetime_index(self, mock_datetime):
+        """
+        Scenario: Same as market open, but with a datetime64 index.
+        Result: Last row is REMOVED without converting the index to dates.
+        """
+        ny_tz = pytz.timezone("America/New_York")
+        mock_now = ny_tz.localize(datetime(2023, 10, 27, 15, 30))
+        mock_datetime.now.side_effect = lambda tz=None: (
+            mock_now.astimezone(tz) if tz else mock_now
+        )
+
+        df = self.df.copy()
+        df.index = pd.DatetimeIndex(df.index)
+
+        cleaned_df = get_complete_close(
+            df,
+            asset_type="EQUITY",
+            last_day_df=df.index[-1],
+            ticker_tz_name="America/New_York",
+        )
+
+        self.assertEqual(len(cleaned_df), 2)
+        self.assertTrue(pd.api.types.is_datetime64_dtype(cleaned_df.index))
+
+    @patch("finfetcher.services.fetch_data.datetime")
+    def test_clean_data_index_types(self, mock_datetime):
+        """
+        Scenario: Market is EQUITY (NY), closed. Raw index is tz-aware.
+        Result: Index is normalised to exchange dates in every output mode.
+        """
+        ny_tz = pytz.timezone("America/New_York")
+        mock_now = ny_tz.localize(datetime(2023, 10, 27, 17, 00))
+        mock_datetime.now.side_effect = lambda tz=None: (
+            mock_now.astimezone(tz) if tz else mock_now
+        )
+
+        df = self.df.copy()
+        df.index = pd.DatetimeIndex(df.index).tz_localize(ny_tz)
+
+        data, target_date = clean_data(
+            df, "AAPL", "EQUITY", "America/New_York", market_config=None
+        )
+
+        self.assertEqual(target_date, date(2023, 10, 30))
+        self.assertTrue(pd.api.types.is_datetime64_dtype(data.index))
+        self.assertEqual(data.index[-1], pd.Timestamp("2023-10-27"))
+
+        self.assertEqual(format_index(data, "date").index[-1], self.today)
+        self.assertEqual(
+            format_index(data, "period").index[-1], pd.Period("2023-10-27", "D")
+        )
+        with self.assertRaises(ValueError):
+            format_index(data, "int")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pandas as pd
+
+from finfetcher.cutoffs import CutoffResolver
+from finfetcher.services.fetch_data import get_complete_close
+from finfetcher.services.market_status import market_status
+
+META = {
+    "AAPL": ("EQUITY", "America/New_York"),
+    "SPY": ("ETF", "America/New_York"),
+    "SAP.DE": ("EQUITY", "Europe/Berlin"),
+    "7203.T": ("EQUITY", "Asia/Tokyo"),
+    "005930.KS": ("EQUITY", "Asia/Seoul"),
+    "BTC-USD": ("CRYPTOCURRENCY", "UTC"),
+    "ES=F": ("FUTURE", "America/Chicago"),
+    "ODD": (None, None),
+}
+
+
+class TestMarketStatus(unittest.TestCase):
+    def test_columns_and_values(self):
+        now = datetime(2026, 10, 16, 15, 0, tzinfo=timezone.utc)
+        status = market_status(META, now=now)
+
+        self.assertEqual(list(status.index), list(META))
+        aapl = status.loc["AAPL"]
+        self.assertEqual(aapl["timezone"], "America/New_York")
+        self.assertEqual(aapl["cutoff"], pd.Timestamp("2026-10-16 20:20", tz="UTC"))
+        self.assertFalse(aapl["is_complete"])
+        self.assertEqual(aapl["until_cutoff"], pd.Timedelta(hours=5, minutes=20))
+
+        # Already the next day in Tokyo
+        tokyo = status.loc["7203.T"]
+        self.assertFalse(tokyo["is_complete"])
+        self.assertEqual(tokyo["local_date"], pd.Timestamp("2026-10-17"))
+        self.assertEqual(tokyo["until_cutoff"], pd.Timedelta(hours=15, minutes=20))
+
+        later = market_status(META, now=now + timedelta(hours=6))
+        self.assertTrue(later.loc["AAPL", "is_complete"])
+        self.assertEqual(later.loc["AAPL", "until_cutoff"], pd.Timedelta(0))
+
+        # Futures use the forced New York timezone
+        self.assertEqual(status.loc["ES=F", "timezone"], "America/New_York")
+
+    def test_dataframe_input_and_custom_config(self):
+        frame = pd.DataFrame(
+            {"asset_type": ["EQUITY"], "timezone": ["America/New_York"]},
+            index=["AAPL"],
+        )
+        custom = {
+            "EQUITY": {"timezones": {"America/New_York": {"hour": 9, "minute": 0}}}
+        }
+        now = datetime(2026, 10, 16, 15, 0, tzinfo=timezone.utc)
+        status = market_status(
+            frame, now=now, market_config=CutoffResolver.from_custom(custom)
+        )
+        self.assertTrue(status.loc["AAPL", "is_complete"])
+
+    def test_empty(self):
+        self.assertTrue(market_status({}).empty)
+
+    @patch("finfetcher.services.fetch_data.datetime")
+    def test_matches_get_complete_close(self, mock_datetime):
+        start = datetime(2026, 3, 6, 0, 0, tzinfo=timezone.utc)
+        for step in range(0, 7 * 24 * 60, 97):
+            now = start + timedelta(minutes=step)
+            mock_datetime.now.side_effect = lambda tz, now=now: now.astimezone(tz)
+            status = market_status(META, now=now)
+
+            for symbol, (asset_type, tz_name) in META.items():
+                local_date = status.loc[symbol, "local_date"]
+                df = pd.DataFrame({"Close": [1.0]}, index=[local_date])
+                kept = get_complete_close(df, asset_type, local_date, tz_name)
+                self.assertEqual(
+                    len(kept) == 1,
+                    status.loc[symbol, "is_complete"],
+                    f"{symbol} at {now}",
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
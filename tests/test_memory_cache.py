@@ -0,0 +1,190 @@
+import tempfile
+import threading
+import time
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pandas as pd
+
+from finfetcher import OHLCVStore, ReplayProvider
+from finfetcher.core import DataFetcher
+from finfetcher.exceptions import YFinanceConnectionError
+from finfetcher.services.memory_cache import FetchCache, fetch_key
+from finfetcher.services.metadata import MetadataCache
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_result():
+    frame = pd.DataFrame({"Close": [1.0]}, index=pd.to_datetime(["2026-10-15"]))
+    return frame, date(2026, 10, 16)
+
+
+class TestFetchCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(datetime(2026, 10, 15, 12, 0, tzinfo=timezone.utc))
+        self.cache = FetchCache(clock=self.clock)
+        self.metadata = MetadataCache()
+        self.metadata.set("AAPL", "EQUITY", "America/New_York")
+
+    def test_expires_at_next_cutoff(self):
+        expiry = self.cache.expiry("AAPL", "1d", self.metadata)
+        self.assertEqual(expiry, datetime(2026, 10, 15, 20, 20, tzinfo=timezone.utc))
+
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return make_result()
+
+        key = ("AAPL", "4y", "1d")
+        expires = lambda: self.cache.expiry("AAPL", "1d", self.metadata)  # noqa: E731
+        self.cache.get_or_fetch(key, fetch, expires)
+        self.cache.get_or_fetch(key, fetch, expires)
+        self.assertEqual(len(calls), 1)
+
+        self.clock.now = datetime(2026, 10, 15, 20, 20, tzinfo=timezone.utc)
+        self.cache.get_or_fetch(key, fetch, expires)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_intraday_not_kept(self):
+        self.assertIsNone(self.cache.expiry("AAPL", "5m", self.metadata))
+        self.assertIsNone(self.cache.expiry("UNKNOWN", "1d", self.metadata))
+
+    def test_singleflight(self):
+        calls = []
+        started = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return make_result()
+
+        expires = lambda: self.cache.expiry("AAPL", "1d", self.metadata)  # noqa: E731
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.cache.get_or_fetch(("AAPL", "4y", "1d"), fetch, expires)
+                )
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_errors_shared_and_not_cached(self):
+        gate = threading.Event()
+        calls = []
+
+        def failing():
+            calls.append(1)
+            gate.wait(1)
+            raise YFinanceConnectionError("down")
+
+        errors = []
+
+        def call():
+            try:
+                self.cache.get_or_fetch(("AAPL", "4y", "1d"), failing, lambda: None)
+            except YFinanceConnectionError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        gate.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(errors), 4)
+        self.assertLessEqual(len(calls), 4)
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestDataFetcherWithCache(unittest.TestCase):
+    @patch("finfetcher.core.fetch_data")
+    @patch("finfetcher.core.yf.Ticker")
+    def test_shared_between_fetchers(self, _mock_ticker, mock_fetch_data):
+        mock_fetch_data.return_value = make_result()
+        metadata = MetadataCache()
+        metadata.set("AAPL", "EQUITY", "America/New_York")
+        cache = FetchCache(clock=lambda: datetime.now(timezone.utc) - timedelta(days=1))
+
+        first = DataFetcher("AAPL", metadata_cache=metadata, fetch_cache=cache)
+        second = DataFetcher("aapl", metadata_cache=metadata, fetch_cache=cache)
+        data = first.get_data()
+        period_data = second.get_data(index_type="period")
+
+        mock_fetch_data.assert_called_once()
+        self.assertEqual(mock_fetch_data.call_args.kwargs["index_type"], "datetime")
+        self.assertEqual(data.index[-1], date(2026, 10, 15))
+        self.assertIsInstance(period_data.index, pd.PeriodIndex)
+        self.assertEqual(second.target_date, date(2026, 10, 16))
+
+    @patch("finfetcher.core.fetch_data")
+    def test_results_are_copies(self, mock_fetch_data):
+        mock_fetch_data.return_value = make_result()
+        metadata = MetadataCache()
+        metadata.set("AAPL", "EQUITY", "America/New_York")
+        cache = FetchCache(clock=lambda: datetime.now(timezone.utc) - timedelta(days=1))
+
+        fetcher = DataFetcher("AAPL", metadata_cache=metadata, fetch_cache=cache)
+        first = fetcher.get_data(index_type="datetime")
+        first.loc[first.index[-1], "Close"] = -1.0
+        first["Extra"] = 0.0
+        second = fetcher.get_data(index_type="datetime")
+
+        mock_fetch_data.assert_called_once()
+        self.assertIsNot(first, second)
+        self.assertNotIn("Extra", second)
+        self.assertNotEqual(second["Close"].iloc[-1], -1.0)
+
+    @patch("finfetcher.core.fetch_data")
+    @patch("finfetcher.core.yf.Ticker")
+    def test_not_shared_across_configurations(self, _mock_ticker, mock_fetch_data):
+        mock_fetch_data.return_value = make_result()
+        metadata = MetadataCache()
+        metadata.set("AAPL", "EQUITY", "America/New_York")
+        cache = FetchCache(clock=lambda: datetime.now(timezone.utc) - timedelta(days=1))
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+
+        variants = [
+            {},
+            {"custom_cutoffs": {"EQUITY": {"default": {"hour": 10, "minute": 0}}}},
+            {"store": OHLCVStore(tmp.name, file_format="csv")},
+            {"store": OHLCVStore(tmp.name, file_format="csv", raw=True)},
+            {"provider": ReplayProvider(tmp.name)},
+        ]
+        for kwargs in variants:
+            DataFetcher(
+                "AAPL", metadata_cache=metadata, fetch_cache=cache, **kwargs
+            ).get_data()
+        self.assertEqual(mock_fetch_data.call_count, len(variants))
+
+        # Equal configurations still share entries
+        self.assertEqual(
+            fetch_key("aapl", "4y", "1d", store=OHLCVStore(tmp.name, "csv")),
+            fetch_key("AAPL", "4y", "1d", store=OHLCVStore(tmp.name + "/", "csv")),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
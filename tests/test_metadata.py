@@ -0,0 +1,97 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from finfetcher.exceptions import TickerNotFoundError
+from finfetcher.services.metadata import (
+    MetadataCache,
+    get_ticker_meta,
+    prefetch_metadata,
+)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def mock_ticker(symbol, session=None):
+    ticker = MagicMock()
+    if symbol == "BAD":
+        type(ticker).fast_info = property(MagicMock(side_effect=KeyError))
+        type(ticker).info = property(MagicMock(side_effect=KeyError))
+    else:
+        ticker.fast_info = {"quoteType": "equity", "timezone": "America/New_York"}
+    return ticker
+
+
+class TestMetadataCache(unittest.TestCase):
+    def test_lru_and_ttl(self):
+        clock = FakeClock()
+        cache = MetadataCache(maxsize=2, ttl=60, clock=clock)
+
+        cache.set("AAPL", "EQUITY", "America/New_York")
+        cache.set("SAP.DE", "EQUITY", "Europe/Berlin")
+        cache.get("AAPL")  # AAPL is now most recently used
+        cache.set("7203.T", "EQUITY", "Asia/Tokyo")
+
+        self.assertIsNone(cache.get("SAP.DE"))
+        self.assertEqual(cache.get("AAPL"), ("EQUITY", "America/New_York"))
+
+        clock.now += 61
+        self.assertIsNone(cache.get("AAPL"))
+
+    def test_persistent_file(self):
+        clock = FakeClock()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "meta.json"
+            MetadataCache(path=path, ttl=60, clock=clock).set("BTC-USD", "X", "UTC")
+
+            self.assertEqual(
+                MetadataCache(path=path, ttl=60, clock=clock).get("BTC-USD"),
+                ("X", "UTC"),
+            )
+
+            # Expired entries are not loaded
+            clock.now += 61
+            self.assertEqual(len(MetadataCache(path=path, ttl=60, clock=clock)), 0)
+
+    def test_get_ticker_meta_uses_cache(self):
+        cache = MetadataCache()
+        ticker = mock_ticker("AAPL")
+
+        self.assertEqual(
+            get_ticker_meta(ticker, "AAPL", cache=cache),
+            ("EQUITY", "America/New_York"),
+        )
+
+        # Second lookup must not touch yfinance
+        broken = mock_ticker("BAD")
+        self.assertEqual(
+            get_ticker_meta(broken, "AAPL", cache=cache),
+            ("EQUITY", "America/New_York"),
+        )
+        with self.assertRaises(TickerNotFoundError):
+            get_ticker_meta(broken, "BAD", cache=cache)
+
+    @patch("finfetcher.services.metadata.yf.Ticker")
+    def test_prefetch_metadata(self, mock_ticker_cls):
+        mock_ticker_cls.side_effect = mock_ticker
+        cache = MetadataCache()
+        cache.set("MSFT", "EQUITY", "America/New_York")
+
+        errors = prefetch_metadata(["aapl", "msft", "bad"], cache=cache)
+
+        self.assertEqual(set(errors), {"BAD"})
+        self.assertEqual(cache.get("AAPL"), ("EQUITY", "America/New_York"))
+        # Cached symbols are not looked up again
+        looked_up = {c.args[0] for c in mock_ticker_cls.call_args_list}
+        self.assertEqual(looked_up, {"AAPL", "BAD"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+from datetime import date, datetime, time
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from finfetcher import (
+    DataFetcher,
+    DataProvider,
+    MetadataCache,
+    MetricsCollector,
+    MultiFetcher,
+    get_observer,
+    set_observer,
+)
+from finfetcher.exceptions import TickerNotFoundError
+from finfetcher.services.metrics import observing
+from finfetcher.services.rate_limit import RateLimiter, set_rate_limiter
+from finfetcher.services.retry import RetryPolicy
+
+
+def mock_now(hour, minute=0):
+    """datetime.now(tz) returning today at the given local time."""
+    return lambda tz=None: tz.localize(
+        datetime.combine(date.today(), time(hour, minute))
+    )
+
+
+class FlakyProvider(DataProvider):
+    """Crypto bars up to today; the first `failures` downloads fail."""
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+
+    def get_meta(self, symbol):
+        if symbol == "BAD":
+            raise KeyError(symbol)
+        return "CRYPTOCURRENCY", "UTC"
+
+    def history(self, symbol, interval="1d", period=None, start=None, end=None):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Injected failure")
+        dates = pd.date_range(end=pd.Timestamp(date.today()), periods=10)
+        return pd.DataFrame({"Close": range(10)}, index=dates, dtype=float)
+
+    def history_many(self, symbols, interval="1d", period=None, start=None, end=None):
+        return pd.concat({s: self.history(s) for s in symbols}, axis=1)
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        previous = set_rate_limiter(RateLimiter(rate=1000, max_rate=1000))
+        self.addCleanup(set_rate_limiter, previous)
+        self.policy = RetryPolicy(base_delay=0, circuit_breaker=None)
+
+    @patch("finfetcher.services.fetch_data.datetime")
+    def test_data_fetcher_phases_and_results(self, mock_datetime):
+        # Before the 23:59 UTC crypto cutoff: today's bar is dropped
+        mock_datetime.now.side_effect = mock_now(10)
+        collector = MetricsCollector()
+        fetcher = DataFetcher(
+            "BTC-USD",
+            provider=FlakyProvider(failures=1),
+            metadata_cache=MetadataCache(),
+            retry_policy=self.policy,
+            observer=collector,
+        )
+
+        fetcher.get_data(period="1mo")
+
+        metrics = collector.summary()["symbols"]["BTC-USD"]
+        self.assertEqual(
+            set(metrics["phases"]), {"metadata", "download", "clean", "total"}
+        )
+        self.assertEqual(metrics["attempts"], 2)
+        self.assertEqual(metrics["failed_attempts"], 1)
+        self.assertEqual(metrics["rows"], 9)
+        self.assertEqual(metrics["rows_dropped"], 1)
+        self.assertGreater(metrics["bytes"], 0)
+        self.assertGreaterEqual(
+            metrics["phases"]["total"]["total"], metrics["phases"]["download"]["total"]
+        )
+        # The observer is scoped to the fetcher
+        self.assertIsNone(get_observer())
+
+    def test_multi_fetcher_errors_and_prometheus(self):
+        collector = MetricsCollector()
+        previous = set_observer(collector)
+        self.addCleanup(set_observer, previous)
+
+        MultiFetcher(
+            ["ETH-USD", "BAD"],
+            provider=FlakyProvider(),
+            metadata_cache=MetadataCache(),
+            retry_policy=self.policy,
+        ).get_data(period="1mo")
+
+        totals = collector.summary()["totals"]
+        self.assertEqual(totals["errors"], {"TickerNotFoundError": 1})
+        self.assertEqual(totals["attempts"], 1)
+
+        text = collector.to_prometheus()
+        self.assertIn("# TYPE finfetcher_phase_seconds summary", text)
+        self.assertIn('finfetcher_phase_seconds_count{phase="download"} 1', text)
+        self.assertIn('finfetcher_errors_total{error="TickerNotFoundError"} 1', text)
+        self.assertNotIn("symbol=", text)
+        self.assertIn(
+            'finfetcher_attempts_total{symbol="ETH-USD"} 1',
+            collector.to_prometheus(per_symbol=True),
+        )
+
+    def test_custom_observer(self):
+        observer = MagicMock()
+        with observing(observer):
+            with self.assertRaises(TickerNotFoundError):
+                DataFetcher(
+                    "BAD", provider=FlakyProvider(), metadata_cache=MetadataCache()
+                ).get_data()
+        observer.on_error.assert_called_once()
+        self.assertEqual(observer.on_error.call_args.args[0], "BAD")
+
+
+if __name__ == "__main__":
+    unittest.main()
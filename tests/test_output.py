@@ -0,0 +1,63 @@
+import importlib.util
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from finfetcher.services.output import convert_output
+
+
+class TestOutputFormats(unittest.TestCase):
+    def setUp(self):
+        index = pd.DatetimeIndex(["2023-10-26", "2023-10-27"])
+        self.df = pd.DataFrame(
+            {
+                "Open": [170.37, 166.91],
+                "Close": [166.89, 168.22],
+                "Volume": [70625300, 58499100],
+            },
+            index=index,
+        )
+
+    def test_pandas_is_unchanged(self):
+        self.assertIs(convert_output(self.df, "pandas"), self.df)
+
+    def test_compact(self):
+        compact = convert_output(self.df, "compact")
+
+        self.assertEqual(compact["Close"].dtype, np.float32)
+        self.assertEqual(compact["Volume"].dtype, np.uint32)
+        self.assertLess(
+            compact.memory_usage(deep=True).sum(),
+            self.df.memory_usage(deep=True).sum(),
+        )
+        np.testing.assert_allclose(compact["Close"], self.df["Close"], rtol=1e-6)
+
+        # Volume that does not fit into uint32 is kept as int64
+        big = self.df.assign(Volume=[2**33, 1])
+        self.assertEqual(convert_output(big, "compact")["Volume"].dtype, np.int64)
+
+    def test_numpy(self):
+        for index in (self.df.index, self.df.index.date, self.df.index.to_period("D")):
+            df = self.df.set_axis(index)
+            records = convert_output(df, "numpy")
+
+            self.assertEqual(records.dtype.names, ("Date", "Open", "Close", "Volume"))
+            self.assertTrue(records.flags["C_CONTIGUOUS"])
+            self.assertEqual(records["Date"][-1], np.datetime64("2023-10-27"))
+            self.assertEqual(records["Volume"][0], 70625300)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_arrow(self):
+        table = convert_output(self.df, "arrow")
+
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(table.column_names, ["Open", "Close", "Volume", "Date"])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            convert_output(self.df, "polars")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import json
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from finfetcher import (
+    DataFetcher,
+    MetadataCache,
+    MultiFetcher,
+    OHLCVStore,
+    ReplayProvider,
+    get_provider,
+    set_provider,
+)
+from finfetcher.exceptions import TickerNotFoundError, YFinanceConnectionError
+from finfetcher.services.fetch_data import download
+from finfetcher.services.rate_limit import RateLimiter, set_rate_limiter
+from finfetcher.services.retry import RetryPolicy
+
+
+def make_frame(dates: pd.DatetimeIndex) -> pd.DataFrame:
+    n = len(dates)
+    return pd.DataFrame(
+        {"Open": range(n), "Close": range(1, n + 1), "Volume": [100] * n},
+        index=dates,
+        dtype=float,
+    )
+
+
+class TestReplayProvider(unittest.TestCase):
+    def setUp(self):
+        # Simulated failures must not throttle the process-wide limiter
+        previous = set_rate_limiter(RateLimiter(rate=1000, max_rate=1000))
+        self.addCleanup(set_rate_limiter, previous)
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+
+        # Recorded with the store layout; old dates, so every bar is complete
+        store = OHLCVStore(self.directory, file_format="csv")
+        self.btc_dates = pd.date_range("2024-01-01", "2024-03-31", freq="D")
+        store.save("BTC-USD", "1d", make_frame(self.btc_dates))
+        store.save("AAPL", "1d", make_frame(pd.bdate_range("2024-01-01", "2024-03-29")))
+        with open(f"{self.directory}/meta.json", "w") as f:
+            json.dump(
+                {
+                    "BTC-USD": {"quoteType": "CRYPTOCURRENCY", "timezone": "UTC"},
+                    "AAPL": {"quoteType": "EQUITY", "timezone": "America/New_York"},
+                },
+                f,
+            )
+
+    def test_data_fetcher_replays_offline(self):
+        provider = ReplayProvider(self.directory)
+        fetcher = DataFetcher(
+            "BTC-USD", provider=provider, metadata_cache=MetadataCache()
+        )
+
+        data = fetcher.get_data(period="1mo")
+
+        # Periods count back from the last recorded bar
+        self.assertEqual(data.index[-1], self.btc_dates[-1].date())
+        self.assertEqual(data.index[0], pd.Timestamp("2024-02-29").date())
+        self.assertEqual(fetcher.target_date, pd.Timestamp("2024-04-01").date())
+        self.assertEqual(provider.requests, 2)  # metadata + history
+
+    def test_replay_creates_no_ticker(self):
+        """Offline fetches open no yfinance Ticker or HTTP session."""
+        fetcher = DataFetcher(
+            "AAPL",
+            provider=ReplayProvider(self.directory),
+            metadata_cache=MetadataCache(),
+        )
+
+        with (
+            patch("finfetcher.services.providers.yf.Ticker") as mock_ticker,
+            patch("finfetcher.core.get_session") as mock_session,
+        ):
+            fetcher.get_data(period="1mo")
+
+        mock_ticker.assert_not_called()
+        mock_session.assert_not_called()
+        self.assertIsNone(fetcher._ticker)
+
+    def test_multi_fetcher_batches(self):
+        provider = ReplayProvider(self.directory)
+        fetcher = MultiFetcher(
+            ["AAPL", "BTC-USD", "MISSING"],
+            provider=provider,
+            metadata_cache=MetadataCache(),
+        )
+
+        data = fetcher.get_data(period="1wk", index_type="datetime")
+
+        self.assertEqual(set(data), {"AAPL", "BTC-USD"})
+        self.assertIsInstance(fetcher.errors["MISSING"], TickerNotFoundError)
+        self.assertEqual(len(data["BTC-USD"]), 8)
+        self.assertEqual(list(data["AAPL"].columns), ["Open", "Close", "Volume"])
+
+        top_up = provider.history_many(["AAPL", "BTC-USD"], start="2024-03-29")
+        self.assertEqual(top_up.columns.nlevels, 2)
+        self.assertEqual(len(top_up["BTC-USD"]), 3)
+
+    def test_latency_and_failures(self):
+        sleep = MagicMock()
+        provider = ReplayProvider(
+            self.directory, latency=0.2, failure_rate=1.0, seed=1, sleep=sleep
+        )
+        policy = RetryPolicy(max_attempts=3, base_delay=0, circuit_breaker=None)
+
+        with self.assertRaises(YFinanceConnectionError) as ctx:
+            download("BTC-USD", period="1mo", retry_policy=policy, provider=provider)
+
+        self.assertIsInstance(ctx.exception.__cause__, ConnectionError)
+        self.assertEqual(provider.requests, 3)
+        sleep.assert_called_with(0.2)
+
+        with self.assertRaises(ValueError):
+            ReplayProvider(self.directory, failure_rate=2)
+
+    def test_set_provider(self):
+        provider = ReplayProvider(self.directory)
+        previous = set_provider(provider)
+        self.addCleanup(set_provider, previous)
+
+        self.assertIs(get_provider(), provider)
+        data = DataFetcher("AAPL", metadata_cache=MetadataCache()).get_data("1mo")
+        self.assertEqual(data.index[-1], pd.Timestamp("2024-03-29").date())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import logging
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import requests
+
+from finfetcher import YFinanceProvider
+from finfetcher.exceptions import YFinanceConnectionError
+from finfetcher.services.fetch_data import download
+from finfetcher.services.rate_limit import (
+    RateLimiter,
+    is_throttle_error,
+    set_rate_limiter,
+)
+from finfetcher.services.retry import RetryPolicy
+
+
+class FakeClock:
+    """Monotonic clock whose sleep just advances time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class YFRateLimitError(Exception):
+    pass
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def make_limiter(self, **kwargs):
+        return RateLimiter(clock=self.clock, sleep=self.clock.sleep, **kwargs)
+
+    def test_token_bucket_paces_requests(self):
+        limiter = self.make_limiter(rate=2, burst=2, increase=0)
+
+        # Burst goes through immediately, then 1 request every 0.5s
+        for _ in range(5):
+            limiter.acquire()
+
+        self.assertEqual(self.clock.slept, [0.5, 0.5, 0.5])
+        self.assertAlmostEqual(self.clock.now, 1.5)
+
+    def test_aimd(self):
+        limiter = self.make_limiter(rate=8, min_rate=1, max_rate=10, increase=1)
+
+        limiter.record(YFRateLimitError("Too Many Requests"))
+        self.assertEqual(limiter.rate, 4)
+
+        # Concurrent failures within the cooldown only count once
+        limiter.record(ConnectionError())
+        self.assertEqual(limiter.rate, 4)
+
+        self.clock.now += 1
+        limiter.record(ConnectionError())
+        self.assertEqual(limiter.rate, 2)
+
+        # Non-throttle errors leave the rate alone, successes raise it
+        limiter.record(KeyError("quoteType"))
+        limiter.record(None)
+        self.assertEqual(limiter.rate, 3)
+        self.assertEqual(limiter.stats()["throttled"], 3)
+
+    def test_is_throttle_error(self):
+        self.assertTrue(is_throttle_error(YFRateLimitError()))
+        self.assertTrue(is_throttle_error(Exception("HTTP Error 429")))
+        self.assertTrue(is_throttle_error(TimeoutError()))
+        self.assertFalse(is_throttle_error(KeyError("quoteType")))
+
+        response = requests.Response()
+        response.status_code = 429
+        error = requests.HTTPError("Client Error", response=response)
+        self.assertTrue(is_throttle_error(error))
+        response.status_code = 404
+        self.assertFalse(is_throttle_error(error))
+
+    def test_queue_depth(self):
+        limiter = self.make_limiter(rate=1, burst=1)
+        depths = []
+        limiter._sleep = lambda s: depths.append(limiter.queue_depth)
+
+        limiter.acquire()
+        limiter.acquire()
+
+        self.assertEqual(depths, [1])
+        self.assertEqual(limiter.queue_depth, 0)
+
+    @patch("finfetcher.services.fetch_data.time.sleep")
+    def test_downloads_go_through_limiter(self, mock_sleep):
+        """Stub downloader: throttling responses slow the shared limiter down."""
+        limiter = self.make_limiter(rate=10, burst=1)
+        previous = set_rate_limiter(limiter)
+        self.addCleanup(set_rate_limiter, previous)
+
+        df = pd.DataFrame({"Close": [1.0]}, index=pd.to_datetime(["2023-10-27"]))
+        stub = MagicMock(side_effect=[YFRateLimitError("Too Many Requests"), df])
+
+        with patch("finfetcher.services.providers.yf_download", stub):
+            download("AAPL")
+
+        self.assertEqual(stub.call_count, 2)
+        # Second request had to wait for a token at the halved rate
+        self.assertEqual(self.clock.slept, [0.2])
+        self.assertAlmostEqual(limiter.rate, 5.1)
+
+    @patch("finfetcher.services.fetch_data.time.sleep")
+    @patch.object(logging.getLogger("yfinance"), "disabled", True)
+    def test_yfinance_429_backs_off(self, mock_sleep):
+        """HTTP 429 answers seen through the real yfinance provider throttle."""
+        limiter = self.make_limiter(rate=10, burst=1)
+        previous = set_rate_limiter(limiter)
+        self.addCleanup(set_rate_limiter, previous)
+
+        def too_many_requests(url="", **kwargs):
+            response = requests.Response()
+            response.status_code = 429
+            response.url = url
+            response._content = b"Too Many Requests"
+            return response
+
+        session = requests.Session()
+        self.addCleanup(session.close)
+        with patch.object(session, "get", side_effect=too_many_requests):
+            with self.assertRaises(YFinanceConnectionError):
+                download(
+                    "AAPL",
+                    period="1mo",
+                    retry_policy=RetryPolicy(max_attempts=2, circuit_breaker=None),
+                    provider=YFinanceProvider(session=session),
+                )
+
+        self.assertEqual(limiter.stats()["throttled"], 2)
+        self.assertLess(limiter.rate, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
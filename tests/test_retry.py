@@ -0,0 +1,157 @@
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from finfetcher.exceptions import (
+    CircuitOpenError,
+    DataEmptyError,
+    YFinanceConnectionError,
+)
+from finfetcher.services.fetch_data import download
+from finfetcher.services.rate_limit import RateLimiter, set_rate_limiter
+from finfetcher.services.retry import CircuitBreaker, RetryPolicy
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_open_half_open_close(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60, clock=clock)
+
+        for _ in range(3):
+            self.assertTrue(breaker.allow())
+            breaker.record_failure()
+
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+
+        # After the recovery timeout a single trial request goes through
+        clock.now += 60
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+
+        # A failed trial re-opens the circuit immediately
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+        clock.now += 60
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow())
+
+    def test_release_trial(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60, clock=clock)
+        breaker.record_failure()
+
+        clock.now += 60
+        self.assertEqual(breaker.admit(), CircuitBreaker.HALF_OPEN)
+        self.assertIsNone(breaker.admit())
+
+        # An abandoned trial lets the next request through straight away
+        breaker.release()
+        self.assertEqual(breaker.admit(), CircuitBreaker.HALF_OPEN)
+
+
+@patch("finfetcher.services.fetch_data.time.sleep")
+@patch("finfetcher.services.providers.yf_download")
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        # Injected failures must not throttle the process-wide limiter
+        previous = set_rate_limiter(RateLimiter(rate=1000, max_rate=1000))
+        self.addCleanup(set_rate_limiter, previous)
+
+        self.breaker = CircuitBreaker(failure_threshold=100)
+        self.policy = RetryPolicy(
+            max_attempts=5,
+            empty_attempts=2,
+            base_delay=1,
+            max_delay=3,
+            jitter=0,
+            deadline=None,
+            circuit_breaker=self.breaker,
+        )
+
+    def test_exponential_backoff_on_errors(self, mock_download, mock_sleep):
+        mock_download.side_effect = ConnectionError("boom")
+
+        with self.assertRaises(YFinanceConnectionError):
+            download("AAPL", retry_policy=self.policy)
+
+        self.assertEqual(mock_download.call_count, 5)
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        self.assertEqual(delays, [1, 2, 3, 3])
+
+    def test_empty_gives_up_early(self, mock_download, mock_sleep):
+        """An empty response (e.g. delisted symbol) is not retried 10 times."""
+        mock_download.return_value = pd.DataFrame()
+
+        with self.assertRaises(DataEmptyError):
+            download("DELISTED", retry_policy=self.policy)
+
+        self.assertEqual(mock_download.call_count, 2)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_recovers_after_error(self, mock_download, mock_sleep):
+        df = pd.DataFrame({"Close": [1.0]}, index=pd.to_datetime(["2023-10-27"]))
+        mock_download.side_effect = [ConnectionError("boom"), df]
+
+        result = download("AAPL", retry_policy=self.policy)
+
+        pd.testing.assert_frame_equal(result, df)
+
+    def test_deadline(self, mock_download, mock_sleep):
+        mock_download.side_effect = ConnectionError("boom")
+        policy = self.policy.replace(deadline=2.5)
+
+        with self.assertRaises(YFinanceConnectionError):
+            download("AAPL", retry_policy=policy)
+
+        # Waits of 1s and 2s would exceed the 2.5s deadline
+        self.assertEqual(mock_download.call_count, 2)
+
+    def test_open_circuit_fails_fast(self, mock_download, mock_sleep):
+        mock_download.side_effect = ConnectionError("boom")
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+        policy = self.policy.replace(circuit_breaker=breaker)
+
+        # Failed requests count, not their attempts
+        for _ in range(3):
+            self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+            with self.assertRaises(YFinanceConnectionError):
+                download("AAPL", retry_policy=policy)
+        self.assertEqual(mock_download.call_count, 15)
+
+        # Another fetcher sharing the breaker does not contact Yahoo at all
+        with self.assertRaises(CircuitOpenError):
+            download("MSFT", retry_policy=policy)
+        self.assertEqual(mock_download.call_count, 15)
+
+    def test_failed_trial_reopens(self, mock_download, mock_sleep):
+        mock_download.side_effect = ConnectionError("boom")
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60, clock=clock)
+        policy = self.policy.replace(circuit_breaker=breaker)
+        with self.assertRaises(YFinanceConnectionError):
+            download("AAPL", retry_policy=policy)
+        mock_download.reset_mock()
+
+        # The trial is not retried: the circuit opens again after one attempt
+        clock.now += 60
+        with self.assertRaises(CircuitOpenError):
+            download("AAPL", retry_policy=policy)
+        self.assertEqual(mock_download.call_count, 1)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+import queue
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pandas as pd
+
+from finfetcher import MetricsCollector, ReplayProvider
+from finfetcher.exceptions import DataEmptyError, YFinanceConnectionError
+from finfetcher.services.metadata import MetadataCache, resolve_many
+from finfetcher.services.scheduler import FetchScheduler
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += timedelta(seconds=seconds)
+
+
+def make_cache():
+    cache = MetadataCache()
+    cache.set("AAPL", "EQUITY", "America/New_York")
+    cache.set("MSFT", "EQUITY", "America/New_York")
+    cache.set("7203.T", "EQUITY", "Asia/Tokyo")
+    cache.set("BTC-USD", "CRYPTOCURRENCY", "UTC")
+    return cache
+
+
+class TestFetchScheduler(unittest.TestCase):
+    def setUp(self):
+        # Thursday, before any market closes
+        self.clock = FakeClock(datetime(2026, 10, 15, 0, 0, tzinfo=timezone.utc))
+        self.calls = []
+
+        def fake_fetch_many(symbols, **kwargs):
+            self.calls.append((self.clock.now, list(symbols)))
+            frame = pd.DataFrame({"Close": [1.0]}, index=[date(2026, 10, 15)])
+            data = {s: frame for s in symbols if s != "MSFT"}
+            errors = {"MSFT": DataEmptyError("empty")} if "MSFT" in symbols else {}
+            return data, {s: date(2026, 10, 16) for s in data}, errors
+
+        patcher = patch(
+            "finfetcher.services.scheduler.fetch_many", side_effect=fake_fetch_many
+        )
+        self.mock_fetch_many = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_scheduler(self, sink, **kwargs):
+        return FetchScheduler(
+            ["AAPL", "msft", "7203.T", "BTC-USD"],
+            sink,
+            metadata_cache=make_cache(),
+            clock=self.clock,
+            sleep=self.clock.sleep,
+            **kwargs,
+        )
+
+    def test_schedule_groups_by_exchange(self):
+        scheduler = self.make_scheduler(queue.Queue())
+        schedule = scheduler.schedule()
+
+        self.assertEqual(
+            [(s.tz_name, s.symbols) for s in schedule],
+            [
+                ("Asia/Tokyo", ("7203.T",)),
+                ("America/New_York", ("AAPL", "MSFT")),
+                ("UTC", ("BTC-USD",)),
+            ],
+        )
+        self.assertEqual(
+            schedule[0].when, datetime(2026, 10, 15, 6, 20, tzinfo=timezone.utc)
+        )
+        self.assertEqual(
+            schedule[1].when, datetime(2026, 10, 15, 20, 20, tzinfo=timezone.utc)
+        )
+
+    def test_run_wakes_at_each_cutoff(self):
+        sink = queue.Queue()
+        errors = []
+        scheduler = self.make_scheduler(
+            sink, on_error=lambda s, e: errors.append((s, e))
+        )
+
+        scheduler.run(max_runs=3)
+
+        self.assertEqual(
+            self.calls,
+            [
+                (datetime(2026, 10, 15, 6, 20, tzinfo=timezone.utc), ["7203.T"]),
+                (
+                    datetime(2026, 10, 15, 20, 20, tzinfo=timezone.utc),
+                    ["AAPL", "MSFT"],
+                ),
+                (datetime(2026, 10, 15, 23, 59, tzinfo=timezone.utc), ["BTC-USD"]),
+            ],
+        )
+        emitted = [sink.get_nowait()[0] for _ in range(sink.qsize())]
+        self.assertEqual(emitted, ["7203.T", "AAPL", "BTC-USD"])
+        self.assertEqual([s for s, _ in errors], ["MSFT"])
+
+        # Friday's Tokyo session is next, Saturday is skipped for equities
+        next_tokyo = scheduler.schedule()[0]
+        self.assertEqual(next_tokyo.tz_name, "Asia/Tokyo")
+        self.assertEqual(
+            next_tokyo.when, datetime(2026, 10, 16, 6, 20, tzinfo=timezone.utc)
+        )
+
+    def test_run_pending_and_callback_sink(self):
+        received = []
+        scheduler = self.make_scheduler(lambda *args: received.append(args))
+
+        self.assertEqual(scheduler.run_pending(), 0)
+        self.clock.now = datetime(2026, 10, 15, 21, 0, tzinfo=timezone.utc)
+        self.assertEqual(scheduler.run_pending(), 2)
+        self.assertEqual([r[0] for r in received], ["7203.T", "AAPL"])
+        self.assertEqual(received[0][2], date(2026, 10, 16))
+        self.assertEqual(scheduler.run_pending(), 0)
+
+    def test_provider_and_observer(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        provider = ReplayProvider(tmp.name)
+        observer = MetricsCollector()
+        scheduler = self.make_scheduler(
+            queue.Queue(), provider=provider, observer=observer
+        )
+
+        scheduler.schedule()
+        self.clock.now = datetime(2026, 10, 15, 21, 0, tzinfo=timezone.utc)
+        self.assertEqual(scheduler.run_pending(), 2)
+
+        for call in self.mock_fetch_many.call_args_list:
+            self.assertIs(call.kwargs["provider"], provider)
+        summary = observer.summary()
+        self.assertEqual(summary["symbols"]["MSFT"]["errors"], {"DataEmptyError": 1})
+
+    def test_weekend_skipped_for_equities(self):
+        self.clock.now = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+        scheduler = self.make_scheduler(queue.Queue())
+        when = {s.tz_name: s.when for s in scheduler.schedule()}
+
+        self.assertEqual(
+            when["America/New_York"],
+            datetime(2026, 10, 19, 20, 20, tzinfo=timezone.utc),
+        )
+        self.assertEqual(
+            when["UTC"], datetime(2026, 10, 17, 23, 59, tzinfo=timezone.utc)
+        )
+
+    def test_failed_metadata_retried_at_next_wake_up(self):
+        lookups = []
+
+        def flaky_resolve_many(symbols, cache, provider=None):
+            lookups.append(list(symbols))
+            if len(lookups) == 1:
+                meta, errors = resolve_many(
+                    [s for s in symbols if s != "AAPL"], cache, provider=provider
+                )
+                errors["AAPL"] = YFinanceConnectionError("down")
+                return meta, errors
+            return resolve_many(symbols, cache, provider=provider)
+
+        patcher = patch(
+            "finfetcher.services.scheduler.resolve_many",
+            side_effect=flaky_resolve_many,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        errors = []
+        scheduler = self.make_scheduler(
+            queue.Queue(), on_error=lambda s, e: errors.append(s)
+        )
+        self.assertEqual(
+            [s.symbols for s in scheduler.schedule()],
+            [("7203.T",), ("MSFT",), ("BTC-USD",)],
+        )
+        self.assertEqual(errors, ["AAPL"])
+
+        scheduler.run(max_runs=2)
+
+        self.assertEqual(lookups, [["AAPL", "MSFT", "7203.T", "BTC-USD"], ["AAPL"]])
+        self.assertEqual(self.calls[1][1], ["MSFT", "AAPL"])
+
+    def test_stop_before_run(self):
+        scheduler = self.make_scheduler(queue.Queue())
+
+        scheduler.stop()
+        scheduler.run()
+        self.assertEqual(self.calls, [])
+
+        # The stop request is consumed by the run it stopped
+        scheduler.run(max_runs=1)
+        self.assertEqual(len(self.calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
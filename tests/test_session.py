@@ -0,0 +1,186 @@
+import json
+import logging
+import socket
+import threading
+import time
+import unittest
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pandas as pd
+import requests
+
+from finfetcher import YFinanceProvider, get_session, make_session, set_session
+from finfetcher.exceptions import DataEmptyError, YFinanceConnectionError
+from finfetcher.services.fetch_data import download
+from finfetcher.services.rate_limit import RateLimiter, set_rate_limiter
+from finfetcher.services.retry import CircuitBreaker, RetryPolicy
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Keep-alive needs HTTP/1.1 and a Content-Length
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body are sent separately: avoid Nagle delays on reuse
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:  # type: ignore[attr-defined]
+            self.server.connections += 1  # type: ignore[attr-defined]
+
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(1)
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestSession(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.server.daemon_threads = True
+        self.server.connections = 0  # type: ignore[attr-defined]
+        self.server.lock = threading.Lock()  # type: ignore[attr-defined]
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def test_connections_are_reused(self):
+        for backend in ("requests", "curl_cffi"):
+            with self.subTest(backend=backend):
+                self.server.connections = 0  # type: ignore[attr-defined]
+                session = make_session(pool_size=2, backend=backend)
+                for _ in range(20):
+                    self.assertEqual(session.get(f"{self.url}/").json(), {"ok": True})
+                session.close()
+                self.assertEqual(self.server.connections, 1)  # type: ignore[attr-defined]
+
+        # A session per request connects every time
+        self.server.connections = 0  # type: ignore[attr-defined]
+        for _ in range(5):
+            with make_session(backend="requests") as session:
+                session.get(f"{self.url}/")
+        self.assertEqual(self.server.connections, 5)  # type: ignore[attr-defined]
+
+    def test_configured_timeout_wins(self):
+        session = make_session(read_timeout=0.2, backend="requests")
+        self.addCleanup(session.close)
+        with self.assertRaises(Exception):
+            # yfinance passes its own timeouts, which are overridden
+            session.get(f"{self.url}/slow", timeout=30)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            make_session(pool_size=0)
+        with self.assertRaises(ValueError):
+            make_session(backend="urllib")
+
+
+class TestProviderSession(unittest.TestCase):
+    def test_process_wide_session(self):
+        session = make_session(backend="requests")
+        previous = set_session(session)
+        self.addCleanup(set_session, previous)
+        self.assertIs(get_session(), session)
+
+        with patch(
+            "finfetcher.services.providers.yf_download", return_value=pd.DataFrame()
+        ) as mock_download:
+            YFinanceProvider().history("AAPL", period="1mo")
+            own = make_session(backend="requests")
+            YFinanceProvider(session=own).history_many(["AAPL"], period="1mo")
+
+        sessions = [c.kwargs["session"] for c in mock_download.call_args_list]
+        self.assertEqual(sessions, [session, own])
+
+        with patch("finfetcher.services.providers.yf.Ticker") as mock_ticker:
+            YFinanceProvider().ticker("AAPL")
+        mock_ticker.assert_called_once_with("AAPL", session=session)
+
+
+def refuse(*args, **kwargs):
+    raise requests.exceptions.ConnectionError("Connection refused")
+
+
+def no_data(url="", **kwargs):
+    """Yahoo's answer for a delisted symbol."""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = json.dumps(
+        {
+            "chart": {
+                "result": None,
+                "error": {"code": "Not Found", "description": "No data found"},
+            }
+        }
+    ).encode()
+    return response
+
+
+class TestYFinanceProviderErrors(unittest.TestCase):
+    """The real provider and yfinance, with only the HTTP session stubbed."""
+
+    def setUp(self):
+        previous = set_rate_limiter(RateLimiter(rate=1000, max_rate=1000))
+        self.addCleanup(set_rate_limiter, previous)
+        yf_logger = patch.object(logging.getLogger("yfinance"), "disabled", True)
+        yf_logger.start()
+        self.addCleanup(yf_logger.stop)
+
+        self.session = requests.Session()
+        self.addCleanup(self.session.close)
+        self.provider = YFinanceProvider(session=self.session)
+        self.breaker = CircuitBreaker(failure_threshold=100)
+        self.policy = RetryPolicy(
+            max_attempts=2, base_delay=0, circuit_breaker=self.breaker
+        )
+
+    def test_request_errors_raise(self):
+        with patch.object(self.session, "get", side_effect=refuse):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                self.provider.history("AAPL", period="1mo")
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                self.provider.history_many(["AAPL", "MSFT"], period="1mo")
+
+            # Retried as a connection problem, not taken for a missing symbol
+            with self.assertRaises(YFinanceConnectionError):
+                download(
+                    "AAPL", "1mo", retry_policy=self.policy, provider=self.provider
+                )
+        self.assertEqual(self.breaker._failures, 1)
+
+    def test_no_data_is_empty(self):
+        with patch.object(self.session, "get", side_effect=no_data):
+            self.assertTrue(self.provider.history("GONE", period="1mo").empty)
+            self.assertTrue(self.provider.history_many(["GONE"], period="1mo").empty)
+
+            with self.assertRaises(DataEmptyError):
+                download(
+                    "GONE", "1mo", retry_policy=self.policy, provider=self.provider
+                )
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_deprecation_silenced_locally(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            with patch.object(self.session, "get", side_effect=no_data):
+                self.provider.history("GONE", period="1mo")
+
+        self.assertFalse([w for w in caught if "raise_errors" in str(w.message)])
+        # Importing the provider leaves the process-wide filters alone
+        self.assertFalse([f for f in warnings.filters if "raise_errors" in str(f[1])])
+
+
+if __name__ == "__main__":
+    unittest.main()
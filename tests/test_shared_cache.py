@@ -0,0 +1,155 @@
+import multiprocessing
+import sys
+import tempfile
+import time
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from finfetcher import SharedFetchCache
+
+KEY = ("AAPL", "4y", "1d")
+NOW = datetime(2026, 10, 16, 12, tzinfo=timezone.utc)
+
+
+def make_result():
+    data = pd.DataFrame(
+        {"Close": [1.0, 2.0]}, index=pd.date_range("2026-10-14", periods=2)
+    )
+    return data, date(2026, 10, 16)
+
+
+def counting_fetch(directory: str):
+    """Fetch that logs each call to a file shared by the processes."""
+
+    def fetch():
+        with open(Path(directory) / "downloads.log", "a") as f:
+            f.write("x")
+        time.sleep(0.3)
+        return make_result()
+
+    return fetch
+
+
+def worker(directory: str, barrier) -> None:
+    cache = SharedFetchCache(Path(directory) / "cache", clock=lambda: NOW)
+    barrier.wait()
+    data, target = cache.get_or_fetch(
+        KEY, counting_fetch(directory), lambda: NOW + timedelta(hours=4)
+    )
+    sys.exit(0 if len(data) == 2 and target == date(2026, 10, 16) else 1)
+
+
+def hold_lock(directory: str, ready) -> None:
+    cache = SharedFetchCache(directory)
+    with cache._locked(cache.path(KEY)):
+        ready.set()
+        time.sleep(60)
+
+
+class TestSharedFetchCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+        self.ctx = multiprocessing.get_context(
+            "fork" if sys.platform != "win32" else "spawn"
+        )
+
+    def downloads(self) -> int:
+        log = self.directory / "downloads.log"
+        return len(log.read_text()) if log.exists() else 0
+
+    def test_one_download_per_host(self):
+        barrier = self.ctx.Barrier(4)
+        processes = [
+            self.ctx.Process(target=worker, args=(str(self.directory), barrier))
+            for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+
+        self.assertEqual([p.exitcode for p in processes], [0] * 4)
+        self.assertEqual(self.downloads(), 1)
+
+        # A new process (here: a new cache) reads the stored entry
+        cache = SharedFetchCache(self.directory / "cache", clock=lambda: NOW)
+        cache.get_or_fetch(KEY, counting_fetch(str(self.directory)), lambda: None)
+        self.assertEqual(self.downloads(), 1)
+        self.assertEqual(cache.stats()["shared_hits"], 1)
+
+    def test_dead_lock_holder(self):
+        ready = self.ctx.Event()
+        holder = self.ctx.Process(target=hold_lock, args=(str(self.directory), ready))
+        holder.start()
+        self.assertTrue(ready.wait(30))
+
+        cache = SharedFetchCache(self.directory, clock=lambda: NOW, lock_timeout=30)
+        # Dies mid-download: the OS releases its lock
+        holder.kill()
+        holder.join()
+
+        start = time.monotonic()
+        cache.get_or_fetch(
+            KEY, counting_fetch(str(self.directory)), lambda: NOW + timedelta(hours=1)
+        )
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual(self.downloads(), 1)
+
+    def test_lock_timeout_fetches_anyway(self):
+        ready = self.ctx.Event()
+        holder = self.ctx.Process(target=hold_lock, args=(str(self.directory), ready))
+        holder.start()
+        self.addCleanup(holder.join)
+        self.addCleanup(holder.kill)
+        self.assertTrue(ready.wait(30))
+
+        cache = SharedFetchCache(self.directory, lock_timeout=0.2, clock=lambda: NOW)
+        with self.assertLogs("finfetcher.services.shared_cache", "WARNING"):
+            cache.get_or_fetch(KEY, counting_fetch(str(self.directory)), lambda: None)
+        self.assertEqual(cache.stats()["waited"], 1)
+
+    def test_expiry_corruption_and_invalidate(self):
+        now = [NOW]
+        cache = SharedFetchCache(self.directory, clock=lambda: now[0])
+        fetch = counting_fetch(str(self.directory))
+        expires = lambda: now[0] + timedelta(hours=1)  # noqa: E731
+
+        cache.get_or_fetch(KEY, fetch, expires)
+        self.assertTrue(cache.path(KEY).exists())
+        self.assertEqual(list(self.directory.glob("*.tmp")), [])
+
+        # Expired at the next cutoff, in memory and on disk
+        now[0] += timedelta(hours=2)
+        cache.get_or_fetch(KEY, fetch, expires)
+        self.assertEqual(self.downloads(), 2)
+
+        # A torn or foreign file is a miss, not an error
+        other = SharedFetchCache(self.directory, clock=lambda: now[0])
+        cache.path(KEY).write_bytes(b"garbage")
+        with self.assertLogs("finfetcher.services.shared_cache", "WARNING"):
+            other.get_or_fetch(KEY, fetch, expires)
+        self.assertEqual(self.downloads(), 3)
+
+        cache.invalidate("aapl")
+        self.assertFalse(cache.path(KEY).exists())
+        self.assertEqual(len(cache), 0)
+
+    def test_invalidate_keeps_symbols_sharing_a_prefix(self):
+        cache = SharedFetchCache(self.directory, clock=lambda: NOW)
+        expires = lambda: NOW + timedelta(hours=1)  # noqa: E731
+        keys = [("BRK", "4y", "1d"), ("BRK_B", "4y", "1d"), ("BRK.B", "4y", "1d")]
+        for key in keys:
+            cache.get_or_fetch(key, make_result, expires)
+
+        cache.invalidate("BRK")
+        self.assertEqual([cache.path(k).exists() for k in keys], [False, True, True])
+        self.assertEqual(len(cache), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import tempfile
+import unittest
+from datetime import date, datetime, time
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytz
+
+from finfetcher.calendars import get_calendar
+from finfetcher.services.fetch_data import fetch_data, plan_fetch
+from finfetcher.services.store import (
+    OHLCVStore,
+    exchange_today,
+    period_start,
+    trim_to_period,
+)
+
+
+def make_frame(dates) -> pd.DataFrame:
+    n = len(dates)
+    return pd.DataFrame(
+        {"Open": range(n), "Close": range(1, n + 1)},
+        index=pd.DatetimeIndex(dates),
+        dtype=float,
+    )
+
+
+def mock_now(hour, minute=0):
+    """datetime.now(tz) returning today at the given local time."""
+    return lambda tz=None: tz.localize(
+        datetime.combine(date.today(), time(hour, minute))
+    )
+
+
+class TestOHLCVStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = OHLCVStore(self.tmp.name, file_format="csv")
+
+        self.ticker = MagicMock()
+        # 24/7 asset, so there is a bar for today whatever the weekday
+        self.ticker.fast_info = {"quoteType": "CRYPTOCURRENCY", "timezone": "UTC"}
+        self.dates = pd.date_range(end=pd.Timestamp(date.today()), periods=40)
+
+    def test_period_start(self):
+        today = date(2024, 3, 31)
+        self.assertEqual(period_start("4y", today), date(2020, 3, 31))
+        self.assertEqual(period_start("1mo", today), date(2024, 2, 29))
+        self.assertEqual(period_start("5d", today), date(2024, 3, 26))
+        self.assertEqual(period_start("ytd", today), date(2024, 1, 1))
+        self.assertIsNone(period_start("max", today))
+
+        # Yahoo counts days in sessions: Good Friday and the weekend are skipped
+        nyse = get_calendar("America/New_York")
+        self.assertEqual(period_start("5d", today, nyse), date(2024, 3, 22))
+        self.assertEqual(period_start("1d", date(2024, 3, 28), nyse), date(2024, 3, 28))
+
+    def test_exchange_today(self):
+        # 01:00 UTC on Oct 17: still Oct 16 in New York, already Oct 17 in Tokyo
+        def clock(tz):
+            return datetime(2026, 10, 17, 1, 0, tzinfo=pytz.utc).astimezone(tz)
+
+        self.assertEqual(
+            exchange_today("EQUITY", "America/New_York", clock=clock),
+            date(2026, 10, 16),
+        )
+        self.assertEqual(
+            exchange_today("EQUITY", "Asia/Tokyo", clock=clock), date(2026, 10, 17)
+        )
+
+    @patch("finfetcher.services.fetch_data.datetime")
+    def test_plan_uses_exchange_date(self, mock_datetime):
+        # 03:30 UTC on Saturday Oct 17: still Friday in New York
+        mock_datetime.now.side_effect = lambda tz: datetime(
+            2026, 10, 17, 3, 30, tzinfo=pytz.utc
+        ).astimezone(tz)
+        dates = pd.bdate_range(end="2026-10-16", periods=10)
+        self.store.save("AAPL", "1d", make_frame(dates))
+
+        plan = plan_fetch(
+            "AAPL", ("EQUITY", "America/New_York"), "5d", "1d", store=self.store
+        )
+
+        self.assertEqual(plan.today, date(2026, 10, 16))
+        trimmed = trim_to_period(make_frame(dates), "5d", plan.calendar, plan.today)
+        self.assertEqual(trimmed.index[0], pd.Timestamp("2026-10-12"))
+
+    def test_round_trip(self):
+        df = make_frame(self.dates)
+        df.index = df.index.date  # type: ignore
+        self.store.save("BRK/B", "1d", df)
+
+        loaded = self.store.load("BRK/B", "1d")
+        assert loaded is not None
+        self.assertIsInstance(loaded.index, pd.DatetimeIndex)
+        self.assertEqual(len(loaded), 40)
+        self.assertIsNone(self.store.load("MISSING", "1d"))
+
+    @patch("finfetcher.services.fetch_data.datetime")
+    @patch("finfetcher.services.providers.yf_download")
+    def test_incremental_top_up(self, mock_download, mock_datetime):
+        """Unfinished candles are never stored; later calls only top up."""
+        # 1st run: market still open, today's candle must not be stored
+        mock_datetime.now.side_effect = mock_now(10)
+        mock_download.return_value = make_frame(self.dates)
+
+        data, _ = fetch_data(self.ticker, "BTC-USD", period="1mo", store=self.store)
+
+        stored = self.store.load("BTC-USD", "1d")
+        assert stored is not None
+        self.assertEqual(len(stored), 39)
+        self.assertEqual(stored.index[-1], self.dates[-2])
+        self.assertEqual(data.index[-1], self.dates[-2].date())
+        self.assertEqual(mock_download.call_args.kwargs["period"], "1mo")
+
+        # 2nd run: market closed, only dates after the stored bar are requested
+        mock_datetime.now.side_effect = mock_now(23, 59)
+        mock_download.return_value = make_frame(self.dates[-1:])
+
+        data, target_date = fetch_data(
+            self.ticker, "BTC-USD", period="1mo", store=self.store
+        )
+
+        kwargs = mock_download.call_args.kwargs
+        self.assertNotIn("period", kwargs)
+        self.assertEqual(
+            kwargs["start"], (self.dates[-2] + pd.Timedelta(days=1)).date().isoformat()
+        )
+        self.assertEqual(data.index[-1], date.today())
+        self.assertGreater(target_date, date.today())
+        # Returned data is trimmed to the period, the store keeps everything
+        self.assertLess(len(data), 40)
+
+        stored = self.store.load("BTC-USD", "1d")
+        assert stored is not None
+        self.assertEqual(len(stored), 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
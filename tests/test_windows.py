@@ -0,0 +1,91 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pandas as pd
+
+from finfetcher.core import DataFetcher
+from finfetcher.exceptions import DataEmptyError, FinFetcherError
+from finfetcher.services.windows import drop_unfinished_bar, fetch_range, plan_windows
+
+NOW = datetime(2026, 10, 16, 18, 7, tzinfo=timezone.utc)
+
+
+def fake_download(tickers, interval, start, end, **kwargs):
+    """Bars for [start, end], including the bar still forming at `end`."""
+    freq = interval.replace("m", "min")
+    index = pd.date_range(
+        pd.Timestamp(start).floor(freq), pd.Timestamp(end).floor(freq), freq=freq
+    )
+    return pd.DataFrame({"Close": range(len(index))}, index=index, dtype=float)
+
+
+class TestPlanWindows(unittest.TestCase):
+    def test_largest_windows(self):
+        windows = plan_windows(NOW - timedelta(days=20), None, "1m", now=NOW)
+        self.assertEqual(len(windows), 3)
+        self.assertEqual(windows[0][1] - windows[0][0], timedelta(days=7))
+        self.assertEqual(windows[-1][1], NOW)
+        for (_, end), (start, _) in zip(windows, windows[1:]):
+            self.assertEqual(end, start)
+
+        windows = plan_windows("2025-01-01", "2026-06-01", "1h", now=NOW)
+        self.assertEqual(len(windows), 1)
+
+    def test_lookback_clamped_and_errors(self):
+        with self.assertLogs("finfetcher.services.windows", "WARNING"):
+            windows = plan_windows(NOW - timedelta(days=90), None, "5m", now=NOW)
+        self.assertGreaterEqual(windows[0][0], NOW - timedelta(days=60))
+
+        with self.assertRaises(ValueError):
+            plan_windows(NOW - timedelta(days=1), None, "1d", now=NOW)
+        with self.assertRaises(ValueError):
+            plan_windows(NOW, NOW - timedelta(hours=1), "1h", now=NOW)
+
+    def test_drop_unfinished_bar(self):
+        index = pd.DatetimeIndex(
+            ["2026-10-16 17:00", "2026-10-16 18:00"], tz="America/New_York"
+        )
+        df = pd.DataFrame({"Close": [1.0, 2.0]}, index=index)
+        # 18:00 New York is 22:00 UTC, i.e. after NOW
+        self.assertEqual(len(drop_unfinished_bar(df, "1h", now=NOW)), 1)
+        self.assertEqual(
+            len(drop_unfinished_bar(df, "1h", now=NOW + timedelta(hours=5))), 2
+        )
+
+
+class TestFetchRange(unittest.TestCase):
+    @patch("finfetcher.services.providers.yf_download", side_effect=fake_download)
+    def test_windows_stitched_and_deduplicated(self, mock_download):
+        start = NOW - timedelta(days=20)
+        data = fetch_range("AAPL", start, interval="1m", now=NOW, max_workers=3)
+
+        self.assertEqual(mock_download.call_count, 3)
+        self.assertTrue(data.index.is_monotonic_increasing)
+        self.assertFalse(data.index.duplicated().any())
+        # Window boundaries are kept, only the forming bar at NOW is dropped
+        self.assertEqual(data.index[-1], pd.Timestamp("2026-10-16 18:06", tz="UTC"))
+        self.assertEqual(
+            len(data), len(pd.date_range(data.index[0], data.index[-1], freq="min"))
+        )
+
+    @patch("finfetcher.services.providers.yf_download", return_value=pd.DataFrame())
+    def test_empty(self, _mock_download):
+        with self.assertRaises(DataEmptyError):
+            fetch_range("AAPL", NOW - timedelta(days=3), interval="1h", now=NOW)
+
+
+class TestDataFetcherRange(unittest.TestCase):
+    @patch("finfetcher.services.providers.yf_download", side_effect=fake_download)
+    @patch("finfetcher.core.yf.Ticker")
+    def test_get_range(self, _mock_ticker, _mock_download):
+        fetcher = DataFetcher("AAPL")
+        data = fetcher.get_range(datetime.now(timezone.utc) - timedelta(days=2))
+        self.assertFalse(data.empty)
+
+        with self.assertRaises(FinFetcherError):
+            fetcher.get_range("2026-01-01", interval="1d")
+
+
+if __name__ == "__main__":
+    unittest.main()